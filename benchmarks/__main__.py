@@ -0,0 +1,41 @@
+"""
+Run every benchmark, each against a fresh test database, and write one JSON
+document with all results.
+
+    python -m benchmarks --vendors 100 --orders 100
+    python -m benchmarks.compare old.json new.json
+"""
+import argparse
+
+from . import api, async_views, serialization, signals
+from .common import benchmark_database, setup_django, write_results
+
+
+def main(argv=None) -> None:
+    parser = argparse.ArgumentParser(description=__doc__.split('\n\n')[0])
+    parser.add_argument('--vendors', type=int, default=100)
+    parser.add_argument('--orders', type=int, default=100)
+    parser.add_argument('--requests', type=int, default=200)
+    parser.add_argument('--concurrency', type=int, default=20)
+    parser.add_argument('--output')
+    args = parser.parse_args(argv)
+
+    suites = {
+        'signals': lambda: signals.run(args.vendors, args.orders, args.requests),
+        'api': lambda: api.run(args.vendors, args.orders, args.requests),
+        'async_views': lambda: async_views.run(
+            args.vendors, args.orders, args.requests, args.concurrency),
+        'serialization': lambda: serialization.run(args.vendors, args.orders),
+    }
+    setup_django()
+    results = {}
+    for name, suite in suites.items():
+        print(f'== {name}')
+        with benchmark_database():
+            results[name] = suite()
+    path = write_results('all', results, args.output)
+    print(f'Results written to {path}')
+
+
+if __name__ == '__main__':
+    main()
@@ -0,0 +1,108 @@
+# api.py
+"""
+Throughput of the read endpoints under the Django test client and the
+memory used by requests returning full lists.
+
+    python -m benchmarks.api --vendors 100 --orders 100 --requests 200
+"""
+import argparse
+import time
+import tracemalloc
+
+from .common import (benchmark_database, create_token, seed, setup_django,
+                     write_results)
+
+
+def throughput_endpoints(vendor_id) -> dict:
+    from django.urls import reverse
+
+    return {
+        'vendor_list': reverse('vendor-list-create'),
+        'vendor_detail': reverse('vendor-retrieve-update-delete', args=[vendor_id]),
+        'vendor_performance': reverse('vendor_performance', args=[vendor_id]),
+        'vendor_leaderboard': reverse('vendor-leaderboard'),
+        'purchase_order_list': reverse('purchase-order-list-create'),
+        'purchase_order_list_by_vendor': (
+            reverse('purchase-order-list-create') + f'?vendor_id={vendor_id}'),
+        'item_vendors': reverse('item-vendors', args=['SKU1']),
+        'item_summary_by_vendor': (
+            reverse('item-summary') + f'?vendor_id={vendor_id}'),
+    }
+
+
+def full_list_endpoints() -> dict:
+    from django.urls import reverse
+
+    return {
+        'vendor_list_max_page': (
+            reverse('vendor-list-create') + '?page_size=1000'),
+        'purchase_order_list_max_page': (
+            reverse('purchase-order-list-create') + '?page_size=1000'),
+        'purchase_order_export': reverse('export', args=['purchase_orders']),
+    }
+
+
+def consume(response) -> int:
+    assert response.status_code == 200, response.status_code
+    if response.streaming:
+        return sum(len(chunk) for chunk in response.streaming_content)
+    return len(response.content)
+
+
+def throughput(client, url, requests) -> dict:
+    consume(client.get(url))
+    start = time.perf_counter()
+    for _ in range(requests):
+        consume(client.get(url))
+    elapsed = time.perf_counter() - start
+    return {
+        'requests_per_second': round(requests / elapsed, 1),
+        'mean_ms': round(elapsed / requests * 1000, 3),
+    }
+
+
+def memory(client, url) -> dict:
+    tracemalloc.start()
+    try:
+        size = consume(client.get(url))
+        _, peak = tracemalloc.get_traced_memory()
+    finally:
+        tracemalloc.stop()
+    return {'response_bytes': size, 'peak_memory_bytes': peak}
+
+
+def run(vendors, orders, requests) -> dict:
+    from django.test import Client
+
+    vendor_ids = seed(vendors, orders)
+    client = Client(HTTP_AUTHORIZATION=f'Token {create_token()}')
+
+    results = {'throughput': {}, 'memory': {}}
+    for name, url in throughput_endpoints(vendor_ids[0]).items():
+        results['throughput'][name] = throughput(client, url, requests)
+        print(f"{name}: {results['throughput'][name]['requests_per_second']} req/s")
+    for name, url in full_list_endpoints().items():
+        results['memory'][name] = memory(client, url)
+        print(f"{name}: {results['memory'][name]['peak_memory_bytes']} bytes peak")
+    results['parameters'] = {
+        'vendors': vendors, 'orders_per_vendor': orders, 'requests': requests}
+    return results
+
+
+def main(argv=None) -> None:
+    parser = argparse.ArgumentParser(description=__doc__.split('\n\n')[0])
+    parser.add_argument('--vendors', type=int, default=100)
+    parser.add_argument('--orders', type=int, default=100)
+    parser.add_argument('--requests', type=int, default=200)
+    parser.add_argument('--output')
+    args = parser.parse_args(argv)
+
+    setup_django()
+    with benchmark_database():
+        results = run(args.vendors, args.orders, args.requests)
+        path = write_results('api', results, args.output)
+    print(f'Results written to {path}')
+
+
+if __name__ == '__main__':
+    main()
@@ -0,0 +1,119 @@
+# async_views.py
+"""
+Throughput of the read endpoints through the WSGI views against their
+async counterparts under /api/async/, with `concurrency` requests in
+flight at a time: threads for WSGI, coroutines on one event loop for ASGI.
+
+    python -m benchmarks.async_views --vendors 50 --orders 100
+"""
+import argparse
+import asyncio
+import time
+from concurrent.futures import ThreadPoolExecutor
+
+from .common import (benchmark_database, create_token, seed, setup_django,
+                     write_results)
+
+
+def endpoints(vendor_id, order_id) -> dict:
+    from django.urls import reverse
+
+    return {
+        'vendor_detail': (
+            reverse('vendor-retrieve-update-delete', args=[vendor_id]),
+            reverse('async-vendor-retrieve', args=[vendor_id])),
+        'vendor_performance': (
+            reverse('vendor_performance', args=[vendor_id]),
+            reverse('async-vendor-performance', args=[vendor_id])),
+        'purchase_order_list': (
+            reverse('purchase-order-list-create') + f'?vendor_id={vendor_id}',
+            reverse('async-purchase-order-list') + f'?vendor_id={vendor_id}'),
+        'purchase_order_detail': (
+            reverse('purchase-order-retrieve-update-delete', args=[order_id]),
+            reverse('async-purchase-order-retrieve', args=[order_id])),
+    }
+
+
+def wsgi_throughput(url, token, requests, concurrency) -> float:
+    from django.db import connection
+    from django.test import Client
+
+    def worker(count):
+        client = Client(HTTP_AUTHORIZATION=f'Token {token}')
+        try:
+            for _ in range(count):
+                assert client.get(url).status_code == 200
+        finally:
+            connection.close()
+
+    counts = [requests // concurrency] * concurrency
+    start = time.perf_counter()
+    with ThreadPoolExecutor(max_workers=concurrency) as executor:
+        list(executor.map(worker, counts))
+    return sum(counts) / (time.perf_counter() - start)
+
+
+def asgi_throughput(url, token, requests, concurrency) -> float:
+    from django.test import AsyncClient
+
+    headers = {'Authorization': f'Token {token}'}
+
+    async def worker(count):
+        client = AsyncClient()
+        for _ in range(count):
+            response = await client.get(url, headers=headers)
+            assert response.status_code == 200, response.content
+
+    async def run():
+        await asyncio.gather(*(worker(count) for count in counts))
+
+    counts = [requests // concurrency] * concurrency
+    start = time.perf_counter()
+    asyncio.run(run())
+    return sum(counts) / (time.perf_counter() - start)
+
+
+def run(vendors, orders, requests, concurrency) -> dict:
+    from fatmug_main.models import PurchaseOrder
+
+    vendor_ids = seed(vendors, orders)
+    token = create_token()
+    order_id = PurchaseOrder.objects.filter(
+        vendor_id=vendor_ids[0]).values_list('pk', flat=True).first()
+
+    results = {}
+    for name, (sync_url, async_url) in endpoints(vendor_ids[0], order_id).items():
+        wsgi = wsgi_throughput(sync_url, token, requests, concurrency)
+        asgi = asgi_throughput(async_url, token, requests, concurrency)
+        results[name] = {
+            'wsgi_requests_per_second': round(wsgi, 1),
+            'asgi_requests_per_second': round(asgi, 1),
+            'speedup': round(asgi / wsgi, 2),
+        }
+        print(f'{name}: WSGI {wsgi:.1f} req/s, ASGI {asgi:.1f} req/s')
+    return {
+        'parameters': {
+            'vendors': vendors, 'orders_per_vendor': orders,
+            'requests': requests, 'concurrency': concurrency},
+        'endpoints': results,
+    }
+
+
+def main(argv=None) -> None:
+    parser = argparse.ArgumentParser(description=__doc__.split('\n\n')[0])
+    parser.add_argument('--vendors', type=int, default=20)
+    parser.add_argument('--orders', type=int, default=50)
+    parser.add_argument('--requests', type=int, default=400)
+    parser.add_argument('--concurrency', type=int, default=20)
+    parser.add_argument('--output')
+    args = parser.parse_args(argv)
+
+    setup_django()
+    with benchmark_database():
+        results = run(args.vendors, args.orders, args.requests, args.concurrency)
+        path = write_results('async_views', results, args.output)
+    print(f'Results written to {path}')
+
+
+if __name__ == '__main__':
+    main()
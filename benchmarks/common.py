@@ -0,0 +1,137 @@
+# common.py
+"""
+Helpers shared by the benchmarks. Every benchmark runs against a throwaway
+test database created from the project settings, the configured database
+itself is never touched.
+"""
+import json
+import os
+import platform
+import subprocess
+import sys
+import time
+from contextlib import contextmanager
+from datetime import timedelta
+from pathlib import Path
+
+BASE_DIR = Path(__file__).resolve().parent.parent
+
+
+def setup_django() -> None:
+    sys.path.insert(0, str(BASE_DIR))
+    os.environ.setdefault('DJANGO_SETTINGS_MODULE', 'fatmug_main.settings')
+
+    import django
+    django.setup()
+
+
+@contextmanager
+def benchmark_database():
+    """Create the test databases for the duration of the block."""
+    from django.test.utils import (setup_databases, setup_test_environment,
+                                   teardown_databases,
+                                   teardown_test_environment)
+
+    setup_test_environment()
+    old_config = setup_databases(verbosity=0, interactive=False)
+    try:
+        yield
+    finally:
+        teardown_databases(old_config, verbosity=0)
+        teardown_test_environment()
+
+
+def seed(vendors, orders_per_vendor) -> list:
+    """
+    Bulk create `vendors` vendors with `orders_per_vendor` purchase orders
+    each, a mix of pending, completed and acknowledged orders, with their
+    line items, and count their metrics. Returns the vendor ids.
+    """
+    from django.utils import timezone
+    from fatmug_main.models import PurchaseOrder, Vendor
+    from fatmug_main.utils.line_items import write_line_items
+    from fatmug_main.utils.metrics_calculator import recalculate_vendor_metrics
+
+    start = Vendor.objects.count()
+    created = Vendor.objects.bulk_create(
+        Vendor(
+            name=f'Vendor {number}',
+            contact_details=f'vendor{number}@example.com',
+            address=f'Address {number}',
+            vendor_code=f'V{number}',
+        )
+        for number in range(start, start + vendors))
+    vendor_ids = [vendor.pk for vendor in created]
+    if None in vendor_ids:
+        vendor_ids = list(Vendor.objects.order_by('pk').values_list(
+            'pk', flat=True)[start:])
+
+    now = timezone.now()
+    orders = []
+    for vendor_id in vendor_ids:
+        for number in range(orders_per_vendor):
+            issue_date = now - timedelta(days=number % 365, hours=number)
+            completed = number % 3 != 0
+            orders.append(PurchaseOrder(
+                po_number=f'PO-{vendor_id}-{number}',
+                vendor_id=vendor_id,
+                order_date=issue_date,
+                issue_date=issue_date,
+                delivery_date=issue_date + timedelta(days=7),
+                items={'sku': f'SKU{number % 50}', 'name': f'Item {number % 50}'},
+                quantity=number % 20 + 1,
+                status='completed' if completed else 'pending',
+                completion_date=(
+                    issue_date + timedelta(days=number % 10) if completed else None),
+                quality_rating=(number % 5 + 1) if completed else None,
+                acknowledgment_date=(
+                    issue_date + timedelta(hours=number % 48)
+                    if number % 2 else None),
+            ))
+    PurchaseOrder.objects.bulk_create(orders, batch_size=1000)
+    write_line_items(orders)
+    recalculate_vendor_metrics(vendor_ids)
+    return vendor_ids
+
+
+def create_token() -> str:
+    from django.contrib.auth.models import User
+    from rest_framework.authtoken.models import Token
+
+    user = User.objects.create_user(username='benchmark', password='benchmark')
+    return Token.objects.create(user=user).key
+
+
+def timed(func, *args, **kwargs):
+    """Return the result of calling `func` and the seconds it took."""
+    start = time.perf_counter()
+    result = func(*args, **kwargs)
+    return result, time.perf_counter() - start
+
+
+def write_results(name, results, output=None) -> Path:
+    """
+    Write `results` as JSON together with the commit and environment they
+    were measured on, to `output` or benchmarks/results/<name>-<commit>.json.
+    """
+    from django.db import connection
+
+    try:
+        commit = subprocess.run(
+            ['git', 'rev-parse', '--short', 'HEAD'], cwd=BASE_DIR,
+            capture_output=True, text=True, check=True).stdout.strip()
+    except (OSError, subprocess.CalledProcessError):
+        commit = 'unknown'
+    document = {
+        'benchmark': name,
+        'commit': commit,
+        'python': platform.python_version(),
+        'database': connection.vendor,
+        'created_at': time.strftime('%Y-%m-%dT%H:%M:%SZ', time.gmtime()),
+        'results': results,
+    }
+    path = Path(output) if output else (
+        BASE_DIR / 'benchmarks' / 'results' / f'{name}-{commit}.json')
+    path.parent.mkdir(parents=True, exist_ok=True)
+    path.write_text(json.dumps(document, indent=2) + '\n')
+    return path
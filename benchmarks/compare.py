@@ -0,0 +1,63 @@
+# compare.py
+"""
+Compare two benchmark result files, e.g. from two commits, and print every
+number that moved by more than the threshold.
+
+    python -m benchmarks.compare benchmarks/results/all-abc123.json \
+        benchmarks/results/all-def456.json --threshold 10
+"""
+import argparse
+import json
+
+
+def flatten(results, prefix='') -> dict:
+    values = {}
+    for key, value in results.items():
+        name = f'{prefix}.{key}' if prefix else key
+        if isinstance(value, dict):
+            values.update(flatten(value, name))
+        elif isinstance(value, (int, float)) and not isinstance(value, bool):
+            values[name] = value
+    return values
+
+
+def compare(before, after, threshold) -> list:
+    """
+    Return (name, before, after, percent change) for every metric present in
+    both result sets that changed by more than `threshold` percent.
+    """
+    before, after = flatten(before), flatten(after)
+    changes = []
+    for name in sorted(before.keys() & after.keys()):
+        if '.parameters.' in f'.{name}' or not before[name]:
+            continue
+        change = (after[name] - before[name]) / before[name] * 100
+        if abs(change) > threshold:
+            changes.append((name, before[name], after[name], change))
+    return changes
+
+
+def main(argv=None) -> None:
+    parser = argparse.ArgumentParser(description=__doc__.split('\n\n')[0])
+    parser.add_argument('before')
+    parser.add_argument('after')
+    parser.add_argument(
+        '--threshold', type=float, default=10.0,
+        help="Only report changes above this many percent.")
+    args = parser.parse_args(argv)
+
+    documents = []
+    for path in (args.before, args.after):
+        with open(path) as file:
+            documents.append(json.load(file))
+    before, after = documents
+    print(f"{before['benchmark']}: {before['commit']} -> {after['commit']}")
+    changes = compare(before['results'], after['results'], args.threshold)
+    for name, old, new, change in changes:
+        print(f'{name}: {old} -> {new} ({change:+.1f}%)')
+    if not changes:
+        print(f'No changes above {args.threshold}%.')
+
+
+if __name__ == '__main__':
+    main()
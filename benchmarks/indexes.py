@@ -0,0 +1,126 @@
+# indexes.py
+"""
+Write cost against read benefit of an index for the vendor metric recount
+of purchase orders: rows per second of bulk inserts and of updates
+completing orders, and the time of the vendor counter recount, with the
+model's indexes alone, plus a (vendor, status) index and plus an index
+covering every column the recount reads.
+
+    python -m benchmarks.indexes --vendors 200 --orders 500 --rows 20000 --rounds 3
+"""
+import argparse
+
+from .common import benchmark_database, seed, setup_django, timed, write_results
+
+INDEX_NAME = 'po_vendor_metrics_idx'
+
+
+def index_variants() -> dict:
+    from django.db import models
+
+    return {
+        'none': None,
+        'vendor_status': models.Index(
+            fields=['vendor', 'status'], name=INDEX_NAME),
+        'covering': models.Index(
+            fields=['vendor', 'status', 'completion_date', 'delivery_date',
+                    'quality_rating', 'acknowledgment_date', 'issue_date'],
+            name=INDEX_NAME),
+    }
+
+
+def replace_index(current, index) -> None:
+    from django.db import connection
+    from fatmug_main.models import PurchaseOrder
+
+    with connection.schema_editor() as editor:
+        if current is not None:
+            editor.remove_index(PurchaseOrder, current)
+        if index is not None:
+            editor.add_index(PurchaseOrder, index)
+
+
+def write_rows(vendor_ids, rows, tag) -> dict:
+    """
+    Bulk insert `rows` pending orders, complete them with one update and
+    delete them again. Returns the seconds taken by the insert and update.
+    """
+    from django.db import connection, transaction
+    from django.utils import timezone
+    from fatmug_main.models import PurchaseOrder
+
+    now = timezone.now()
+    orders = [
+        PurchaseOrder(
+            po_number=f'{tag}-{number}',
+            vendor_id=vendor_ids[number % len(vendor_ids)],
+            order_date=now, issue_date=now - timezone.timedelta(hours=number),
+            delivery_date=now, items={}, quantity=1)
+        for number in range(rows)]
+    with transaction.atomic():
+        _, insert = timed(
+            PurchaseOrder.objects.bulk_create, orders, batch_size=1000)
+    first_id = min(order.pk for order in orders)
+    with transaction.atomic():
+        _, update = timed(
+            PurchaseOrder.objects.filter(pk__gte=first_id).update,
+            status='completed', completion_date=now, quality_rating=4.0,
+            acknowledgment_date=now)
+    # Without the receivers of a queryset delete, the rows have no items
+    with connection.cursor() as cursor:
+        cursor.execute(
+            f'DELETE FROM {PurchaseOrder._meta.db_table} WHERE id >= %s',
+            [first_id])
+    return {'insert': insert, 'update': update}
+
+
+def run(vendors, orders, rows=20000, rounds=3) -> dict:
+    from fatmug_main.utils.metrics_calculator import aggregate_vendor_counters
+
+    vendor_ids = seed(vendors, orders)
+    results, current = {}, None
+    for name, index in index_variants().items():
+        replace_index(current, index)
+        current = index
+        timings = [
+            write_rows(vendor_ids, rows, f'{name}{number}')
+            for number in range(rounds)]
+        recounts = [
+            timed(aggregate_vendor_counters, vendor_ids)[1]
+            for _ in range(rounds)]
+        results[name] = {
+            'inserts_per_second': round(
+                rows / min(timing['insert'] for timing in timings)),
+            'updates_per_second': round(
+                rows / min(timing['update'] for timing in timings)),
+            'recount_ms': round(min(recounts) * 1000, 3),
+        }
+        print(f"{name:<14} {results[name]['inserts_per_second']:>8} inserts/s "
+              f"{results[name]['updates_per_second']:>8} updates/s, "
+              f"recount {results[name]['recount_ms']} ms")
+    results['parameters'] = {
+        'vendors': vendors, 'orders_per_vendor': orders, 'rows': rows,
+        'rounds': rounds}
+    return results
+
+
+def main(argv=None) -> None:
+    parser = argparse.ArgumentParser(description=__doc__.split('\n\n')[0])
+    parser.add_argument('--vendors', type=int, default=200)
+    parser.add_argument('--orders', type=int, default=500,
+                        help='purchase orders per vendor')
+    parser.add_argument('--rows', type=int, default=20000,
+                        help='orders inserted and updated per round')
+    parser.add_argument('--rounds', type=int, default=3)
+    parser.add_argument('--output')
+    args = parser.parse_args(argv)
+
+    setup_django()
+    with benchmark_database():
+        results = run(args.vendors, args.orders, args.rows, args.rounds)
+        path = write_results('indexes', results, args.output)
+    print(f'Results written to {path}')
+
+
+if __name__ == '__main__':
+    main()
@@ -0,0 +1,98 @@
+# serialization.py
+"""
+Rows per second of the list endpoints' serialization, from the query to the
+response data, with the model serializers against the ValuesSerializer
+built from them. The rendered JSON of both is checked to be identical.
+
+    python -m benchmarks.serialization --vendors 1000 --orders 10 --rounds 5
+"""
+import argparse
+import time
+
+from .common import benchmark_database, seed, setup_django, write_results
+
+
+def cases() -> dict:
+    from fatmug_main.models import PurchaseOrder, Vendor
+    from fatmug_main.serializers import PurchaseOrderSerializer, VendorSerializer
+
+    return {
+        'purchase_orders': (
+            PurchaseOrder.objects.order_by('issue_date', 'id'),
+            PurchaseOrderSerializer, None),
+        'purchase_orders_sparse': (
+            PurchaseOrder.objects.order_by('issue_date', 'id'),
+            PurchaseOrderSerializer, ['id', 'po_number', 'status', 'issue_date']),
+        'vendors': (Vendor.objects.order_by('id'), VendorSerializer, None),
+    }
+
+
+def model_rows(queryset, serializer_class, fields, page_size) -> list:
+    if fields is not None:
+        queryset = queryset.only(*fields)
+    return serializer_class(queryset[:page_size], many=True, fields=fields).data
+
+
+def values_rows(queryset, serializer_class, fields, page_size) -> list:
+    from fatmug_main.serializers import ValuesSerializer
+
+    serializer = ValuesSerializer(serializer_class(fields=fields))
+    rows = serializer.values_list(queryset)[:page_size]
+    return serializer.to_representation(rows)
+
+
+def rows_per_second(func, args, rounds) -> dict:
+    func(*args)
+    timings, rows = [], 0
+    for _ in range(rounds):
+        start = time.perf_counter()
+        rows = len(func(*args))
+        timings.append(time.perf_counter() - start)
+    return {
+        'rows': rows,
+        'rows_per_second': round(rows / min(timings)),
+        'best_ms': round(min(timings) * 1000, 3),
+    }
+
+
+def run(vendors, orders, page_size=1000, rounds=5) -> dict:
+    from rest_framework.renderers import JSONRenderer
+
+    seed(vendors, orders)
+    renderer = JSONRenderer()
+    results = {}
+    for name, (queryset, serializer_class, fields) in cases().items():
+        args = (queryset, serializer_class, fields, page_size)
+        assert (renderer.render(values_rows(*args))
+                == renderer.render(model_rows(*args))), name
+        model = rows_per_second(model_rows, args, rounds)
+        values = rows_per_second(values_rows, args, rounds)
+        speedup = round(values['rows_per_second'] / model['rows_per_second'], 2)
+        results[name] = {'model': model, 'values': values, 'speedup': speedup}
+        print(f"{name:<24} {model['rows_per_second']:>9} rows/s model, "
+              f"{values['rows_per_second']:>9} rows/s values, {speedup}x")
+    results['parameters'] = {
+        'vendors': vendors, 'orders_per_vendor': orders,
+        'page_size': page_size, 'rounds': rounds}
+    return results
+
+
+def main(argv=None) -> None:
+    parser = argparse.ArgumentParser(description=__doc__.split('\n\n')[0])
+    parser.add_argument('--vendors', type=int, default=1000)
+    parser.add_argument('--orders', type=int, default=10,
+                        help='purchase orders per vendor')
+    parser.add_argument('--page-size', type=int, default=1000)
+    parser.add_argument('--rounds', type=int, default=5)
+    parser.add_argument('--output')
+    args = parser.parse_args(argv)
+
+    setup_django()
+    with benchmark_database():
+        results = run(args.vendors, args.orders, args.page_size, args.rounds)
+        path = write_results('serialization', results, args.output)
+    print(f'Results written to {path}')
+
+
+if __name__ == '__main__':
+    main()
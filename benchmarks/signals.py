@@ -0,0 +1,108 @@
+# signals.py
+"""
+Query count and latency of the purchase order write path: the pre_save and
+post_save receivers in fatmug_main/signals.py and the vendor counter
+update they trigger, for every step of an order's life cycle.
+
+    python -m benchmarks.signals --vendors 20 --orders 200 --rounds 200
+"""
+import argparse
+import statistics
+import time
+
+from .common import benchmark_database, seed, setup_django, write_results
+
+
+def measure(func, rounds) -> dict:
+    """Run `func(round)` `rounds` times and summarize its queries and latency."""
+    from django.db import connection
+    from django.test.utils import CaptureQueriesContext
+
+    timings, query_counts = [], []
+    for number in range(rounds):
+        with CaptureQueriesContext(connection) as queries:
+            start = time.perf_counter()
+            func(number)
+            timings.append(time.perf_counter() - start)
+        query_counts.append(len(queries))
+    timings.sort()
+    return {
+        'rounds': rounds,
+        'queries_per_call': round(statistics.mean(query_counts), 2),
+        'max_queries': max(query_counts),
+        'mean_ms': round(statistics.mean(timings) * 1000, 3),
+        'p95_ms': round(timings[int(len(timings) * 0.95) - 1] * 1000, 3),
+    }
+
+
+def run(vendors, orders, rounds) -> dict:
+    from django.utils import timezone
+    from fatmug_main.models import PurchaseOrder
+
+    vendor_ids = seed(vendors, orders)
+    vendor_id = vendor_ids[0]
+    now = timezone.now()
+    created = []
+
+    def create(number):
+        created.append(PurchaseOrder.objects.create(
+            po_number=f'BENCH-{number}', vendor_id=vendor_id,
+            order_date=now, issue_date=now,
+            delivery_date=now + timezone.timedelta(days=7),
+            items={'sku': 'SKU1'}, quantity=1))
+
+    def acknowledge(number):
+        order = created[number]
+        order.acknowledgment_date = timezone.now()
+        order.save()
+
+    def complete(number):
+        order = created[number]
+        order.status = 'completed'
+        order.quality_rating = 4.0
+        order.save()
+
+    def reload_and_update(number):
+        order = PurchaseOrder.objects.get(pk=created[number].pk)
+        order.quantity += 1
+        order.save()
+
+    def delete(number):
+        created[number].delete()
+
+    steps = {
+        'create': create,
+        'acknowledge': acknowledge,
+        'complete': complete,
+        'unrelated_update': reload_and_update,
+        'delete': delete,
+    }
+    results = {}
+    for name, step in steps.items():
+        results[name] = measure(step, rounds)
+        print(f"{name}: {results[name]['queries_per_call']} queries, "
+              f"{results[name]['mean_ms']} ms mean")
+    return {
+        'parameters': {
+            'vendors': vendors, 'orders_per_vendor': orders, 'rounds': rounds},
+        'steps': results,
+    }
+
+
+def main(argv=None) -> None:
+    parser = argparse.ArgumentParser(description=__doc__.split('\n\n')[0])
+    parser.add_argument('--vendors', type=int, default=20)
+    parser.add_argument('--orders', type=int, default=200)
+    parser.add_argument('--rounds', type=int, default=200)
+    parser.add_argument('--output')
+    args = parser.parse_args(argv)
+
+    setup_django()
+    with benchmark_database():
+        results = run(args.vendors, args.orders, args.rounds)
+        path = write_results('signals', results, args.output)
+    print(f'Results written to {path}')
+
+
+if __name__ == '__main__':
+    main()
@@ -0,0 +1,142 @@
+# sqlite_writes.py
+"""
+Write throughput of the purchase order save path (signal receivers and
+vendor counter updates included) with concurrent writer processes on a
+SQLite file, for the plain 'sqlite' database profile against
+'sqlite-production'. Each profile runs on a fresh temporary file.
+
+    python -m benchmarks.sqlite_writes --writers 4 --orders 100
+"""
+import argparse
+import json
+import multiprocessing
+import os
+import statistics
+import subprocess
+import sys
+import tempfile
+import time
+from pathlib import Path
+
+from .common import BASE_DIR, seed, setup_django, write_results
+
+PROFILES = ('sqlite', 'sqlite-production')
+
+
+def write_orders(writer, vendor_ids, orders, results) -> None:
+    """Create, acknowledge and complete `orders` purchase orders."""
+    from django.db import OperationalError, connections
+    from django.utils import timezone
+    from fatmug_main.models import PurchaseOrder
+
+    # Connections must not be shared with the parent process
+    connections.close_all()
+    timings, errors = [], 0
+
+    def timed_write(func):
+        nonlocal errors
+        start = time.perf_counter()
+        try:
+            func()
+        except OperationalError:
+            errors += 1
+        timings.append(time.perf_counter() - start)
+
+    for number in range(orders):
+        now = timezone.now()
+        order = PurchaseOrder(
+            po_number=f'W{writer}-{number}',
+            vendor_id=vendor_ids[number % len(vendor_ids)],
+            order_date=now, issue_date=now,
+            delivery_date=now + timezone.timedelta(days=7),
+            items={'sku': f'SKU{number % 50}'}, quantity=1)
+        timed_write(order.save)
+        if order.pk is None:
+            continue
+        order.acknowledgment_date = timezone.now()
+        timed_write(order.save)
+        order.status = 'completed'
+        order.quality_rating = 4.0
+        timed_write(order.save)
+    results.put({'timings': timings, 'errors': errors})
+
+
+def run_profile(writers, orders, vendors) -> dict:
+    """Benchmark the profile this process was configured with."""
+    from django.core.management import call_command
+    from django.db import connections
+
+    call_command('migrate', verbosity=0)
+    vendor_ids = seed(vendors, 0)
+    connections.close_all()
+
+    context = multiprocessing.get_context('fork')
+    results = context.Queue()
+    processes = [
+        context.Process(
+            target=write_orders, args=(writer, vendor_ids, orders, results))
+        for writer in range(writers)]
+    start = time.perf_counter()
+    for process in processes:
+        process.start()
+    outcomes = [results.get() for _ in processes]
+    elapsed = time.perf_counter() - start
+    for process in processes:
+        process.join()
+
+    timings = sorted(
+        timing for outcome in outcomes for timing in outcome['timings'])
+    errors = sum(outcome['errors'] for outcome in outcomes)
+    return {
+        'writers': writers,
+        'writes': len(timings),
+        'lock_errors': errors,
+        'writes_per_second': round((len(timings) - errors) / elapsed, 1),
+        'mean_ms': round(statistics.mean(timings) * 1000, 3),
+        'p95_ms': round(timings[int(len(timings) * 0.95) - 1] * 1000, 3),
+    }
+
+
+def run(writers, orders, vendors) -> dict:
+    results = {}
+    for profile in PROFILES:
+        with tempfile.TemporaryDirectory() as directory:
+            env = {
+                **os.environ,
+                'FATMUG_DB_PROFILE': profile,
+                'FATMUG_SQLITE_PATH': str(Path(directory) / 'db.sqlite3'),
+            }
+            env.pop('FATMUG_SQLITE_REPLICA', None)
+            output = subprocess.run(
+                [sys.executable, '-m', 'benchmarks.sqlite_writes', '--profile-run',
+                 '--writers', str(writers), '--orders', str(orders),
+                 '--vendors', str(vendors)],
+                cwd=BASE_DIR, env=env, check=True, capture_output=True, text=True,
+            ).stdout
+        result = results[profile] = json.loads(output.splitlines()[-1])
+        print(f"{profile:<18} {result['writes_per_second']:>8} writes/s, "
+              f"p95 {result['p95_ms']} ms, {result['lock_errors']} lock errors")
+    return results
+
+
+def main(argv=None) -> None:
+    parser = argparse.ArgumentParser(description=__doc__.split('\n\n')[0])
+    parser.add_argument('--writers', type=int, default=4)
+    parser.add_argument('--orders', type=int, default=100)
+    parser.add_argument('--vendors', type=int, default=5)
+    parser.add_argument('--output')
+    parser.add_argument('--profile-run', action='store_true',
+                        help=argparse.SUPPRESS)
+    args = parser.parse_args(argv)
+
+    setup_django()
+    if args.profile_run:
+        print(json.dumps(run_profile(args.writers, args.orders, args.vendors)))
+        return
+    results = run(args.writers, args.orders, args.vendors)
+    path = write_results('sqlite_writes', results, args.output)
+    print(f'Results written to {path}')
+
+
+if __name__ == '__main__':
+    main()
@@ -0,0 +1,72 @@
+# startup.py
+"""
+Cold start time of a process: `manage.py check` and a worker importing the
+settings, the apps and the URLconf, with the API docs served live by
+drf_yasg or from the prebuilt schema files.
+
+    python -m benchmarks.startup --rounds 10
+"""
+import argparse
+import os
+import statistics
+import subprocess
+import sys
+import time
+
+from .common import BASE_DIR, setup_django, write_results
+
+# Imports what a WSGI worker imports before serving its first request
+WORKER_START = (
+    "import django, os;"
+    "os.environ.setdefault('DJANGO_SETTINGS_MODULE', 'fatmug_main.settings');"
+    "django.setup();"
+    "from django.urls import get_resolver;"
+    "get_resolver().url_patterns"
+)
+
+
+def time_process(command, env, rounds) -> dict:
+    """Run `command` `rounds` times in a fresh interpreter and time it."""
+    timings = []
+    for _ in range(rounds):
+        start = time.perf_counter()
+        subprocess.run(command, cwd=BASE_DIR, env=env, check=True,
+                       stdout=subprocess.DEVNULL, stderr=subprocess.DEVNULL)
+        timings.append(time.perf_counter() - start)
+    return {
+        'rounds': rounds,
+        'mean_ms': round(statistics.mean(timings) * 1000, 1),
+        'min_ms': round(min(timings) * 1000, 1),
+    }
+
+
+def run(rounds) -> dict:
+    commands = {
+        'manage_check': [sys.executable, 'manage.py', 'check'],
+        'worker_start': [sys.executable, '-c', WORKER_START],
+    }
+    results = {}
+    for mode in ('live', 'static'):
+        env = {**os.environ, 'FATMUG_API_DOCS': mode}
+        for name, command in commands.items():
+            result = time_process(command, env, rounds)
+            results[f'{name}_{mode}'] = result
+            print(f"{name:<14} {mode:<7} {result['mean_ms']:>8} ms mean, "
+                  f"{result['min_ms']} ms min")
+    return results
+
+
+def main(argv=None) -> None:
+    parser = argparse.ArgumentParser(description=__doc__.split('\n\n')[0])
+    parser.add_argument('--rounds', type=int, default=10)
+    parser.add_argument('--output')
+    args = parser.parse_args(argv)
+
+    setup_django()
+    results = run(args.rounds)
+    path = write_results('startup', results, args.output)
+    print(f'Results written to {path}')
+
+
+if __name__ == '__main__':
+    main()
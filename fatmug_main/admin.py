@@ -1,7 +1,119 @@
 from django.contrib import admin
+from django.core.paginator import Paginator
+from django.db import connections
+from django.db.models import Q
+from django.utils.functional import cached_property
 
 from .models import HistoricalPerformance, PurchaseOrder, Vendor
 
-admin.site.register(Vendor)
-admin.site.register(PurchaseOrder)
-admin.site.register(HistoricalPerformance)
+
+class EstimatedCountPaginator(Paginator):
+    """
+    Changelist paginator that never counts a whole large table. At most
+    `count_limit` + 1 rows are counted; past that, an unfiltered list on
+    PostgreSQL uses the planner's row estimate and any other list stops
+    paging at `count_limit` rows.
+    """
+    count_limit = 10000
+
+    @cached_property
+    def count(self):
+        queryset = self.object_list
+        count = queryset.values('pk')[:self.count_limit + 1].count()
+        if count <= self.count_limit:
+            return count
+        if not queryset.query.where and (
+                connections[queryset.db].vendor == 'postgresql'):
+            with connections[queryset.db].cursor() as cursor:
+                cursor.execute(
+                    "SELECT reltuples FROM pg_class WHERE relname = %s",
+                    [queryset.model._meta.db_table])
+                row = cursor.fetchone()
+            if row and row[0] > count:
+                return int(row[0])
+        return self.count_limit
+
+
+class InputListFilter(admin.SimpleListFilter):
+    """
+    List filter taking a typed value instead of listing every choice, for
+    columns with too many distinct values to enumerate.
+    """
+    template = 'admin/fatmug_main/input_filter.html'
+
+    def lookups(self, request, model_admin):
+        return ()
+
+    def has_output(self):
+        return True
+
+    def choices(self, changelist):
+        all_choice = next(super().choices(changelist))
+        all_choice['query_parts'] = (
+            (key, value)
+            for key, value in changelist.get_filters_params().items()
+            if key != self.parameter_name)
+        yield all_choice
+
+
+class VendorFilter(InputListFilter):
+    title = 'vendor id or code'
+    parameter_name = 'vendor'
+
+    def queryset(self, request, queryset):
+        value = self.value()
+        if not value:
+            return queryset
+        if value.isdigit():
+            # Vendor codes may be numeric too
+            return queryset.filter(
+                Q(vendor_id=value) | Q(vendor__vendor_code=value))
+        return queryset.filter(vendor__vendor_code=value)
+
+
+class FastChangeListAdmin(admin.ModelAdmin):
+    # No second COUNT of the unfiltered table next to the filtered one
+    show_full_result_count = False
+    paginator = EstimatedCountPaginator
+    list_per_page = 50
+
+
+@admin.register(Vendor)
+class VendorAdmin(FastChangeListAdmin):
+    list_display = (
+        'name', 'vendor_code', 'on_time_delivery_rate', 'quality_rating_avg',
+        'average_response_time', 'fulfillment_rate')
+    # Exact vendor codes use the unique index
+    search_fields = ('vendor_code__exact', 'name__startswith')
+    ordering = ('-id',)
+    readonly_fields = (
+        'total_po_count', 'completed_po_count', 'on_time_po_count',
+        'quality_rating_sum', 'quality_rating_count', 'acknowledged_po_count',
+        'response_time_sum', 'updated_at')
+
+
+@admin.register(PurchaseOrder)
+class PurchaseOrderAdmin(FastChangeListAdmin):
+    list_display = (
+        'po_number', 'vendor', 'status', 'issue_date', 'delivery_date',
+        'quantity')
+    # The vendor is rendered on every row
+    list_select_related = ('vendor',)
+    list_filter = ('status', VendorFilter)
+    search_fields = ('po_number__exact', 'vendor__vendor_code__exact')
+    # Served by the (issue_date, id) index
+    ordering = ('-issue_date', '-id')
+    raw_id_fields = ('vendor',)
+    readonly_fields = ('completion_date',)
+
+
+@admin.register(HistoricalPerformance)
+class HistoricalPerformanceAdmin(FastChangeListAdmin):
+    list_display = (
+        'vendor', 'date', 'on_time_delivery_rate', 'quality_rating_avg',
+        'average_response_time', 'fulfillment_rate')
+    list_select_related = ('vendor',)
+    list_filter = (VendorFilter,)
+    # Served by the (vendor, date) unique constraint when filtered by vendor
+    ordering = ('-date', '-id')
+    raw_id_fields = ('vendor',)
@@ -0,0 +1,136 @@
+"""
+OpenAPI schema and documentation pages, served according to API_DOCS:
+
+- 'live': generated by drf_yasg on request. drf_yasg is only imported on
+  the first request to one of these pages.
+- 'static': read from the files written by the 'build_api_schema'
+  management command, drf_yasg is not loaded at all.
+- 'off': not served.
+"""
+import base64
+import hashlib
+from functools import lru_cache
+from pathlib import Path
+
+from django.conf import settings
+from django.contrib.staticfiles import finders
+from django.core.exceptions import ImproperlyConfigured
+from django.http import FileResponse, Http404
+from django.shortcuts import render
+from django.templatetags.static import static
+
+SCHEMA_CONTENT_TYPES = {
+    '.json': 'application/json',
+    '.yaml': 'application/yaml',
+}
+
+# Swagger UI and ReDoc as bundled with the drf-yasg version pinned in
+# requirements.txt, the same files the live pages load
+SWAGGER_UI_ASSETS = {
+    'stylesheet': 'drf-yasg/swagger-ui-dist/swagger-ui.css',
+    'script': 'drf-yasg/swagger-ui-dist/swagger-ui-bundle.js',
+}
+REDOC_ASSETS = {
+    'script': 'drf-yasg/redoc/redoc.min.js',
+}
+
+
+def api_info():
+    from drf_yasg import openapi
+
+    return openapi.Info(
+        title="Fatmug-Amaan",
+        default_version='v1',
+        description="Vendor Dashboard",
+        terms_of_service="https://www.yourapp.com/terms/",
+        contact=openapi.Contact(email="contact@yourapp.com"),
+        license=openapi.License(name="Your License"),
+    )
+
+
+@lru_cache(maxsize=None)
+def live_view(renderer):
+    """The drf_yasg view for `renderer`: 'json', 'swagger' or 'redoc'."""
+    from drf_yasg.views import get_schema_view
+    from rest_framework import permissions
+
+    schema_view = get_schema_view(
+        api_info(),
+        public=True,
+        permission_classes=(permissions.AllowAny,),
+    )
+    if renderer == 'json':
+        return schema_view.without_ui(cache_timeout=0)
+    return schema_view.with_ui(renderer, cache_timeout=0)
+
+
+def schema_path(format) -> Path:
+    return Path(settings.API_SCHEMA_DIR) / f'swagger{format}'
+
+
+def build_schema_files() -> list:
+    """Generate the schema once and write it as JSON and YAML."""
+    from drf_yasg.codecs import OpenAPICodecJson, OpenAPICodecYaml
+    from drf_yasg.generators import OpenAPISchemaGenerator
+
+    schema = OpenAPISchemaGenerator(api_info()).get_schema(request=None, public=True)
+    paths = []
+    for format, codec in (('.json', OpenAPICodecJson), ('.yaml', OpenAPICodecYaml)):
+        path = schema_path(format)
+        path.parent.mkdir(parents=True, exist_ok=True)
+        path.write_bytes(codec(validators=[]).encode(schema))
+        paths.append(path)
+    return paths
+
+
+@lru_cache(maxsize=None)
+def static_asset(path) -> dict:
+    """The URL and the subresource integrity hash of the static file `path`."""
+    found = finders.find(path)
+    if found is None:
+        raise ImproperlyConfigured(
+            f"Static file {path!r} not found, is drf-yasg installed?")
+    with open(found, 'rb') as file:
+        digest = hashlib.sha384(file.read()).digest()
+    return {
+        'url': static(path),
+        'integrity': f'sha384-{base64.b64encode(digest).decode()}',
+    }
+
+
+def static_assets(assets) -> dict:
+    return {name: static_asset(path) for name, path in assets.items()}
+
+
+def docs_mode() -> str:
+    mode = getattr(settings, 'API_DOCS', 'live')
+    if mode == 'off':
+        raise Http404("The API documentation is disabled.")
+    return mode
+
+
+def schema(request, format):
+    if docs_mode() == 'live':
+        return live_view('json')(request, format=format)
+    path = schema_path(format)
+    if not path.exists():
+        raise Http404(
+            "The API schema was not built, run 'manage.py build_api_schema'.")
+    return FileResponse(
+        path.open('rb'), content_type=SCHEMA_CONTENT_TYPES[format])
+
+
+def swagger_ui(request):
+    if docs_mode() == 'live':
+        return live_view('swagger')(request)
+    return render(request, 'api_docs/swagger.html', {
+        'schema_url': '/swagger.json',
+        'assets': static_assets(SWAGGER_UI_ASSETS)})
+
+
+def redoc(request):
+    if docs_mode() == 'live':
+        return live_view('redoc')(request)
+    return render(request, 'api_docs/redoc.html', {
+        'schema_url': '/swagger.json',
+        'assets': static_assets(REDOC_ASSETS)})
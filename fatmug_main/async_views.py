@@ -0,0 +1,252 @@
+import base64
+import binascii
+from contextlib import nullcontext
+
+from django.db.models import Q
+from django.http import HttpResponse
+from django.utils.cache import get_conditional_response
+from django.utils.dateparse import parse_datetime
+from django.utils.http import http_date, quote_etag
+from django.views import View
+from rest_framework.authtoken.models import Token
+from rest_framework.exceptions import (APIException, AuthenticationFailed,
+                                       NotAuthenticated, NotFound)
+from rest_framework.renderers import JSONRenderer
+from rest_framework.request import Request
+from rest_framework.utils.urls import replace_query_param
+
+from .authentication import get_token_cache
+from .filters import PurchaseOrderFilter, parse_fields_param
+from .models import PurchaseOrder, Vendor
+from .pagination import PurchaseOrderPagination
+from .routers import read_only
+from .serializers import (PurchaseOrderSerializer, ValuesSerializer,
+                          VendorSerializer)
+from .utils.performance_cache import aget_vendor_performance
+
+
+class AsyncAPIView(View):
+    """
+    Base class of the async read-only endpoints. Django runs the handlers
+    on the event loop of an ASGI worker and the ORM is only used through
+    its async methods, so a slow query does not hold a worker thread.
+
+    DRF views cannot be async, so the token check (sharing the cache of
+    CachedTokenAuthentication), the error bodies and the JSON rendering of
+    DRF are reproduced here. Like the sync GET views the queries are served
+    by the 'replica' database when one is configured, unless `read_replica`
+    is turned off.
+    """
+    http_method_names = ['get', 'options']
+    keyword = 'Token'
+    read_replica = True
+
+    async def authenticate(self, request) -> None:
+        auth = request.headers.get('Authorization', '').split()
+        if not auth or auth[0].lower() != self.keyword.lower():
+            raise NotAuthenticated()
+        if len(auth) != 2:
+            raise AuthenticationFailed('Invalid token header.')
+        token_cache = get_token_cache()
+        credentials = token_cache.get(auth[1])
+        if credentials is None:
+            try:
+                token = await Token.objects.select_related('user').aget(
+                    key=auth[1])
+            except Token.DoesNotExist:
+                raise AuthenticationFailed('Invalid token.')
+            if not token.user.is_active:
+                raise AuthenticationFailed('User inactive or deleted.')
+            credentials = (token.user, token)
+            token_cache.set(auth[1], credentials)
+        request.user = credentials[0]
+
+    async def dispatch(self, request, *args, **kwargs):
+        try:
+            with read_only() if self.read_replica else nullcontext():
+                await self.authenticate(request)
+                return await super().dispatch(request, *args, **kwargs)
+        except APIException as exc:
+            detail = exc.detail
+            if not isinstance(detail, (list, dict)):
+                detail = {'detail': detail}
+            response = self.render(detail, status=exc.status_code)
+            if isinstance(exc, (NotAuthenticated, AuthenticationFailed)):
+                response['WWW-Authenticate'] = self.keyword
+            return response
+
+    def render(self, data, status=200) -> HttpResponse:
+        return HttpResponse(
+            JSONRenderer().render(data), status=status,
+            content_type='application/json')
+
+
+class AsyncVendorRetrieveView(AsyncAPIView):
+    """
+    Async API endpoint for retrieving a specific vendor.
+
+    - GET: Retrieve details of a specific vendor, same body as
+      GET /api/vendors/<pk>/.
+
+    Authentication:
+    - Token-based authentication is required.
+
+    Serializer:
+    - VendorSerializer: Used for serialization of the Vendor object.
+
+    Raises:
+    - NotFound: If the specified vendor does not exist.
+
+    """
+
+    async def get(self, request, pk):
+        try:
+            vendor = await Vendor.objects.aget(pk=pk)
+        except Vendor.DoesNotExist:
+            raise NotFound(f"Vendor {pk} not found.")
+        return self.render(VendorSerializer(vendor).data)
+
+
+class AsyncVendorPerformanceView(AsyncAPIView):
+    """
+    Async API endpoint for retrieving performance data of a specific vendor.
+
+    - GET: Same body, cache and conditional request handling as
+      GET /api/vendors/<pk>/performance/.
+
+    Authentication:
+    - Token-based authentication is required.
+
+    Raises:
+    - NotFound: If the specified vendor does not exist.
+
+    """
+    # Cache misses are filled from the primary, as on the sync endpoint
+    read_replica = False
+
+    async def get(self, request, pk):
+        performance = await aget_vendor_performance(pk)
+        if performance is None:
+            raise NotFound(f"Vendor {pk} not found.")
+
+        etag = quote_etag(performance['etag'])
+        last_modified = performance['last_modified']
+        response = get_conditional_response(
+            request, etag=etag, last_modified=last_modified)
+        if response is None:
+            response = self.render(performance['data'])
+        response['ETag'] = etag
+        response['Last-Modified'] = http_date(last_modified)
+        return response
+
+
+class AsyncPurchaseOrderListView(AsyncAPIView):
+    """
+    Async API endpoint for listing purchase orders.
+
+    - GET: Retrieve the purchase orders in (issue_date, id) order.
+
+    Authentication:
+    - Token-based authentication is required.
+
+    Serializer:
+    - ValuesSerializer of PurchaseOrderSerializer: Used for serialization of the
+      purchase order rows.
+
+    Query Parameters:
+    - 'vendor_id', 'status', 'from' and 'to' filter like on GET /api/purchase_orders/.
+    - 'fields' limits the response (and the columns read) to a comma separated list
+      of fields.
+    - 'page_size' sets the number of orders per page (at most 1000).
+    - 'cursor' continues from the page its value was returned with.
+
+    Pagination:
+    - Keyset pagination, 'next' links to the following page and is null on the
+      last one. Unlike the sync endpoint there is no 'previous' link.
+
+    Raises:
+    - NotFound: If no purchase orders are found for the specified vendor, or the
+      cursor is invalid.
+    - ValidationError: If a filter or field name is invalid.
+
+    """
+    pagination_class = PurchaseOrderPagination
+    required_fields = ('id', 'issue_date')
+
+    def get_page_size(self, request) -> int:
+        pagination = self.pagination_class()
+        return pagination.get_page_size(request)
+
+    def encode_cursor(self, order) -> str:
+        position = f'{order.issue_date.isoformat()}|{order.id}'
+        return base64.urlsafe_b64encode(position.encode()).decode()
+
+    def decode_cursor(self, cursor):
+        try:
+            issue_date, order_id = base64.urlsafe_b64decode(
+                cursor.encode()).decode().split('|')
+            issue_date = parse_datetime(issue_date)
+            order_id = int(order_id)
+        except (binascii.Error, UnicodeDecodeError, TypeError, ValueError):
+            issue_date = None
+        if issue_date is None:
+            raise NotFound('Invalid cursor')
+        return issue_date, order_id
+
+    async def get(self, request):
+        request = Request(request)
+        fields = parse_fields_param(request, PurchaseOrderSerializer)
+        serializer = ValuesSerializer(PurchaseOrderSerializer(fields=fields))
+        queryset = PurchaseOrderFilter().filter_queryset(
+            request, PurchaseOrder.objects.all(), self)
+
+        cursor = request.query_params.get('cursor')
+        if cursor:
+            issue_date, order_id = self.decode_cursor(cursor)
+            queryset = queryset.filter(
+                Q(issue_date__gt=issue_date)
+                | Q(issue_date=issue_date, id__gt=order_id))
+
+        page_size = self.get_page_size(request)
+        orders = [
+            order async for order in serializer.values_list(
+                queryset.order_by('issue_date', 'id'),
+                *self.required_fields)[:page_size + 1]]
+        if (request.query_params.get('vendor_id')
+                and not cursor and not orders):
+            raise NotFound("No purchase orders found for the specified vendor.")
+
+        next_url = None
+        if len(orders) > page_size:
+            orders = orders[:page_size]
+            next_url = replace_query_param(
+                request.build_absolute_uri(), 'cursor',
+                self.encode_cursor(orders[-1]))
+        return self.render({
+            'next': next_url, 'results': serializer.to_representation(orders)})
+
+
+class AsyncPurchaseOrderRetrieveView(AsyncAPIView):
+    """
+    Async API endpoint for retrieving a specific purchase order.
+
+    - GET: Retrieve details of a specific purchase order, same body as
+      GET /api/purchase_orders/<pk>/.
+
+    Authentication:
+    - Token-based authentication is required.
+
+    Serializer:
+    - PurchaseOrderSerializer: Used for serialization of the PurchaseOrder object.
+
+    Raises:
+    - NotFound: If the specified purchase order does not exist.
+
+    """
+
+    async def get(self, request, pk):
+        try:
+            order = await PurchaseOrder.objects.aget(pk=pk)
+        except PurchaseOrder.DoesNotExist:
+            raise NotFound(f"Purchase Order {pk} not found.")
+        return self.render(PurchaseOrderSerializer(order).data)
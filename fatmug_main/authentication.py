@@ -0,0 +1,106 @@
+import threading
+import time
+from collections import OrderedDict
+from functools import lru_cache
+
+from django.conf import settings
+from django.core.cache import cache
+from rest_framework.authentication import TokenAuthentication
+
+
+class LocalTokenCache:
+    """
+    Bounded LRU of authenticated tokens kept per process. Entries expire
+    `timeout` seconds after they were added.
+    """
+
+    def __init__(self, max_size, timeout):
+        self.max_size = max_size
+        self.timeout = timeout
+        self._lock = threading.Lock()
+        self._entries = OrderedDict()
+
+    def get(self, key):
+        with self._lock:
+            entry = self._entries.get(key)
+            if entry is None:
+                return None
+            expires_at, value = entry
+            if expires_at <= time.monotonic():
+                del self._entries[key]
+                return None
+            self._entries.move_to_end(key)
+            return value
+
+    def set(self, key, value) -> None:
+        with self._lock:
+            self._entries[key] = (time.monotonic() + self.timeout, value)
+            self._entries.move_to_end(key)
+            while len(self._entries) > self.max_size:
+                self._entries.popitem(last=False)
+
+    def delete_many(self, keys) -> None:
+        with self._lock:
+            for key in keys:
+                self._entries.pop(key, None)
+
+    def clear(self) -> None:
+        with self._lock:
+            self._entries.clear()
+
+
+class SharedTokenCache:
+    """
+    Authenticated tokens kept in the default Django cache, shared by every
+    process using the same cache backend.
+    """
+
+    def __init__(self, timeout):
+        self.timeout = timeout
+
+    def cache_key(self, key) -> str:
+        return f'auth-token:{key}'
+
+    def get(self, key):
+        return cache.get(self.cache_key(key))
+
+    def set(self, key, value) -> None:
+        cache.set(self.cache_key(key), value, self.timeout)
+
+    def delete_many(self, keys) -> None:
+        cache.delete_many([self.cache_key(key) for key in keys])
+
+    def clear(self) -> None:
+        # Entries of the shared cache are only dropped one by one
+        pass
+
+
+@lru_cache(maxsize=None)
+def _token_cache(backend, max_size, timeout):
+    if backend == 'shared':
+        return SharedTokenCache(timeout)
+    return LocalTokenCache(max_size, timeout)
+
+
+def get_token_cache():
+    return _token_cache(
+        getattr(settings, 'TOKEN_AUTH_CACHE_BACKEND', 'shared'),
+        getattr(settings, 'TOKEN_AUTH_CACHE_SIZE', 10000),
+        getattr(settings, 'TOKEN_AUTH_CACHE_TIMEOUT', 300))
+
+
+class CachedTokenAuthentication(TokenAuthentication):
+    """
+    TokenAuthentication that keeps the (user, token) pair of every valid
+    key in the token cache, so that repeated requests with the same token
+    authenticate without a query. Cached keys are dropped when their token
+    is deleted or their user is saved, e.g. deactivated.
+    """
+
+    def authenticate_credentials(self, key):
+        token_cache = get_token_cache()
+        credentials = token_cache.get(key)
+        if credentials is None:
+            credentials = super().authenticate_credentials(key)
+            token_cache.set(key, credentials)
+        return credentials
@@ -0,0 +1,41 @@
+from django.core.exceptions import ImproperlyConfigured
+from django.db.backends.sqlite3 import base
+
+TRANSACTION_MODES = ('DEFERRED', 'IMMEDIATE', 'EXCLUSIVE')
+
+
+class DatabaseWrapper(base.DatabaseWrapper):
+    """
+    SQLite backend taking two more OPTIONS:
+
+    - 'pragmas': PRAGMA name to value, set on every new connection
+    - 'transaction_mode': how transactions are begun. 'IMMEDIATE' takes
+      the write lock up front, so a transaction that reads before writing
+      waits for busy_timeout instead of failing with 'database is locked'
+      when another connection writes in the meantime.
+    """
+
+    def get_connection_params(self):
+        params = super().get_connection_params()
+        params.pop('pragmas', None)
+        params.pop('transaction_mode', None)
+        return params
+
+    def get_new_connection(self, conn_params):
+        conn = super().get_new_connection(conn_params)
+        for pragma, value in self.settings_dict['OPTIONS'].get(
+                'pragmas', {}).items():
+            conn.execute(f'PRAGMA {pragma} = {value}')
+        return conn
+
+    @property
+    def transaction_mode(self):
+        mode = self.settings_dict['OPTIONS'].get(
+            'transaction_mode', 'DEFERRED').upper()
+        if mode not in TRANSACTION_MODES:
+            raise ImproperlyConfigured(
+                f"transaction_mode must be one of {', '.join(TRANSACTION_MODES)}.")
+        return mode
+
+    def _start_transaction_under_autocommit(self):
+        self.cursor().execute(f'BEGIN {self.transaction_mode}')
@@ -0,0 +1,109 @@
+# Database profiles, selected in local_setting.py with FATMUG_DB_PROFILE
+
+# Set on every connection of the 'sqlite-production' profile. WAL lets
+# readers run alongside the writer, NORMAL only syncs at checkpoints (safe
+# in WAL mode, a power loss can only lose the last transactions)
+SQLITE_PRODUCTION_PRAGMAS = {
+    'journal_mode': 'WAL',
+    'synchronous': 'NORMAL',
+    # Milliseconds a connection waits for the write lock
+    'busy_timeout': 5000,
+    # 256 MiB of the file memory mapped, 64 MiB page cache per connection
+    'mmap_size': 256 * 1024 * 1024,
+    'cache_size': -64 * 1024,
+    'temp_store': 'MEMORY',
+}
+
+SQLITE_REPLICA_PRAGMAS = {
+    'busy_timeout': 5000,
+    'mmap_size': 256 * 1024 * 1024,
+    'cache_size': -64 * 1024,
+    'temp_store': 'MEMORY',
+    'query_only': 1,
+}
+
+
+def sqlite_databases(path, production=False, replica_path=None) -> dict:
+    """
+    DATABASES for a SQLite file, with the 'sqlite-production' pragmas and
+    immediate transactions when `production` is set. `replica_path` adds a
+    read only 'replica' connection, e.g. to a copy kept up to date by
+    Litestream, which ReadReplicaRouter sends the reads of GET requests to.
+    A replica on the same file reads like a test mirror and is not used.
+    """
+    default = {
+        'ENGINE': 'django.db.backends.sqlite3',
+        'NAME': path,
+    }
+    if production:
+        default = {
+            'ENGINE': 'fatmug_main.backends.sqlite3',
+            'NAME': path,
+            'OPTIONS': {
+                'pragmas': SQLITE_PRODUCTION_PRAGMAS,
+                'transaction_mode': 'IMMEDIATE',
+            },
+        }
+    databases = {'default': default}
+    if replica_path:
+        databases['replica'] = {
+            'ENGINE': 'fatmug_main.backends.sqlite3',
+            'NAME': replica_path,
+            'OPTIONS': {'pragmas': SQLITE_REPLICA_PRAGMAS},
+            'TEST': {'MIRROR': 'default'},
+        }
+    return databases
+
+
+def postgres_databases(environ) -> dict:
+    """
+    DATABASES for PostgreSQL, configured from FATMUG_PG_* variables of
+    `environ`. Connections are kept open for FATMUG_PG_CONN_MAX_AGE seconds
+    and checked before being reused, every statement is cancelled after
+    FATMUG_PG_STATEMENT_TIMEOUT milliseconds. FATMUG_PG_REPLICA_HOST adds a
+    'replica' alias for ReadReplicaRouter.
+    """
+    timeout = int(environ.get('FATMUG_PG_STATEMENT_TIMEOUT', '30000'))
+    default = {
+        'ENGINE': 'django.db.backends.postgresql',
+        'NAME': environ.get('FATMUG_PG_NAME', 'fatmug'),
+        'USER': environ.get('FATMUG_PG_USER', 'postgres'),
+        'PASSWORD': environ.get('FATMUG_PG_PASSWORD', ''),
+        'HOST': environ.get('FATMUG_PG_HOST', 'localhost'),
+        'PORT': environ.get('FATMUG_PG_PORT', '5432'),
+        'CONN_MAX_AGE': int(environ.get('FATMUG_PG_CONN_MAX_AGE', '60')),
+        'CONN_HEALTH_CHECKS': True,
+        # Behind a transaction pooling PgBouncer the cursors of iterator(),
+        # e.g. of the exports, cannot outlive a transaction, set it to 0
+        'DISABLE_SERVER_SIDE_CURSORS': environ.get(
+            'FATMUG_PG_SERVER_SIDE_CURSORS', '1') != '1',
+        'OPTIONS': {
+            'connect_timeout': 5,
+            'options': f'-c statement_timeout={timeout}',
+        },
+    }
+    databases = {'default': default}
+    replica_host = environ.get('FATMUG_PG_REPLICA_HOST')
+    if replica_host:
+        databases['replica'] = {
+            **default,
+            'HOST': replica_host,
+            'PORT': environ.get('FATMUG_PG_REPLICA_PORT', default['PORT']),
+            'TEST': {'MIRROR': 'default'},
+        }
+    return databases
+
+
+def database_profile(profile, environ, sqlite_path) -> dict:
+    """
+    DATABASES of `profile`: 'sqlite', 'sqlite-production' (FATMUG_SQLITE_PATH,
+    defaulting to `sqlite_path`, and FATMUG_SQLITE_REPLICA) or 'postgres'.
+    """
+    if profile in ('sqlite', 'sqlite-production'):
+        return sqlite_databases(
+            environ.get('FATMUG_SQLITE_PATH', sqlite_path),
+            production=profile == 'sqlite-production',
+            replica_path=environ.get('FATMUG_SQLITE_REPLICA'))
+    if profile == 'postgres':
+        return postgres_databases(environ)
+    raise ValueError(f"Unknown database profile {profile!r}.")
@@ -0,0 +1,188 @@
+import sys
+from datetime import datetime, time
+
+from django.db import connections
+from django.db.models import Q
+from django.utils import timezone
+from django.utils.dateparse import parse_date, parse_datetime
+from rest_framework.exceptions import ValidationError
+from rest_framework.filters import BaseFilterBackend, OrderingFilter
+
+
+def parse_datetime_param(request, name):
+    """
+    Read an ISO 8601 date or datetime query parameter as an aware datetime,
+    a date stands for the start of that day. Returns None when absent.
+    """
+    value = request.query_params.get(name)
+    if value is None:
+        return None
+    try:
+        bound = parse_datetime(value)
+        if bound is None and (day := parse_date(value)) is not None:
+            bound = datetime.combine(day, time.min)
+    except ValueError:
+        bound = None
+    if bound is None:
+        raise ValidationError({name: ["Expected an ISO 8601 date or datetime."]})
+    if timezone.is_naive(bound):
+        bound = timezone.make_aware(bound)
+    return bound
+
+
+def parse_fields_param(request, serializer_class):
+    """
+    Read the comma separated '?fields=' query parameter, every name must be
+    a field of `serializer_class`. Returns None when absent.
+    """
+    param = request.query_params.get('fields')
+    if not param:
+        return None
+    fields = [field.strip() for field in param.split(',') if field.strip()]
+    valid_fields = serializer_class().fields
+    invalid_fields = [field for field in fields if field not in valid_fields]
+    if invalid_fields:
+        raise ValidationError(
+            {'fields': [f"Unknown fields: {', '.join(invalid_fields)}."]})
+    return fields
+
+
+class PurchaseOrderFilter(BaseFilterBackend):
+    """
+    Filters purchase orders by '?vendor_id=', '?status=' and an issue date
+    range given with '?from=' and '?to=' (inclusive).
+    """
+
+    def filter_queryset(self, request, queryset, view):
+        filters = {}
+        vendor_id = request.query_params.get('vendor_id')
+        if vendor_id:
+            filters['vendor_id'] = vendor_id
+        order_status = request.query_params.get('status')
+        if order_status:
+            filters['status'] = order_status
+        start = parse_datetime_param(request, 'from')
+        if start is not None:
+            filters['issue_date__gte'] = start
+        end = parse_datetime_param(request, 'to')
+        if end is not None:
+            filters['issue_date__lte'] = end
+        try:
+            return queryset.filter(**filters)
+        except ValueError:
+            raise ValidationError({'vendor_id': ["A valid integer is required."]})
+
+
+class PrefixSearchFilter(BaseFilterBackend):
+    """
+    Filters on a case-sensitive prefix of any of the view's
+    `prefix_search_fields` given with '?search='. On SQLite each prefix is
+    matched with a range comparison, which a plain B-tree index on the field
+    serves (unlike LIKE, which is also case-insensitive there). Other
+    databases match with LIKE, whose index use depends on the collation.
+    """
+    search_param = 'search'
+
+    def get_upper_bound(self, prefix):
+        """
+        Return the smallest string greater than every string starting with
+        `prefix` in code point order, None when there is none.
+        """
+        prefix = prefix.rstrip(chr(sys.maxunicode))
+        if not prefix:
+            return None
+        code_point = ord(prefix[-1]) + 1
+        if 0xD800 <= code_point <= 0xDFFF:
+            # Surrogates are not characters and cannot be stored
+            code_point = 0xE000
+        return prefix[:-1] + chr(code_point)
+
+    def filter_queryset(self, request, queryset, view):
+        prefix = request.query_params.get(self.search_param, '').strip()
+        if not prefix:
+            return queryset
+        # Text compares in code point order only under a binary collation,
+        # the default on SQLite but not the usual one elsewhere
+        use_range = connections[queryset.db].vendor == 'sqlite'
+        upper_bound = self.get_upper_bound(prefix)
+        condition = Q()
+        for field in view.prefix_search_fields:
+            if not use_range:
+                condition |= Q(**{f'{field}__startswith': prefix})
+            elif upper_bound is None:
+                condition |= Q(**{f'{field}__gte': prefix})
+            else:
+                condition |= Q(**{
+                    f'{field}__gte': prefix, f'{field}__lt': upper_bound})
+        return queryset.filter(condition)
+
+
+class LineItemFilter(BaseFilterBackend):
+    """
+    Filters purchase order line items by '?vendor_id=', '?sku=' and the
+    issue date range of their orders given with '?from=' and '?to='
+    (inclusive).
+    """
+
+    def filter_queryset(self, request, queryset, view):
+        filters = {}
+        vendor_id = request.query_params.get('vendor_id')
+        if vendor_id:
+            filters['vendor_id'] = vendor_id
+        sku = request.query_params.get('sku')
+        if sku:
+            filters['sku'] = sku
+        start = parse_datetime_param(request, 'from')
+        if start is not None:
+            filters['issue_date__gte'] = start
+        end = parse_datetime_param(request, 'to')
+        if end is not None:
+            filters['issue_date__lte'] = end
+        try:
+            return queryset.filter(**filters)
+        except ValueError:
+            raise ValidationError({'vendor_id': ["A valid integer is required."]})
+
+
+class MetricRangeFilter(BaseFilterBackend):
+    """
+    Filters on the view's `metric_filter_fields` with threshold query
+    parameters such as '?fulfillment_rate__lt=80&quality_rating_avg__gte=3'.
+    """
+    lookups = ('lt', 'lte', 'gt', 'gte')
+
+    def filter_queryset(self, request, queryset, view):
+        filters = {}
+        for field in getattr(view, 'metric_filter_fields', ()):
+            for lookup in self.lookups:
+                param = f'{field}__{lookup}'
+                value = request.query_params.get(param)
+                if value is None:
+                    continue
+                try:
+                    filters[param] = float(value)
+                except ValueError:
+                    raise ValidationError({param: ["A valid number is required."]})
+        return queryset.filter(**filters)
+
+
+class MetricOrderingFilter(OrderingFilter):
+    """
+    Multi-key ordering over nullable metric columns, suitable for keyset
+    pagination: rows without a value for one of the ordering fields are left
+    out and the primary key breaks ties, so the ordering is unique.
+    """
+
+    def get_ordering(self, request, queryset, view):
+        ordering = list(super().get_ordering(request, queryset, view) or ())
+        if not {'id', '-id', 'pk', '-pk'} & set(ordering):
+            ordering.append('id')
+        return ordering
+
+    def filter_queryset(self, request, queryset, view):
+        ordering = self.get_ordering(request, queryset, view)
+        queryset = queryset.filter(**{
+            f'{field.lstrip("-")}__isnull': False
+            for field in ordering if field.lstrip('-') not in ('id', 'pk')
+        })
+        return queryset.order_by(*ordering)
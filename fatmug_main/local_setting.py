@@ -1,14 +1,18 @@
+import os
 from pathlib import Path
 
+from fatmug_main.database import database_profile
+
 # Build paths inside the project like this: BASE_DIR / 'subdir'.
 BASE_DIR = Path(__file__).resolve().parent.parent
 
 # Database
 # https://docs.djangoproject.com/en/4.2/ref/settings/#databases
 
-DATABASES = {
-    "default": {
-        "ENGINE": "django.db.backends.sqlite3",
-        "NAME": BASE_DIR / "db.sqlite3",
-    }
-}
+# 'sqlite' (plain SQLite settings), 'sqlite-production' (WAL, relaxed
+# fsync, busy timeout, memory mapping) or 'postgres' (FATMUG_PG_* variables).
+# A replica, FATMUG_SQLITE_REPLICA or FATMUG_PG_REPLICA_HOST, serves the
+# reads of the GET views
+DATABASES = database_profile(
+    os.environ.get('FATMUG_DB_PROFILE', 'sqlite'), os.environ,
+    BASE_DIR / 'db.sqlite3')
@@ -0,0 +1,14 @@
+from django.core.management.base import BaseCommand
+
+from ...api_docs import build_schema_files
+
+
+class Command(BaseCommand):
+    help = (
+        "Generate the OpenAPI schema once and write it to API_SCHEMA_DIR, "
+        "where it is served from when FATMUG_API_DOCS=static. Run it at "
+        "deploy time.")
+
+    def handle(self, *args, **options):
+        for path in build_schema_files():
+            self.stdout.write(f"Wrote {path}")
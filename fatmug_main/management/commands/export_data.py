@@ -0,0 +1,39 @@
+from django.core.management.base import BaseCommand
+
+from ...renderers import CSVRenderer, NDJSONRenderer
+from ...utils.exporter import CHUNK_SIZE, EXPORT_MODELS, export_rows
+
+RENDERERS = {
+    renderer.format: renderer for renderer in (NDJSONRenderer, CSVRenderer)}
+
+
+class Command(BaseCommand):
+    help = (
+        "Export every purchase order or vendor as NDJSON or CSV. Rows are "
+        "streamed from the database in chunks, so memory use stays flat.")
+
+    def add_arguments(self, parser):
+        parser.add_argument('dataset', choices=sorted(EXPORT_MODELS))
+        parser.add_argument(
+            '--format', dest='export_format', choices=sorted(RENDERERS),
+            default=NDJSONRenderer.format)
+        parser.add_argument(
+            '--output', help="File to write to, defaults to stdout.")
+        parser.add_argument(
+            '--chunk-size', type=int, default=CHUNK_SIZE,
+            help="Number of rows fetched from the database at a time.")
+
+    def handle(self, *args, dataset, export_format, output=None,
+               chunk_size=CHUNK_SIZE, **options):
+        renderer = RENDERERS[export_format]()
+        fields, rows = export_rows(
+            EXPORT_MODELS[dataset].objects.all(), chunk_size=chunk_size)
+        chunks = renderer.stream(fields, rows, chunk_size=chunk_size)
+
+        if output is None:
+            for chunk in chunks:
+                self.stdout.write(chunk, ending='')
+            return
+        with open(output, 'w', encoding=renderer.charset, newline='') as file:
+            for chunk in chunks:
+                file.write(chunk)
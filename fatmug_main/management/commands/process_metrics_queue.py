@@ -0,0 +1,67 @@
+import time
+
+from django.core.management.base import BaseCommand
+
+from ...utils.metrics_queue import (BATCH_SIZE, drain_metrics_queue,
+                                    queue_stats, recount_all_vendors)
+
+
+class Command(BaseCommand):
+    help = (
+        "Recalculate the vendor metrics queued by purchase order saves when "
+        "METRICS_QUEUE_ENABLED is set. Runs until stopped, or drains the "
+        "queue once with --once.")
+
+    def add_arguments(self, parser):
+        parser.add_argument(
+            '--batch-size', type=int, default=BATCH_SIZE,
+            help="Number of queue entries taken per batch.")
+        parser.add_argument(
+            '--workers', type=int, default=1,
+            help="Number of vendors recalculated in parallel.")
+        parser.add_argument(
+            '--pool', choices=('thread', 'process'), default='thread',
+            help="Run the parallel recalculations in threads or processes.")
+        parser.add_argument(
+            '--interval', type=float, default=5.0,
+            help="Seconds to wait before polling an empty queue again.")
+        parser.add_argument(
+            '--once', action='store_true',
+            help="Drain the queue and exit instead of polling it.")
+        parser.add_argument(
+            '--stats', action='store_true',
+            help="Print the queue depth and delay and exit.")
+        parser.add_argument(
+            '--recount-all', action='store_true',
+            help="Recount the metrics of every vendor from its purchase orders "
+                 "and exit, e.g. after the counters were changed outside the "
+                 "application.")
+
+    def write_stats(self, stats):
+        self.stdout.write(
+            f"Queue depth: {stats['depth']} entries for {stats['vendors']} "
+            f"vendors, oldest waiting {stats['delay_seconds']:.1f}s.")
+
+    def handle(self, *args, batch_size=BATCH_SIZE, workers=1, pool='thread',
+               interval=5.0, once=False, stats=False, recount_all=False,
+               **options):
+        if stats:
+            self.write_stats(queue_stats())
+            return
+        if recount_all:
+            recounted = recount_all_vendors(batch_size=batch_size)
+            self.stdout.write(f"Recounted {recounted} vendors.")
+            return
+
+        while True:
+            before = queue_stats()
+            if before['depth']:
+                self.write_stats(before)
+                processed = drain_metrics_queue(
+                    batch_size=batch_size, workers=workers, pool=pool)
+                self.stdout.write(
+                    f"Recalculated {processed['vendors']} vendors from "
+                    f"{processed['entries']} queue entries.")
+            if once:
+                return
+            time.sleep(interval)
@@ -0,0 +1,42 @@
+from datetime import date, timedelta
+
+from django.core.management.base import BaseCommand, CommandError
+from django.utils import timezone
+
+from ...utils.performance_history import (BATCH_SIZE, backfill_performance,
+                                          snapshot_current_performance)
+
+
+class Command(BaseCommand):
+    help = (
+        "Snapshot the performance metrics of every vendor into "
+        "HistoricalPerformance. Meant to run once a day from a scheduler; "
+        "pass --from/--to to backfill past days from the purchase orders.")
+
+    def add_arguments(self, parser):
+        parser.add_argument(
+            '--from', dest='start', type=date.fromisoformat,
+            help="First day (YYYY-MM-DD) to backfill from purchase order history.")
+        parser.add_argument(
+            '--to', dest='end', type=date.fromisoformat,
+            help="Last day (YYYY-MM-DD) to backfill, defaults to yesterday.")
+        parser.add_argument(
+            '--batch-size', type=int, default=BATCH_SIZE,
+            help="Number of snapshots inserted per query.")
+
+    def handle(self, *args, start=None, end=None, batch_size=BATCH_SIZE, **options):
+        if start is None and end is None:
+            written = snapshot_current_performance(batch_size=batch_size)
+            self.stdout.write(f"Saved {written} vendor performance snapshots.")
+            return
+
+        if start is None:
+            raise CommandError("--to requires --from.")
+        end = end or timezone.localdate() - timedelta(days=1)
+        if start > end:
+            raise CommandError("--from must not be after --to.")
+
+        written = backfill_performance(start, end, batch_size=batch_size)
+        self.stdout.write(
+            f"Backfilled {written} vendor performance snapshots "
+            f"from {start} to {end}.")
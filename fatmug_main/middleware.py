@@ -0,0 +1,73 @@
+import logging
+
+from asgiref.sync import (iscoroutinefunction, markcoroutinefunction,
+                          sync_to_async)
+from django.conf import settings
+
+from .utils.instrumentation import Measurement, instrumentation_enabled
+
+slow_request_logger = logging.getLogger('fatmug_main.slow_requests')
+
+
+class QueryInstrumentationMiddleware:
+    """
+    Records the number of queries, the DB time and the wall time of every
+    request under the name of the URL pattern it resolved to, and logs the
+    requests slower than SLOW_REQUEST_THRESHOLD_MS.
+
+    Works for the sync and the async views. For async requests the query
+    counter is attached on the thread the async ORM runs the queries on.
+    """
+    sync_capable = True
+    async_capable = True
+
+    def __init__(self, get_response):
+        self.get_response = get_response
+        if iscoroutinefunction(self.get_response):
+            markcoroutinefunction(self)
+
+    def __call__(self, request):
+        if iscoroutinefunction(self):
+            return self.__acall__(request)
+        if not instrumentation_enabled():
+            return self.get_response(request)
+
+        measurement = Measurement('view')
+        measurement.start()
+        try:
+            response = self.get_response(request)
+        finally:
+            measurement.name = self.get_view_name(request)
+            measurement.stop()
+        self.log_slow_request(request, measurement)
+        return response
+
+    async def __acall__(self, request):
+        if not instrumentation_enabled():
+            return await self.get_response(request)
+
+        measurement = Measurement('view')
+        await sync_to_async(measurement.start)()
+        try:
+            response = await self.get_response(request)
+        finally:
+            measurement.name = self.get_view_name(request)
+            await sync_to_async(measurement.stop)()
+        self.log_slow_request(request, measurement)
+        return response
+
+    def get_view_name(self, request) -> str:
+        resolver_match = getattr(request, 'resolver_match', None)
+        if resolver_match is None:
+            return 'unresolved'
+        return resolver_match.view_name
+
+    def log_slow_request(self, request, measurement) -> None:
+        wall_ms = measurement.wall_time * 1000
+        if wall_ms < settings.SLOW_REQUEST_THRESHOLD_MS:
+            return
+        slow_request_logger.warning(
+            "Slow request %s %s (%s): %.1f ms, %d queries, %.1f ms in the database",
+            request.method, request.get_full_path(), measurement.name, wall_ms,
+            measurement.queries, measurement.db_time * 1000)
+
@@ -0,0 +1,18 @@
+# Generated by Django 4.2.8 on 2026-10-18 15:44
+
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ("fatmug_main", "0003_alter_vendor_average_response_time"),
+    ]
+
+    operations = [
+        migrations.AddField(
+            model_name="purchaseorder",
+            name="completion_date",
+            field=models.DateTimeField(blank=True, null=True),
+        ),
+    ]
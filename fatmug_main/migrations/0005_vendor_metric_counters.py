@@ -0,0 +1,113 @@
+# Generated by Django 4.2.8 on 2026-10-18 16:20
+
+from django.db import migrations, models
+from django.db.models import Count, DurationField, ExpressionWrapper, F, Q, Sum
+
+
+def ratio(numerator, denominator, scale):
+    if not denominator:
+        return None
+    return round(numerator * scale / denominator, 2)
+
+
+def backfill_vendor_counters(apps, schema_editor):
+    Vendor = apps.get_model("fatmug_main", "Vendor")
+    PurchaseOrder = apps.get_model("fatmug_main", "PurchaseOrder")
+
+    completed = Q(status="completed")
+    acknowledged = Q(acknowledgment_date__isnull=False)
+    rows = (
+        PurchaseOrder.objects.values("vendor_id")
+        .annotate(
+            total_po_count=Count("id"),
+            completed_po_count=Count("id", filter=completed),
+            on_time_po_count=Count(
+                "id",
+                filter=completed
+                & Q(completion_date__date__lte=F("delivery_date__date")),
+            ),
+            quality_rating_sum=Sum("quality_rating", filter=completed),
+            quality_rating_count=Count("quality_rating", filter=completed),
+            acknowledged_po_count=Count("id", filter=acknowledged),
+            response_time_sum=Sum(
+                ExpressionWrapper(
+                    F("acknowledgment_date") - F("issue_date"),
+                    output_field=DurationField(),
+                ),
+                filter=acknowledged,
+            ),
+        )
+        .order_by()
+    )
+
+    for row in rows:
+        vendor_id = row.pop("vendor_id")
+        row["quality_rating_sum"] = row["quality_rating_sum"] or 0
+        row["response_time_sum"] = (
+            row["response_time_sum"].total_seconds()
+            if row["response_time_sum"]
+            else 0
+        )
+        Vendor.objects.filter(pk=vendor_id).update(
+            on_time_delivery_rate=ratio(
+                row["on_time_po_count"], row["completed_po_count"], 100
+            ),
+            quality_rating_avg=ratio(
+                row["quality_rating_sum"], row["quality_rating_count"], 1
+            ),
+            average_response_time=ratio(
+                row["response_time_sum"], row["acknowledged_po_count"], 1 / 60
+            ),
+            fulfillment_rate=ratio(
+                row["completed_po_count"], row["total_po_count"], 100
+            ),
+            **row,
+        )
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ("fatmug_main", "0004_purchaseorder_completion_date"),
+    ]
+
+    operations = [
+        migrations.AddField(
+            model_name="vendor",
+            name="acknowledged_po_count",
+            field=models.PositiveIntegerField(default=0),
+        ),
+        migrations.AddField(
+            model_name="vendor",
+            name="completed_po_count",
+            field=models.PositiveIntegerField(default=0),
+        ),
+        migrations.AddField(
+            model_name="vendor",
+            name="on_time_po_count",
+            field=models.PositiveIntegerField(default=0),
+        ),
+        migrations.AddField(
+            model_name="vendor",
+            name="quality_rating_count",
+            field=models.PositiveIntegerField(default=0),
+        ),
+        migrations.AddField(
+            model_name="vendor",
+            name="quality_rating_sum",
+            field=models.FloatField(default=0),
+        ),
+        migrations.AddField(
+            model_name="vendor",
+            name="response_time_sum",
+            field=models.FloatField(db_comment="in Seconds", default=0),
+        ),
+        migrations.AddField(
+            model_name="vendor",
+            name="total_po_count",
+            field=models.PositiveIntegerField(default=0),
+        ),
+        migrations.RunPython(
+            backfill_vendor_counters, reverse_code=migrations.RunPython.noop
+        ),
+    ]
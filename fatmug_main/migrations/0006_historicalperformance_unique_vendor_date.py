@@ -0,0 +1,39 @@
+# Generated by Django 4.2.8 on 2026-10-18 16:48
+
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ("fatmug_main", "0005_vendor_metric_counters"),
+    ]
+
+    operations = [
+        migrations.AlterField(
+            model_name="historicalperformance",
+            name="average_response_time",
+            field=models.FloatField(null=True),
+        ),
+        migrations.AlterField(
+            model_name="historicalperformance",
+            name="fulfillment_rate",
+            field=models.FloatField(null=True),
+        ),
+        migrations.AlterField(
+            model_name="historicalperformance",
+            name="on_time_delivery_rate",
+            field=models.FloatField(null=True),
+        ),
+        migrations.AlterField(
+            model_name="historicalperformance",
+            name="quality_rating_avg",
+            field=models.FloatField(null=True),
+        ),
+        migrations.AddConstraint(
+            model_name="historicalperformance",
+            constraint=models.UniqueConstraint(
+                fields=("vendor", "date"), name="unique_vendor_performance_date"
+            ),
+        ),
+    ]
@@ -0,0 +1,22 @@
+# Generated by Django 4.2.8 on 2026-10-18 17:05
+
+import django.utils.timezone
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ("fatmug_main", "0006_historicalperformance_unique_vendor_date"),
+    ]
+
+    operations = [
+        migrations.AddField(
+            model_name="vendor",
+            name="updated_at",
+            field=models.DateTimeField(
+                auto_now=True, default=django.utils.timezone.now
+            ),
+            preserve_default=False,
+        ),
+    ]
@@ -0,0 +1,37 @@
+# Generated by Django 4.2.8 on 2026-10-18 17:30
+
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ("fatmug_main", "0007_vendor_updated_at"),
+    ]
+
+    operations = [
+        migrations.AddIndex(
+            model_name="vendor",
+            index=models.Index(
+                fields=["on_time_delivery_rate"], name="vendor_on_time_rate_idx"
+            ),
+        ),
+        migrations.AddIndex(
+            model_name="vendor",
+            index=models.Index(
+                fields=["quality_rating_avg"], name="vendor_quality_avg_idx"
+            ),
+        ),
+        migrations.AddIndex(
+            model_name="vendor",
+            index=models.Index(
+                fields=["average_response_time"], name="vendor_response_time_idx"
+            ),
+        ),
+        migrations.AddIndex(
+            model_name="vendor",
+            index=models.Index(
+                fields=["fulfillment_rate"], name="vendor_fulfillment_rate_idx"
+            ),
+        ),
+    ]
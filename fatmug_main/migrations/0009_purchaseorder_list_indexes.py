@@ -0,0 +1,29 @@
+# Generated by Django 4.2.8 on 2026-10-18 17:55
+
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ("fatmug_main", "0008_vendor_metric_indexes"),
+    ]
+
+    operations = [
+        migrations.AddIndex(
+            model_name="purchaseorder",
+            index=models.Index(fields=["issue_date", "id"], name="po_issue_date_idx"),
+        ),
+        migrations.AddIndex(
+            model_name="purchaseorder",
+            index=models.Index(
+                fields=["vendor", "issue_date", "id"], name="po_vendor_issue_date_idx"
+            ),
+        ),
+        migrations.AddIndex(
+            model_name="purchaseorder",
+            index=models.Index(
+                fields=["status", "issue_date", "id"], name="po_status_issue_date_idx"
+            ),
+        ),
+    ]
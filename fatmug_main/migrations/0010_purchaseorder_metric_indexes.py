@@ -0,0 +1,36 @@
+# Generated by Django 4.2.8 on 2026-10-18 18:40
+
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ("fatmug_main", "0009_purchaseorder_list_indexes"),
+    ]
+
+    operations = [
+        migrations.AddIndex(
+            model_name="purchaseorder",
+            index=models.Index(
+                fields=[
+                    "vendor",
+                    "status",
+                    "completion_date",
+                    "delivery_date",
+                    "quality_rating",
+                    "acknowledgment_date",
+                    "issue_date",
+                ],
+                name="po_vendor_metrics_idx",
+            ),
+        ),
+        migrations.AddIndex(
+            model_name="purchaseorder",
+            index=models.Index(
+                condition=models.Q(("acknowledgment_date__isnull", False)),
+                fields=["vendor", "acknowledgment_date", "issue_date"],
+                name="po_vendor_acknowledged_idx",
+            ),
+        ),
+    ]
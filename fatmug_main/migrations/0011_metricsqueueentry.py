@@ -0,0 +1,36 @@
+# Generated by Django 4.2.8 on 2026-10-18 19:10
+
+import django.db.models.deletion
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ("fatmug_main", "0010_purchaseorder_metric_indexes"),
+    ]
+
+    operations = [
+        migrations.CreateModel(
+            name="MetricsQueueEntry",
+            fields=[
+                (
+                    "id",
+                    models.BigAutoField(
+                        auto_created=True,
+                        primary_key=True,
+                        serialize=False,
+                        verbose_name="ID",
+                    ),
+                ),
+                ("enqueued_at", models.DateTimeField(auto_now_add=True)),
+                (
+                    "vendor",
+                    models.ForeignKey(
+                        on_delete=django.db.models.deletion.CASCADE,
+                        to="fatmug_main.vendor",
+                    ),
+                ),
+            ],
+        ),
+    ]
@@ -0,0 +1,157 @@
+# Generated by Django 4.2.8 on 2026-10-18 21:05
+
+from numbers import Number
+
+import django.db.models.deletion
+from django.db import migrations, models
+
+# A copy of utils/line_items.py as of this migration, so that later changes
+# to the app code do not change what the migration writes
+BATCH_SIZE = 1000
+SKU_MAX_LENGTH = 100
+NAME_MAX_LENGTH = 255
+
+
+def _quantity(value):
+    if isinstance(value, Number) and not isinstance(value, bool):
+        return int(value)
+    return None
+
+
+def _line(sku, name=None, quantity=None):
+    if sku is None or sku == "":
+        return None
+    return {
+        "sku": str(sku)[:SKU_MAX_LENGTH],
+        "name": str(name)[:NAME_MAX_LENGTH] if name is not None else "",
+        "quantity": _quantity(quantity),
+    }
+
+
+def _line_from_object(line):
+    return _line(line.get("sku"), line.get("name"), line.get("quantity"))
+
+
+def extract_line_items(items, quantity=None):
+    if isinstance(items, list):
+        lines = [
+            _line_from_object(item) if isinstance(item, dict) else _line(item)
+            for item in items
+        ]
+    elif isinstance(items, dict) and "sku" in items:
+        lines = [_line_from_object(items)]
+    elif isinstance(items, dict):
+        lines = []
+        for sku, value in items.items():
+            if isinstance(value, dict):
+                lines.append(_line(sku, value.get("name"), value.get("quantity")))
+            elif _quantity(value) is not None:
+                lines.append(_line(sku, quantity=value))
+            else:
+                lines.append(_line(sku, name=value))
+    elif isinstance(items, (str, int)) and not isinstance(items, bool):
+        lines = [_line(items)]
+    else:
+        lines = []
+
+    lines = [line for line in lines if line is not None]
+    if len(lines) == 1 and lines[0]["quantity"] is None:
+        lines[0]["quantity"] = _quantity(quantity)
+    return lines
+
+
+def backfill_line_items(apps, schema_editor):
+    PurchaseOrder = apps.get_model("fatmug_main", "PurchaseOrder")
+    PurchaseOrderItem = apps.get_model("fatmug_main", "PurchaseOrderItem")
+
+    orders = PurchaseOrder.objects.order_by("pk").values_list(
+        "pk", "vendor_id", "issue_date", "items", "quantity"
+    )
+    rows = []
+    for pk, vendor_id, issue_date, items, quantity in orders.iterator(
+        chunk_size=BATCH_SIZE
+    ):
+        rows.extend(
+            PurchaseOrderItem(
+                purchase_order_id=pk,
+                vendor_id=vendor_id,
+                issue_date=issue_date,
+                **line,
+            )
+            for line in extract_line_items(items, quantity)
+        )
+        if len(rows) >= BATCH_SIZE:
+            PurchaseOrderItem.objects.bulk_create(rows)
+            rows = []
+    PurchaseOrderItem.objects.bulk_create(rows)
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ("fatmug_main", "0011_metricsqueueentry"),
+    ]
+
+    operations = [
+        migrations.CreateModel(
+            name="PurchaseOrderItem",
+            fields=[
+                (
+                    "id",
+                    models.BigAutoField(
+                        auto_created=True,
+                        primary_key=True,
+                        serialize=False,
+                        verbose_name="ID",
+                    ),
+                ),
+                ("sku", models.CharField(max_length=100)),
+                ("name", models.CharField(blank=True, max_length=255)),
+                ("quantity", models.IntegerField(null=True)),
+                ("issue_date", models.DateTimeField()),
+                (
+                    "purchase_order",
+                    models.ForeignKey(
+                        on_delete=django.db.models.deletion.CASCADE,
+                        related_name="line_items",
+                        to="fatmug_main.purchaseorder",
+                    ),
+                ),
+                (
+                    "vendor",
+                    models.ForeignKey(
+                        db_index=False,
+                        on_delete=django.db.models.deletion.DO_NOTHING,
+                        to="fatmug_main.vendor",
+                    ),
+                ),
+            ],
+            options={
+                "indexes": [
+                    models.Index(
+                        fields=[
+                            "sku",
+                            "issue_date",
+                            "vendor",
+                            "quantity",
+                            "purchase_order",
+                        ],
+                        name="po_item_sku_idx",
+                    ),
+                    models.Index(
+                        fields=[
+                            "vendor",
+                            "sku",
+                            "issue_date",
+                            "quantity",
+                            "purchase_order",
+                        ],
+                        name="po_item_vendor_sku_idx",
+                    ),
+                ],
+            },
+        ),
+        migrations.RunPython(
+            backfill_line_items, reverse_code=migrations.RunPython.noop
+        ),
+    ]
@@ -0,0 +1,17 @@
+# Generated by Django 4.2.8 on 2026-10-18 22:40
+
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ("fatmug_main", "0012_purchaseorderitem"),
+    ]
+
+    operations = [
+        migrations.AddIndex(
+            model_name="vendor",
+            index=models.Index(fields=["name"], name="vendor_name_idx"),
+        ),
+    ]
@@ -0,0 +1,17 @@
+# Generated by Django 4.2.8 on 2026-10-18 23:50
+
+from django.db import migrations
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ("fatmug_main", "0013_vendor_name_idx"),
+    ]
+
+    operations = [
+        migrations.RemoveIndex(
+            model_name="purchaseorder",
+            name="po_vendor_metrics_idx",
+        ),
+    ]
@@ -0,0 +1,36 @@
+# Generated by Django 4.2.8 on 2026-10-18 23:55
+
+import django.db.models.deletion
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ("fatmug_main", "0014_remove_purchaseorder_po_vendor_metrics_idx"),
+    ]
+
+    operations = [
+        migrations.CreateModel(
+            name="VendorCounterDelta",
+            fields=[
+                (
+                    "id",
+                    models.BigAutoField(
+                        auto_created=True,
+                        primary_key=True,
+                        serialize=False,
+                        verbose_name="ID",
+                    ),
+                ),
+                ("deltas", models.JSONField()),
+                (
+                    "vendor",
+                    models.ForeignKey(
+                        on_delete=django.db.models.deletion.CASCADE,
+                        to="fatmug_main.vendor",
+                    ),
+                ),
+            ],
+        ),
+    ]
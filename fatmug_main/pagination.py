@@ -0,0 +1,215 @@
+import json
+
+from django.core.exceptions import FieldDoesNotExist
+from django.core.exceptions import ValidationError as DjangoValidationError
+from django.db.models import F, Q
+from rest_framework.exceptions import NotFound
+from rest_framework.pagination import Cursor, CursorPagination
+from rest_framework.utils.urls import remove_query_param
+
+
+class KeysetPagination(CursorPagination):
+    """
+    Cursor pagination on the whole ordering rather than its first field.
+
+    CursorPagination only keeps the first ordering field in its cursor and
+    skips the rows tied with it by offset, at most `offset_cutoff` of them,
+    so with more ties than that pages repeat. Here the cursor holds every
+    ordering value of the row it continues from, and the next page is
+    read with a row-wise comparison, (a > x) OR (a = x AND b > y) and so
+    on, which the index on the ordering serves. The ordering must end with
+    a unique field.
+
+    Nullable model fields sort with NULLs last in either direction.
+    """
+
+    def paginate_queryset(self, queryset, request, view=None):
+        self.page_size = self.get_page_size(request)
+        if not self.page_size:
+            return None
+
+        self.base_url = request.build_absolute_uri()
+        self.ordering = self.get_ordering(request, queryset, view)
+        self.cursor = self.decode_cursor(request)
+        reverse = self.cursor is not None and self.cursor.reverse
+        position = self.cursor.position if self.cursor is not None else None
+
+        queryset = queryset.order_by(*self.get_order_by(queryset.model, reverse))
+        if position is not None:
+            queryset = self.filter_position(queryset, position, reverse)
+        results = list(queryset[:self.page_size + 1])
+        self.page = results[:self.page_size]
+        has_more = len(results) > self.page_size
+
+        if reverse:
+            self.page.reverse()
+            self.has_next = position is not None
+            self.has_previous = has_more
+        else:
+            self.has_next = has_more
+            self.has_previous = position is not None
+
+        if (self.has_previous or self.has_next) and self.template is not None:
+            self.display_page_controls = True
+        return self.page
+
+    def is_nullable(self, model, field_name) -> bool:
+        try:
+            return model._meta.get_field(field_name).null
+        except FieldDoesNotExist:
+            # Annotations, such as time buckets
+            return False
+
+    def get_order_by(self, model, reverse) -> list:
+        order_by = []
+        for field in self.ordering:
+            name = field.lstrip('-')
+            descending = field.startswith('-') != reverse
+            if not self.is_nullable(model, name):
+                order_by.append(f'-{name}' if descending else name)
+                continue
+            nulls = {'nulls_first': True} if reverse else {'nulls_last': True}
+            order_by.append(
+                F(name).desc(**nulls) if descending else F(name).asc(**nulls))
+        return order_by
+
+    def filter_position(self, queryset, position, reverse):
+        """
+        Keep the rows after `position` in the ordering, or before it for a
+        reverse cursor.
+        """
+        try:
+            values = json.loads(position)
+        except ValueError:
+            raise NotFound(self.invalid_cursor_message)
+        if not isinstance(values, list) or len(values) != len(self.ordering):
+            raise NotFound(self.invalid_cursor_message)
+
+        condition, ties = None, Q()
+        for field, value in zip(self.ordering, values):
+            name = field.lstrip('-')
+            nullable = self.is_nullable(queryset.model, name)
+            lookup = 'lt' if field.startswith('-') != reverse else 'gt'
+            if value is None:
+                # NULLs come last: nothing follows them, everything else
+                # precedes them
+                past = Q(**{f'{name}__isnull': False}) if reverse else None
+                tie = Q(**{f'{name}__isnull': True})
+            else:
+                past = Q(**{f'{name}__{lookup}': value})
+                if nullable and not reverse:
+                    past |= Q(**{f'{name}__isnull': True})
+                tie = Q(**{name: value})
+            if past is not None:
+                condition = ties & past if condition is None else (
+                    condition | (ties & past))
+            ties &= tie
+
+        if condition is None:
+            return queryset.none()
+        # Redundant bound on the first field, so the index is searched from
+        # the position instead of scanned from its start
+        field, value = self.ordering[0], values[0]
+        name = field.lstrip('-')
+        if value is not None and (
+                reverse or not self.is_nullable(queryset.model, name)):
+            lookup = 'lte' if field.startswith('-') != reverse else 'gte'
+            condition &= Q(**{f'{name}__{lookup}': value})
+        try:
+            return queryset.filter(condition)
+        except (DjangoValidationError, TypeError, ValueError):
+            raise NotFound(self.invalid_cursor_message)
+
+    def _get_position_from_instance(self, instance, ordering):
+        values = []
+        for field in ordering:
+            name = field.lstrip('-')
+            value = (instance[name] if isinstance(instance, dict)
+                     else getattr(instance, name))
+            if not (value is None or isinstance(value, (bool, int, float, str))):
+                value = str(value)
+            values.append(value)
+        return json.dumps(values, separators=(',', ':'))
+
+    def get_next_link(self):
+        if not self.has_next:
+            return None
+        if not self.page:
+            # A reverse cursor found nothing before it, the first page
+            # starts at its position
+            return remove_query_param(self.base_url, self.cursor_query_param)
+        position = self._get_position_from_instance(self.page[-1], self.ordering)
+        return self.encode_cursor(Cursor(offset=0, reverse=False, position=position))
+
+    def get_previous_link(self):
+        if not self.has_previous:
+            return None
+        # Without rows on this page the previous one is the last page
+        position = (self._get_position_from_instance(self.page[0], self.ordering)
+                    if self.page else None)
+        return self.encode_cursor(Cursor(offset=0, reverse=True, position=position))
+
+
+class PerformanceHistoryPagination(CursorPagination):
+    """
+    Keyset pagination over the time buckets of a vendor's performance
+    history, each page continues from the last bucket of the previous one.
+    """
+    ordering = 'bucket'
+    page_size = 100
+    page_size_query_param = 'page_size'
+    max_page_size = 1000
+
+
+class VendorPagination(CursorPagination):
+    """
+    Cursor pagination over vendors in primary key order.
+    """
+    ordering = 'id'
+    page_size = 100
+    page_size_query_param = 'page_size'
+    max_page_size = 1000
+
+
+class VendorLeaderboardPagination(KeysetPagination):
+    """
+    Keyset pagination for the vendor leaderboard, the ordering comes from
+    the view's MetricOrderingFilter and ends with the vendor id, so vendors
+    with the same rates are paged in id order.
+    """
+    page_size = 50
+    page_size_query_param = 'page_size'
+    max_page_size = 1000
+
+
+class PurchaseOrderPagination(KeysetPagination):
+    """
+    Keyset pagination over purchase orders in issue order, pages are read
+    with an indexed range scan instead of an offset, whatever the number
+    of orders issued at the same time.
+    """
+    ordering = ('issue_date', 'id')
+    page_size = 100
+    page_size_query_param = 'page_size'
+    max_page_size = 1000
+
+
+class ItemSummaryPagination(KeysetPagination):
+    """
+    Keyset pagination over the per vendor and SKU totals of the line items,
+    also when '?vendor_id=' makes every row share the vendor.
+    """
+    ordering = ('vendor_id', 'sku')
+    page_size = 100
+    page_size_query_param = 'page_size'
+    max_page_size = 1000
+
+
+class ItemVendorPagination(CursorPagination):
+    """
+    Cursor pagination over the vendors that supplied a SKU.
+    """
+    ordering = 'vendor_id'
+    page_size = 100
+    page_size_query_param = 'page_size'
+    max_page_size = 1000
@@ -0,0 +1,33 @@
+import codecs
+import json
+
+from django.conf import settings
+from rest_framework.exceptions import ParseError
+from rest_framework.parsers import BaseParser
+
+
+class NDJSONParser(BaseParser):
+    """
+    Parses newline delimited JSON, one object per line.
+
+    The lines are parsed lazily while the stream is read, so large uploads
+    never have to be held in memory at once. A line that is not valid JSON
+    is yielded as a ParseError, letting the caller report it against its row
+    instead of rejecting the whole upload.
+    """
+    media_type = 'application/x-ndjson'
+
+    def parse(self, stream, media_type=None, parser_context=None):
+        parser_context = parser_context or {}
+        encoding = parser_context.get('encoding', settings.DEFAULT_CHARSET)
+        if stream is None:
+            return iter(())
+        decoded_stream = codecs.getreader(encoding)(stream)
+        return (
+            self.parse_line(line) for line in decoded_stream if line.strip())
+
+    def parse_line(self, line):
+        try:
+            return json.loads(line)
+        except ValueError as exc:
+            return ParseError('JSON parse error - %s' % str(exc))
@@ -0,0 +1,108 @@
+import csv
+import json
+from datetime import date, datetime, timezone
+
+from rest_framework.renderers import BaseRenderer
+
+
+def _json_default(value):
+    # Same datetime format as the DRF serializers use in the API responses
+    if isinstance(value, datetime):
+        value = value.astimezone(timezone.utc).isoformat()
+        return value[:-6] + 'Z' if value.endswith('+00:00') else value
+    if isinstance(value, date):
+        return value.isoformat()
+    raise TypeError(f'Object of type {type(value).__name__} is not JSON serializable')
+
+
+class _Echo:
+    # csv.writer needs a file, this one hands every line straight back
+    def write(self, value):
+        return value
+
+
+class NDJSONRenderer(BaseRenderer):
+    """
+    Renders newline delimited JSON, one object per line.
+    """
+    media_type = 'application/x-ndjson'
+    format = 'ndjson'
+    charset = 'utf-8'
+
+    def render(self, data, accepted_media_type=None, renderer_context=None):
+        rows = data if isinstance(data, list) else [data]
+        return ''.join(self.render_line(row) for row in rows).encode(self.charset)
+
+    def render_line(self, row):
+        return json.dumps(row, default=_json_default) + '\n'
+
+    def stream(self, fields, rows, chunk_size=1000):
+        """
+        Encode `rows` (tuples of the `fields` values) lazily, `chunk_size`
+        rows per yielded chunk.
+        """
+        chunk = []
+        for row in rows:
+            chunk.append(self.render_line(dict(zip(fields, row))))
+            if len(chunk) == chunk_size:
+                yield ''.join(chunk)
+                chunk = []
+        if chunk:
+            yield ''.join(chunk)
+
+
+class CSVRenderer(BaseRenderer):
+    """
+    Renders comma separated values with a header row. Nested values such as
+    the purchase order items are written as JSON.
+    """
+    media_type = 'text/csv'
+    format = 'csv'
+    charset = 'utf-8'
+
+    def render(self, data, accepted_media_type=None, renderer_context=None):
+        rows = data if isinstance(data, list) else [data]
+        fields = list(rows[0]) if rows else []
+        return ''.join(self.stream(
+            fields, ([row.get(field) for field in fields] for row in rows),
+        )).encode(self.charset)
+
+    def render_value(self, value):
+        if value is None:
+            return ''
+        if isinstance(value, (dict, list)):
+            return json.dumps(value, default=_json_default)
+        if isinstance(value, (datetime, date)):
+            return _json_default(value)
+        return value
+
+    def stream(self, fields, rows, chunk_size=1000):
+        """
+        Encode `rows` (tuples of the `fields` values) lazily, `chunk_size`
+        rows per yielded chunk.
+        """
+        writer = csv.writer(_Echo())
+        chunk = [writer.writerow(fields)]
+        for row in rows:
+            chunk.append(writer.writerow(
+                [self.render_value(value) for value in row]))
+            if len(chunk) == chunk_size:
+                yield ''.join(chunk)
+                chunk = []
+        if chunk:
+            yield ''.join(chunk)
+
+
+class PrometheusRenderer(BaseRenderer):
+    """
+    Renders an already formatted Prometheus text exposition as is, error
+    responses as plain text.
+    """
+    media_type = 'text/plain'
+    format = 'prometheus'
+    charset = 'utf-8'
+
+    def render(self, data, accepted_media_type=None, renderer_context=None):
+        if isinstance(data, dict):
+            data = ''.join(f'# {key}: {value}\n' for key, value in data.items())
+        return data.encode(self.charset)
@@ -0,0 +1,57 @@
+from contextlib import contextmanager
+from contextvars import ContextVar
+
+from django.conf import settings
+from django.db import connections
+
+REPLICA_DATABASE = 'replica'
+
+_read_only = ContextVar('read_only', default=False)
+
+
+@contextmanager
+def read_only():
+    """Route the reads made within the block to the replica, if any."""
+    token = _read_only.set(True)
+    try:
+        yield
+    finally:
+        _read_only.reset(token)
+
+
+def replica_configured() -> bool:
+    if REPLICA_DATABASE not in settings.DATABASES:
+        return False
+    # A replica that is the default database itself, as when it is a test
+    # mirror, would read outside of the transaction of a test
+    replica = connections[REPLICA_DATABASE].settings_dict
+    default = connections['default'].settings_dict
+    return any(replica[key] != default[key] for key in ('NAME', 'HOST', 'PORT'))
+
+
+class ReadReplicaRouter:
+    """
+    Sends the reads of read only requests, marked by ReadReplicaMixin, to
+    the 'replica' database when one is configured. Writes and all other
+    reads stay on 'default', so a request never reads its own writes from
+    the replica.
+    """
+
+    def db_for_read(self, model, **hints):
+        if _read_only.get() and replica_configured():
+            return REPLICA_DATABASE
+        return None
+
+    def db_for_write(self, model, **hints):
+        return None
+
+    def allow_relation(self, obj1, obj2, **hints):
+        # Both hold the same data
+        if {obj1._state.db, obj2._state.db} <= {'default', REPLICA_DATABASE}:
+            return True
+        return None
+
+    def allow_migrate(self, db, app_label, model_name=None, **hints):
+        if db == REPLICA_DATABASE:
+            return False
+        return None
@@ -1,20 +1,184 @@
-from rest_framework import serializers
+import datetime
+
+from django.core.exceptions import ImproperlyConfigured
+from django.db.models import ExpressionWrapper, F, TextField
+from rest_framework import ISO_8601, serializers
+from rest_framework.settings import api_settings
 
 from .models import HistoricalPerformance, PurchaseOrder, Vendor
+from .utils.bulk_acknowledge import MAX_IDS
+from .utils.metrics_calculator import COUNTER_FIELDS
+
+
+class DynamicFieldsMixin:
+    """
+    Takes an optional `fields` argument that limits the serialized fields.
+    """
 
+    def __init__(self, *args, fields=None, **kwargs):
+        super().__init__(*args, **kwargs)
+        if fields is not None:
+            for field_name in set(self.fields) - set(fields):
+                self.fields.pop(field_name)
 
-class VendorSerializer(serializers.ModelSerializer):
+
+class VendorSerializer(DynamicFieldsMixin, serializers.ModelSerializer):
     class Meta:
         model = Vendor
         fields = '__all__'
+        read_only_fields = COUNTER_FIELDS
 
 
-class PurchaseOrderSerializer(serializers.ModelSerializer):
+class PurchaseOrderSerializer(DynamicFieldsMixin, serializers.ModelSerializer):
     class Meta:
         model = PurchaseOrder
         fields = '__all__'
 
 
+def _iso_datetime(value, timezone):
+    value = value.astimezone(timezone).isoformat()
+    if value.endswith('+00:00'):
+        value = value[:-6] + 'Z'
+    return value
+
+
+def _datetime_converter(field):
+    """
+    Return the converter of a datetime field and whether the column can be
+    read as text. Read as text, the column skips the backend's conversion to
+    an aware datetime: backends storing datetimes in UTC without an offset,
+    like SQLite, return the stored value as a string or a naive datetime.
+    """
+    output_format = getattr(field, 'format', api_settings.DATETIME_FORMAT)
+    if output_format is None:
+        return None, False
+    timezone = (field.timezone if hasattr(field, 'timezone')
+                else field.default_timezone())
+    if output_format.lower() != ISO_8601 or timezone is None:
+        return field.to_representation, False
+    is_utc = timezone.utcoffset(None) == datetime.timedelta(0)
+
+    def convert(value):
+        if isinstance(value, str):
+            value = datetime.datetime.fromisoformat(value)
+        if value.tzinfo is None:
+            if is_utc:
+                return value.isoformat() + 'Z'
+            value = value.replace(tzinfo=datetime.timezone.utc)
+        return _iso_datetime(value, timezone)
+    return convert, True
+
+
+def _choice_converter(field):
+    choices = field.choice_strings_to_values
+
+    def convert(value):
+        if value == '':
+            return value
+        return choices.get(str(value), value)
+    return convert
+
+
+def _value_converter(field):
+    """
+    Return the function that turns a column value into the representation
+    of `field`, or None when the value is its own representation.
+    """
+    if isinstance(field, serializers.PrimaryKeyRelatedField):
+        return field.pk_field.to_representation if field.pk_field else None
+    if isinstance(field, (serializers.RelatedField, serializers.ManyRelatedField,
+                          serializers.BaseSerializer,
+                          serializers.SerializerMethodField)):
+        raise ImproperlyConfigured(
+            f"Field '{field.field_name}' is not a column and cannot be read "
+            f"from values.")
+    if isinstance(field, serializers.ChoiceField):
+        return _choice_converter(field)
+    if isinstance(field, serializers.JSONField) and not field.binary:
+        return None
+    if isinstance(field, serializers.CharField):
+        return str
+    if isinstance(field, serializers.IntegerField):
+        return int
+    if isinstance(field, serializers.FloatField):
+        return float
+    return field.to_representation
+
+
+class ValuesSerializer:
+    """
+    Read-only serializer of `values_list()` rows, with the same output as the
+    `serializer` it is built from, for list endpoints. Each field's
+    conversion is looked up once instead of going through the serializer's
+    field-by-field machinery for every model instance.
+
+    Every field must be a model column or a primary key relation.
+    """
+
+    def __init__(self, serializer):
+        fields = [field for field in serializer.fields.values()
+                  if not field.write_only]
+        self.field_names = tuple(field.field_name for field in fields)
+        self.columns, self.converters, self.annotations = [], [], {}
+        for field in fields:
+            if isinstance(field, serializers.DateTimeField):
+                converter, as_text = _datetime_converter(field)
+            else:
+                converter, as_text = _value_converter(field), False
+            column = field.source
+            if as_text:
+                column = f'{field.source}_text'
+                self.annotations[column] = ExpressionWrapper(
+                    F(field.source), output_field=TextField())
+            self.columns.append(column)
+            self.converters.append(converter)
+
+    def values_list(self, queryset, *extra_fields):
+        """
+        Return the rows of `queryset` to serialize, as named tuples that
+        also hold the `extra_fields` columns.
+        """
+        columns = dict.fromkeys((*self.columns, *extra_fields))
+        return queryset.annotate(**self.annotations).values_list(
+            *columns, named=True)
+
+    def to_representation(self, rows) -> list:
+        field_names, converters = self.field_names, self.converters
+        return [
+            {name: value if value is None or convert is None else convert(value)
+             for name, convert, value in zip(field_names, converters, row)}
+            for row in rows]
+
+
+class PrefetchedVendorField(serializers.PrimaryKeyRelatedField):
+    """
+    Resolves vendor ids against the `vendors` mapping in the serializer
+    context when present, so a batch of rows costs one vendor query.
+    """
+
+    def to_internal_value(self, data):
+        vendors = self.context.get('vendors')
+        if vendors is None:
+            return super().to_internal_value(data)
+        if isinstance(data, bool):
+            self.fail('incorrect_type', data_type=type(data).__name__)
+        try:
+            return vendors[int(data)]
+        except KeyError:
+            self.fail('does_not_exist', pk_value=data)
+        except (TypeError, ValueError):
+            self.fail('incorrect_type', data_type=type(data).__name__)
+
+
+class BulkPurchaseOrderSerializer(PurchaseOrderSerializer):
+    # Rows are matched to existing orders by po_number before validation,
+    # so the per-row uniqueness query is not needed
+    vendor = PrefetchedVendorField(queryset=Vendor.objects.all())
+
+    class Meta(PurchaseOrderSerializer.Meta):
+        extra_kwargs = {'po_number': {'validators': []}}
+
+
 class VendorPerformanceSerializer(serializers.Serializer):
     vendor_name = serializers.CharField()
     on_time_delivery_rate = serializers.FloatField(allow_null=True)
@@ -29,6 +193,42 @@ class HistoricalPerformanceSerializer(serializers.ModelSerializer):
         fields = '__all__'
 
 
+class VendorLeaderboardSerializer(VendorPerformanceSerializer):
+    vendor_id = serializers.IntegerField()
+
+
+class PerformanceHistoryBucketSerializer(serializers.Serializer):
+    bucket = serializers.DateTimeField()
+    on_time_delivery_rate = serializers.FloatField(allow_null=True)
+    quality_rating_avg = serializers.FloatField(allow_null=True)
+    average_response_time = serializers.FloatField(allow_null=True)
+    fulfillment_rate = serializers.FloatField(allow_null=True)
+    samples = serializers.IntegerField()
+
+
+class ItemSummarySerializer(serializers.Serializer):
+    vendor_id = serializers.IntegerField()
+    sku = serializers.CharField()
+    order_count = serializers.IntegerField()
+    total_quantity = serializers.IntegerField(allow_null=True)
+    last_issue_date = serializers.DateTimeField()
+
+
+class ItemVendorSerializer(serializers.Serializer):
+    vendor_id = serializers.IntegerField()
+    vendor_name = serializers.CharField()
+    order_count = serializers.IntegerField()
+    total_quantity = serializers.IntegerField(allow_null=True)
+    first_issue_date = serializers.DateTimeField()
+    last_issue_date = serializers.DateTimeField()
+
+
+class BulkAcknowledgePurchaseOrderSerializer(serializers.Serializer):
+    ids = serializers.ListField(
+        child=serializers.IntegerField(min_value=1),
+        allow_empty=False, max_length=MAX_IDS)
+
+
 class AcknowledgePurchaseOrderSerializer(serializers.Serializer):
     def validate(self, data):
         # If no data is provided, consider it as an acknowledgment
@@ -10,6 +10,7 @@ For the full list of settings and their values, see
 https://docs.djangoproject.com/en/4.2/ref/settings/
 """
 
+import importlib.util
 import os
 from pathlib import Path
 
@@ -40,11 +41,18 @@ DEFAULT_APPS = [
     "django.contrib.staticfiles",
 ]
 
+# API documentation: 'live' generates it with drf_yasg on request, 'static'
+# serves the schema written by the 'build_api_schema' command without
+# loading drf_yasg (faster worker and command start up), 'off' disables it
+API_DOCS = os.environ.get('FATMUG_API_DOCS', 'live')
+API_SCHEMA_DIR = BASE_DIR / 'static' / 'api_schema'
+
 THIRD_PARTY_APPS = [
     'rest_framework',
     'rest_framework.authtoken',
-    'drf_yasg'
 ]
+if API_DOCS == 'live':
+    THIRD_PARTY_APPS.append('drf_yasg')
 
 LOCAL_APPS = [
     "fatmug_main",
@@ -53,6 +61,7 @@ LOCAL_APPS = [
 INSTALLED_APPS = DEFAULT_APPS + LOCAL_APPS + THIRD_PARTY_APPS
 
 MIDDLEWARE = [
+    "fatmug_main.middleware.QueryInstrumentationMiddleware",
     "django.middleware.security.SecurityMiddleware",
     "django.contrib.sessions.middleware.SessionMiddleware",
     "django.middleware.common.CommonMiddleware",
@@ -121,6 +130,12 @@ SILENCED_SYSTEM_CHECKS = ["2_0.W001", "fields.W163"]
 STATIC_URL = "/static/"
 STATIC_FILES_DIRs = os.path.join(BASE_DIR, 'static')
 STATIC_ROOT = os.path.join(BASE_DIR, 'static')
+# The static API docs serve the Swagger UI and ReDoc files of drf-yasg, found
+# here without importing it when it is not an installed app
+DRF_YASG_SPEC = importlib.util.find_spec('drf_yasg')
+STATICFILES_DIRS = [
+    os.path.join(DRF_YASG_SPEC.submodule_search_locations[0], 'static'),
+] if API_DOCS == 'static' and DRF_YASG_SPEC else []
 
 MEDIA_URL = "/media/"
 MEDIA_ROOT = os.path.join(BASE_DIR, 'media/')
@@ -128,10 +143,63 @@ MEDIA_ROOT = os.path.join(BASE_DIR, 'media/')
 REST_FRAMEWORK = {
     'DEFAULT_SCHEMA_CLASS': 'rest_framework.schemas.coreapi.AutoSchema',
     'DEFAULT_AUTHENTICATION_CLASSES': [
-        'rest_framework.authentication.TokenAuthentication',
+        'fatmug_main.authentication.CachedTokenAuthentication',
     ],
 }
 
+# Valid API tokens are cached for TOKEN_AUTH_CACHE_TIMEOUT seconds, in the
+# default cache ('shared') or per process in an LRU of TOKEN_AUTH_CACHE_SIZE
+# entries ('local'). Deleting a token or saving its user drops it from the
+# cache, a local cache of another process only forgets it when the entry
+# expires, hence its much shorter timeout
+TOKEN_AUTH_CACHE_BACKEND = os.environ.get('FATMUG_TOKEN_CACHE', 'shared')
+TOKEN_AUTH_CACHE_SIZE = 10000
+TOKEN_AUTH_CACHE_TIMEOUT = 300 if TOKEN_AUTH_CACHE_BACKEND == 'shared' else 5
+
+# Cache backing the vendor performance endpoint, set FATMUG_CACHE_BACKEND to
+# 'locmem' (per process) or 'file' (shared by the processes of a host).
+# Invalidations only reach the other workers through a shared cache, so
+# locmem is the default with DEBUG only and refused without it
+CACHE_BACKENDS = {
+    'locmem': {
+        'BACKEND': 'django.core.cache.backends.locmem.LocMemCache',
+    },
+    'file': {
+        'BACKEND': 'django.core.cache.backends.filebased.FileBasedCache',
+        'LOCATION': os.environ.get(
+            'FATMUG_CACHE_DIR', os.path.join(BASE_DIR, 'cache')),
+    },
+}
+CACHE_BACKEND = os.environ.get(
+    'FATMUG_CACHE_BACKEND', 'locmem' if DEBUG else 'file')
+if CACHE_BACKEND == 'locmem' and not DEBUG:
+    raise ValueError(
+        "FATMUG_CACHE_BACKEND='locmem' leaves the other worker processes "
+        "serving stale vendor performance, use 'file' without DEBUG.")
+CACHES = {
+    'default': CACHE_BACKENDS[CACHE_BACKEND],
+}
+
+# Seconds a cached vendor performance response is kept. Entries are also
+# dropped whenever the vendor's metrics change
+VENDOR_PERFORMANCE_CACHE_TIMEOUT = 60 * 60
+
+# When enabled, saving a purchase order only queues its vendor and the
+# 'process_metrics_queue' command recalculates the metrics in the background
+METRICS_QUEUE_ENABLED = os.environ.get('FATMUG_METRICS_QUEUE', '') == '1'
+
+# Seconds the counter changes of busy vendors are collected before being
+# written together, one write per vendor. 0 writes every change right away
+VENDOR_METRICS_COALESCE_WINDOW = float(
+    os.environ.get('FATMUG_METRICS_COALESCE_WINDOW', '0'))
+
+# Query count, DB time and wall time of every request, signal receiver and
+# metrics calculation are collected per process and served at /metrics/
+INSTRUMENTATION_ENABLED = os.environ.get('FATMUG_INSTRUMENTATION', '1') == '1'
+
+# Requests slower than this are logged to the 'fatmug_main.slow_requests' logger
+SLOW_REQUEST_THRESHOLD_MS = int(os.environ.get('FATMUG_SLOW_REQUEST_MS', '500'))
+
 SWAGGER_SETTINGS = {
     'USE_SESSION_AUTH': False,
     'api_version': '1.0',
@@ -147,6 +215,9 @@ SWAGGER_SETTINGS = {
 
 DEFAULT_AUTO_FIELD = "django.db.models.BigAutoField"
 
+# Serves the reads of the GET views from the 'replica' database, if defined
+DATABASE_ROUTERS = ['fatmug_main.routers.ReadReplicaRouter']
+
 try:
     from fatmug_main.local_setting import *
 except ImportError:
@@ -1,42 +1,102 @@
-import logging
-
-from django.db import transaction
-from django.db.models.signals import post_save, pre_save
+from django.conf import settings
+from django.db.models.signals import post_delete, post_save, pre_save
 from django.dispatch import receiver
+from rest_framework.authtoken.models import Token
+
+from .authentication import get_token_cache
+from .models import PurchaseOrder, Vendor
+from .utils.instrumentation import instrumented
+from .utils.line_items import write_line_items
+from .utils.metrics_calculator import purchase_order_counter_deltas
+from .utils.metrics_queue import (record_counter_deltas,
+                                  schedule_vendor_metrics)
+from .utils.performance_cache import invalidate_vendor_performance
 
-from .models import PurchaseOrder
+# update_fields of a purchase order save that can change its line items
+LINE_ITEM_UPDATE_FIELDS = frozenset(
+    {'items', 'vendor', 'vendor_id', 'issue_date', 'quantity'})
+
+
+@receiver(pre_save, sender=PurchaseOrder)
+@instrumented('receiver')
+def stamp_completion_date(sender, instance, **kwargs):
+    instance.update_completion_date()
 
 
 @receiver(post_save, sender=PurchaseOrder)
-def update_vendor_quality_rating_avg(sender, instance, **kwargs):
-    if instance.status == 'completed' and instance.quality_rating is not None:
-        with transaction.atomic():
-            instance.vendor.update_quality_rating_avg(instance.quality_rating)
+@instrumented('receiver')
+def update_vendor_performance_metrics(sender, instance, created, **kwargs):
+    current_state = instance.get_metric_state()
+    loaded_state = instance.get_loaded_metric_state()
+
+    if created or loaded_state is not None:
+        record_counter_deltas(
+            purchase_order_counter_deltas(loaded_state, current_state))
+    else:
+        # The stored state is unknown, so recount the vendor(s) from scratch
+        vendor_ids = {instance.vendor_id}
+        loaded_vendor_id = getattr(instance, '_loaded_values', {}).get('vendor_id')
+        if loaded_vendor_id is not None:
+            vendor_ids.add(loaded_vendor_id)
+        schedule_vendor_metrics(vendor_ids)
+
+
+@receiver(post_delete, sender=PurchaseOrder)
+@instrumented('receiver')
+def remove_from_vendor_performance_metrics(sender, instance, origin=None,
+                                           **kwargs):
+    # Sent for every order deleted, also by queryset and cascading deletes.
+    # The counters of a vendor being deleted are deleted along with it
+    if isinstance(origin, Vendor) or getattr(origin, 'model', None) is Vendor:
+        return
+    loaded_state = (instance.get_loaded_metric_state()
+                    or instance.get_metric_state())
+    record_counter_deltas(purchase_order_counter_deltas(loaded_state, None))
 
 
 @receiver(post_save, sender=PurchaseOrder)
-def update_average_response_time(sender, instance, **kwargs):
-    if instance.acknowledgment_date is not None:
-        with transaction.atomic():
-            instance.vendor.update_average_response_time(instance)
+@instrumented('receiver')
+def sync_purchase_order_items(sender, instance, created, update_fields=None,
+                              **kwargs):
+    if update_fields is not None and not (
+            update_fields & LINE_ITEM_UPDATE_FIELDS):
+        return
+    current_state = instance.get_line_item_state()
+    if created:
+        write_line_items([instance])
+    elif current_state != instance.get_loaded_line_item_state():
+        write_line_items([instance], replaced_order_ids=[instance.pk])
 
 
 @receiver(post_save, sender=PurchaseOrder)
-def update_vendor_fulfillment_rate(sender, instance, **kwargs):
-    if instance.status in ('completed', 'pending', 'cancelled'):
-        with transaction.atomic():
-            instance.vendor.update_fulfillment_rate()
+@instrumented('receiver')
+def remember_saved_state(sender, instance, update_fields=None, **kwargs):
+    # Registered last: the receivers above compare the saved order with the
+    # state loaded before this save, and overlap on vendor_id and issue_date
+    state = instance.get_metric_state()
+    if update_fields is None or update_fields & LINE_ITEM_UPDATE_FIELDS:
+        state.update(instance.get_line_item_state())
+    instance._loaded_values = {
+        **getattr(instance, '_loaded_values', {}), **state}
 
 
-@receiver(pre_save, sender=PurchaseOrder)
-def update_on_time_delivery_rate(sender, instance, **kwargs):
-    if instance.status == 'completed' and instance.acknowledgment_date is not None:
-        try:
-            # Get the old instance from the database
-            original_instance = PurchaseOrder.objects.get(pk=instance.pk)
-        except Exception as e:
-            logging.info(
-                "Exception when fetching original instance to update delivery rate")
-
-        if original_instance.status in ('cancelled', 'pending'):
-            instance.vendor.update_on_time_delivery_rate(instance)
+@receiver(post_save, sender=Vendor)
+@receiver(post_delete, sender=Vendor)
+@instrumented('receiver')
+def invalidate_vendor_performance_cache(sender, instance, **kwargs):
+    invalidate_vendor_performance([instance.pk])
+
+
+@receiver(post_delete, sender=Token)
+def forget_deleted_token(sender, instance, **kwargs):
+    get_token_cache().delete_many([instance.key])
+
+
+@receiver(post_save, sender=settings.AUTH_USER_MODEL)
+def forget_user_tokens(sender, instance, created, update_fields=None, **kwargs):
+    # The cached user would be stale, e.g. still active after a deactivation.
+    # Logins only stamp last_login, which does not matter to the API
+    if created or update_fields == frozenset(['last_login']):
+        return
+    get_token_cache().delete_many(
+        Token.objects.filter(user=instance).values_list('key', flat=True))
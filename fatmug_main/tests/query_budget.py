@@ -0,0 +1,88 @@
+from contextlib import contextmanager
+from datetime import timedelta
+
+from django.core.cache import cache
+from django.db import connections, transaction
+from django.test.utils import CaptureQueriesContext
+from django.utils import timezone
+
+from ..models import HistoricalPerformance, PurchaseOrder, Vendor
+from ..utils.metrics_calculator import recalculate_vendor_metrics
+
+# Numbers of vendors, and of purchase orders per vendor, the budgets are
+# checked at. A budget holding at every size rules out per-row queries
+DATASET_SIZES = (1, 5, 20)
+
+
+class QueryBudgetMixin:
+    """
+    Test case mixin pinning the maximum number of queries of a block of
+    code. Unlike assertNumQueries, using fewer queries than the budget
+    passes, and a failure lists every query that ran.
+    """
+
+    @contextmanager
+    def assertQueryBudget(self, budget, using='default'):
+        with CaptureQueriesContext(connections[using]) as queries:
+            yield queries
+        if len(queries) > budget:
+            executed = '\n'.join(
+                f"{number}. {query['sql']}"
+                for number, query in enumerate(queries.captured_queries, 1))
+            self.fail(
+                f"{len(queries)} queries executed, the budget is {budget}:\n"
+                f"{executed}")
+
+    def check_at_each_size(self, check):
+        """
+        Call `check(size)` on a fresh dataset of each of the DATASET_SIZES,
+        every dataset is rolled back before the next one is created.
+        """
+        for size in DATASET_SIZES:
+            with self.subTest(size=size), transaction.atomic():
+                cache.clear()
+                check(size)
+                transaction.set_rollback(True)
+
+
+def create_dataset(size) -> list:
+    """
+    Create `size` vendors with `size` purchase orders and daily performance
+    snapshots each, returns the vendors.
+    """
+    vendors = Vendor.objects.bulk_create(
+        Vendor(
+            name=f'Vendor {number}',
+            contact_details=f'vendor{number}@example.com',
+            address=f'Address {number}',
+            vendor_code=f'V{number}',
+        )
+        for number in range(size))
+    issue_date = timezone.now() - timedelta(days=size + 1)
+    PurchaseOrder.objects.bulk_create(
+        PurchaseOrder(
+            po_number=f'PO-{vendor.pk}-{number}',
+            vendor=vendor,
+            order_date=issue_date,
+            issue_date=issue_date + timedelta(hours=number),
+            delivery_date=issue_date + timedelta(days=7),
+            items={'item1': 'Test Item'},
+            quantity=number + 1,
+            status='completed' if number % 2 else 'pending',
+            completion_date=issue_date + timedelta(days=1) if number % 2 else None,
+            quality_rating=4.0 if number % 2 else None,
+            acknowledgment_date=issue_date + timedelta(hours=number + 1),
+        )
+        for vendor in vendors for number in range(size))
+    HistoricalPerformance.objects.bulk_create(
+        HistoricalPerformance(
+            vendor=vendor,
+            date=issue_date + timedelta(days=number),
+            on_time_delivery_rate=90.0,
+            quality_rating_avg=4.0,
+            average_response_time=60.0,
+            fulfillment_rate=50.0,
+        )
+        for vendor in vendors for number in range(size))
+    recalculate_vendor_metrics([vendor.pk for vendor in vendors])
+    return vendors
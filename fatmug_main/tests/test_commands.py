@@ -0,0 +1,151 @@
+from datetime import date, timedelta
+from io import StringIO
+
+from django.core.management import call_command
+from django.test import TestCase, override_settings
+from django.utils import timezone
+
+from ..models import (HistoricalPerformance, MetricsQueueEntry, PurchaseOrder,
+                      Vendor)
+from ..utils.performance_history import snapshot_datetime
+
+
+class SnapshotVendorPerformanceCommandTest(TestCase):
+    def setUp(self):
+        self.vendor = Vendor.objects.create(
+            name='Test Vendor',
+            contact_details='testvendor@example.com',
+            address='Test Address',
+            vendor_code='123'
+        )
+        self.issue_date = snapshot_datetime(date(2023, 1, 1))
+        self.purchase_order = PurchaseOrder.objects.create(
+            po_number='PO123',
+            vendor=self.vendor,
+            order_date=self.issue_date,
+            delivery_date=self.issue_date + timedelta(days=5),
+            items={'item1': 'Test Item'},
+            quantity=10,
+            status='completed',
+            quality_rating=4.0,
+            issue_date=self.issue_date,
+            acknowledgment_date=self.issue_date + timedelta(hours=1),
+            completion_date=self.issue_date + timedelta(days=2),
+        )
+        PurchaseOrder.objects.create(
+            po_number='PO124',
+            vendor=self.vendor,
+            order_date=self.issue_date,
+            delivery_date=self.issue_date + timedelta(days=5),
+            items={'item1': 'Test Item'},
+            quantity=10,
+            issue_date=self.issue_date + timedelta(days=1),
+        )
+
+    def test_snapshot_today_is_idempotent(self):
+        call_command('snapshot_vendor_performance', stdout=StringIO())
+        call_command('snapshot_vendor_performance', stdout=StringIO())
+
+        snapshot = HistoricalPerformance.objects.get()
+        self.assertEqual(snapshot.date, snapshot_datetime(timezone.localdate()))
+        self.assertEqual(snapshot.fulfillment_rate, 50.0)
+        self.assertEqual(snapshot.quality_rating_avg, 4.0)
+
+    def test_backfill_from_purchase_order_history(self):
+        with self.assertNumQueries(3 * 2):
+            call_command(
+                'snapshot_vendor_performance', '--from', '2023-01-01',
+                '--to', '2023-01-03', stdout=StringIO())
+
+        snapshots = list(HistoricalPerformance.objects.order_by('date'))
+        self.assertEqual(len(snapshots), 3)
+        # Day one: one acknowledged order, not completed yet
+        self.assertEqual(snapshots[0].fulfillment_rate, 0.0)
+        self.assertEqual(snapshots[0].average_response_time, 60.0)
+        self.assertIsNone(snapshots[0].quality_rating_avg)
+        # Day two: a second order was issued
+        self.assertEqual(snapshots[1].fulfillment_rate, 0.0)
+        # Day three: the first order was completed on time
+        self.assertEqual(snapshots[2].fulfillment_rate, 50.0)
+        self.assertEqual(snapshots[2].on_time_delivery_rate, 100.0)
+        self.assertEqual(snapshots[2].quality_rating_avg, 4.0)
+
+        call_command(
+            'snapshot_vendor_performance', '--from', '2023-01-03',
+            '--to', '2023-01-03', stdout=StringIO())
+        self.assertEqual(HistoricalPerformance.objects.count(), 3)
+
+
+class ExportDataCommandTest(TestCase):
+    def test_export_purchase_orders_as_csv(self):
+        vendor = Vendor.objects.create(
+            name='Test Vendor',
+            contact_details='testvendor@example.com',
+            address='Test Address',
+            vendor_code='123'
+        )
+        PurchaseOrder.objects.create(
+            po_number='PO123',
+            vendor=vendor,
+            order_date='2023-01-01T12:00:00Z',
+            delivery_date='2023-01-10T12:00:00Z',
+            items={'item1': 'Test Item'},
+            quantity=10,
+            issue_date='2023-01-01T12:00:00Z',
+        )
+        stdout = StringIO()
+        call_command(
+            'export_data', 'purchase_orders', '--format', 'csv', stdout=stdout)
+
+        lines = stdout.getvalue().splitlines()
+        self.assertEqual(len(lines), 2)
+        self.assertTrue(lines[0].startswith('id,po_number,vendor,'))
+        self.assertIn('"{""item1"": ""Test Item""}"', lines[1])
+
+
+@override_settings(METRICS_QUEUE_ENABLED=True)
+class ProcessMetricsQueueCommandTest(TestCase):
+    def setUp(self):
+        self.vendor = Vendor.objects.create(
+            name='Test Vendor',
+            contact_details='testvendor@example.com',
+            address='Test Address',
+            vendor_code='123'
+        )
+
+    def test_saves_are_queued_and_merged_by_the_worker(self):
+        for number in range(3):
+            PurchaseOrder.objects.create(
+                po_number=f'PO{number}',
+                vendor=self.vendor,
+                order_date='2023-01-01T12:00:00Z',
+                delivery_date='2023-01-10T12:00:00Z',
+                items={'item1': 'Test Item'},
+                quantity=10,
+                status='completed' if number else 'pending',
+                issue_date='2023-01-01T12:00:00Z',
+            )
+        self.vendor.refresh_from_db()
+        self.assertEqual(self.vendor.total_po_count, 0)
+        self.assertEqual(MetricsQueueEntry.objects.count(), 3)
+
+        stdout = StringIO()
+        call_command('process_metrics_queue', '--stats', stdout=stdout)
+        self.assertIn('Queue depth: 3 entries for 1 vendors', stdout.getvalue())
+
+        stdout = StringIO()
+        call_command('process_metrics_queue', '--once', stdout=stdout)
+        self.assertIn(
+            'Recalculated 1 vendors from 3 queue entries', stdout.getvalue())
+        self.assertFalse(MetricsQueueEntry.objects.exists())
+        self.vendor.refresh_from_db()
+        self.assertEqual(self.vendor.total_po_count, 3)
+        self.assertEqual(self.vendor.fulfillment_rate, 66.67)
+
+        # Counters left short, e.g. by an edit outside the application
+        Vendor.objects.update(total_po_count=1)
+        stdout = StringIO()
+        call_command('process_metrics_queue', '--recount-all', stdout=stdout)
+        self.assertIn('Recounted 1 vendors.', stdout.getvalue())
+        self.vendor.refresh_from_db()
+        self.assertEqual(self.vendor.total_po_count, 3)
@@ -1,9 +1,30 @@
-from datetime import datetime
+import os
+import tempfile
+from datetime import datetime, timedelta
+from pathlib import Path
+from unittest import mock, skipUnless
 
-from django.test import TestCase
+from django.db import connection
+from django.db.models import DurationField, ExpressionWrapper, F, Sum
+from django.db.utils import ConnectionHandler, OperationalError
+from django.test import (SimpleTestCase, TestCase, override_settings,
+                         skipUnlessDBFeature)
+from django.test.utils import CaptureQueriesContext
 from django.utils import timezone
 
-from ..models import HistoricalPerformance, PurchaseOrder, Vendor
+from ..database import database_profile, sqlite_databases
+from ..filters import PrefixSearchFilter
+from ..models import (HistoricalPerformance, PurchaseOrder, PurchaseOrderItem,
+                      Vendor)
+from ..pagination import PurchaseOrderPagination
+from ..routers import ReadReplicaRouter, read_only
+from ..utils.bulk_ingest import ingest_purchase_orders
+from ..utils.line_items import extract_line_items
+from ..utils.metrics_calculator import (COUNTER_FIELDS, METRIC_FIELDS,
+                                       aggregate_vendor_counters,
+                                       recalculate_vendor_metrics)
+from ..utils.metrics_coalescer import (coalescer, flush_coalesced_deltas,
+                                      pending_counter_deltas)
 
 
 class VendorModelTest(TestCase):
@@ -20,6 +41,32 @@ class VendorModelTest(TestCase):
         self.assertEqual(vendor.address, 'Test Address')
         self.assertEqual(vendor.vendor_code, '123')
 
+    def test_prefix_search_with_non_ascii_last_character(self):
+        class View:
+            prefix_search_fields = ('name',)
+
+        names = ['Zoë', 'Zoë Ltd', 'Zoé', 'Zoe', 'A\U0010FFFF', 'A\U0010FFFFB',
+                 'B', 'X\ud7ff', 'X\ud7ffY', 'X\ue000', 'xé']
+        for i, name in enumerate(names):
+            Vendor.objects.create(
+                name=name, contact_details='', address='', vendor_code=i)
+
+        search = PrefixSearchFilter()
+        self.assertEqual(search.get_upper_bound('A\U0010FFFF'), 'B')
+        self.assertEqual(search.get_upper_bound('X\ud7ff'), 'X\ue000')
+        self.assertIsNone(search.get_upper_bound('\U0010FFFF'))
+        for prefix, expected in [
+                ('Zoë', ['Zoë', 'Zoë Ltd']),
+                ('A\U0010FFFF', ['A\U0010FFFF', 'A\U0010FFFFB']),
+                ('\U0010FFFF', []),
+                ('X\ud7ff', ['X\ud7ff', 'X\ud7ffY']),
+                ('X', ['X\ud7ff', 'X\ud7ffY', 'X\ue000'])]:
+            request = mock.Mock(query_params={'search': prefix})
+            queryset = search.filter_queryset(
+                request, Vendor.objects.order_by('id'), View)
+            self.assertEqual(
+                list(queryset.values_list('name', flat=True)), expected)
+
 
 class PurchaseOrderModelTest(TestCase):
 
@@ -59,6 +106,14 @@ class PurchaseOrderModelTest(TestCase):
         self.assertEqual(purchase_order.status, 'pending')
         self.assertEqual(purchase_order.issue_date, issue_date)
 
+        purchase_order = PurchaseOrder.objects.get(pk=purchase_order.pk)
+        # The vendor is not queried just to render the order
+        with self.assertNumQueries(0):
+            self.assertEqual(str(purchase_order), f'PO PO123 - Vendor {self.vendor.pk}')
+        purchase_order = PurchaseOrder.objects.select_related('vendor').get(
+            pk=purchase_order.pk)
+        self.assertEqual(str(purchase_order), f'PO PO123 - Vendor {self.vendor.pk}')
+
 
 class HistoricalPerformanceModelTest(TestCase):
     def setUp(self):
@@ -87,3 +142,505 @@ class HistoricalPerformanceModelTest(TestCase):
         self.assertEqual(saved_performance.quality_rating_avg, 4.2)
         self.assertEqual(saved_performance.average_response_time, 30.8)
         self.assertEqual(saved_performance.fulfillment_rate, 95.0)
+
+
+class VendorMetricsTest(TestCase):
+    def setUp(self):
+        self.vendor = Vendor.objects.create(
+            name='Test Vendor',
+            contact_details='testvendor@example.com',
+            address='Test Address',
+            vendor_code='123'
+        )
+        self.issue_date = timezone.now() - timedelta(days=2)
+
+    def create_purchase_order(self, po_number, **kwargs):
+        fields = {
+            'po_number': po_number,
+            'vendor': self.vendor,
+            'order_date': self.issue_date,
+            'delivery_date': timezone.now() + timedelta(days=5),
+            'items': {'item1': 'Test Item'},
+            'quantity': 10,
+            'issue_date': self.issue_date,
+        }
+        fields.update(kwargs)
+        return PurchaseOrder.objects.create(**fields)
+
+    def test_metrics_recalculated_on_save(self):
+        self.create_purchase_order('PO1')
+        self.create_purchase_order(
+            'PO2', status='completed', quality_rating=4.0,
+            acknowledgment_date=self.issue_date + timedelta(minutes=30))
+        self.create_purchase_order(
+            'PO3', status='completed', quality_rating=3.0,
+            delivery_date=self.issue_date,
+            acknowledgment_date=self.issue_date + timedelta(minutes=60))
+
+        self.vendor.refresh_from_db()
+        self.assertEqual(self.vendor.fulfillment_rate, 66.67)
+        self.assertEqual(self.vendor.on_time_delivery_rate, 50.0)
+        self.assertEqual(self.vendor.quality_rating_avg, 3.5)
+        self.assertEqual(self.vendor.average_response_time, 45.0)
+
+    def test_completion_date_stamped_and_cleared(self):
+        purchase_order = self.create_purchase_order('PO1')
+        self.assertIsNone(purchase_order.completion_date)
+
+        purchase_order.status = 'completed'
+        purchase_order.save()
+        self.assertIsNotNone(purchase_order.completion_date)
+
+        purchase_order.status = 'pending'
+        purchase_order.save()
+        self.assertIsNone(purchase_order.completion_date)
+
+    def test_save_updates_counters_without_recounting(self):
+        purchase_order = self.create_purchase_order('PO1')
+        purchase_order = PurchaseOrder.objects.get(pk=purchase_order.pk)
+        purchase_order.status = 'completed'
+        purchase_order.quality_rating = 4.5
+        # PO update and a single F() update of the vendor counters
+        with self.assertNumQueries(2):
+            purchase_order.save()
+
+        self.vendor.refresh_from_db()
+        self.assertEqual(self.vendor.total_po_count, 1)
+        self.assertEqual(self.vendor.completed_po_count, 1)
+        self.assertEqual(self.vendor.on_time_po_count, 1)
+        self.assertEqual(self.vendor.quality_rating_sum, 4.5)
+        self.assertEqual(self.vendor.quality_rating_count, 1)
+        self.assertEqual(self.vendor.fulfillment_rate, 100.0)
+
+    def test_counters_match_recount_after_updates_and_delete(self):
+        orders = [self.create_purchase_order(f'PO{i}') for i in range(5)]
+        for i, order in enumerate(orders[:4]):
+            order.acknowledgment_date = self.issue_date + timedelta(minutes=i)
+            order.save()
+        for order in orders[:3]:
+            order.status = 'completed'
+            order.quality_rating = 3.0
+            order.save()
+        orders[0].quality_rating = 5.0
+        orders[0].save()
+        orders[1].status = 'canceled'
+        orders[1].save()
+        orders[2].delete()
+
+        self.vendor.refresh_from_db()
+        incremental = {
+            field: getattr(self.vendor, field)
+            for field in COUNTER_FIELDS + METRIC_FIELDS}
+        recalculate_vendor_metrics([self.vendor.pk])
+        self.vendor.refresh_from_db()
+        recounted = {
+            field: getattr(self.vendor, field)
+            for field in COUNTER_FIELDS + METRIC_FIELDS}
+
+        self.assertEqual(incremental, recounted)
+        self.assertEqual(self.vendor.total_po_count, 4)
+        self.assertEqual(self.vendor.fulfillment_rate, 25.0)
+        self.assertEqual(self.vendor.quality_rating_avg, 5.0)
+        self.assertEqual(self.vendor.average_response_time, 1.33)
+
+    @override_settings(VENDOR_METRICS_COALESCE_WINDOW=60)
+    def test_coalesced_writes_match_serial_run(self):
+        self.addCleanup(coalescer.flush)
+        with self.captureOnCommitCallbacks(execute=True):
+            orders = [self.create_purchase_order(f'PO{i}') for i in range(4)]
+            for i, order in enumerate(orders):
+                order.status = 'completed'
+                order.quality_rating = 2.0 + i
+                order.acknowledgment_date = self.issue_date + timedelta(minutes=i)
+                order.save()
+            orders[3].delete()
+
+        self.vendor.refresh_from_db()
+        self.assertEqual(self.vendor.total_po_count, 0)
+        self.assertEqual(pending_counter_deltas()[self.vendor.pk]['total_po_count'], 3)
+
+        with CaptureQueriesContext(connection) as queries:
+            self.assertEqual(flush_coalesced_deltas(), 1)
+        updates = [
+            query for query in queries.captured_queries
+            if query['sql'].startswith('UPDATE')]
+        self.assertEqual(len(updates), 1)
+
+        self.vendor.refresh_from_db()
+        coalesced = {
+            field: getattr(self.vendor, field)
+            for field in COUNTER_FIELDS + METRIC_FIELDS}
+        recalculate_vendor_metrics([self.vendor.pk])
+        self.vendor.refresh_from_db()
+        serial = {
+            field: getattr(self.vendor, field)
+            for field in COUNTER_FIELDS + METRIC_FIELDS}
+        self.assertEqual(coalesced, serial)
+        self.assertEqual(self.vendor.quality_rating_avg, 3.0)
+
+    @override_settings(VENDOR_METRICS_COALESCE_WINDOW=60)
+    def test_recount_during_coalescing_window_is_not_double_counted(self):
+        self.addCleanup(coalescer.flush)
+        with self.captureOnCommitCallbacks(execute=True):
+            self.create_purchase_order('PO1')
+            self.create_purchase_order('PO2')
+        self.assertEqual(pending_counter_deltas()[self.vendor.pk]['total_po_count'], 2)
+
+        # A recount, e.g. from a bulk ingest, lands inside the window
+        recalculate_vendor_metrics([self.vendor.pk])
+        self.assertNotIn(self.vendor.pk, pending_counter_deltas())
+        with self.captureOnCommitCallbacks(execute=True):
+            self.create_purchase_order('PO3')
+        flush_coalesced_deltas()
+
+        self.vendor.refresh_from_db()
+        self.assertEqual(self.vendor.total_po_count, 3)
+
+    @override_settings(VENDOR_METRICS_COALESCE_WINDOW=60)
+    def test_delta_committed_during_recount_is_not_double_counted(self):
+        self.addCleanup(coalescer.flush)
+        with self.captureOnCommitCallbacks() as callbacks:
+            self.create_purchase_order('PO1')
+            self.create_purchase_order('PO2')
+
+        def commit_then_aggregate(vendor_ids):
+            # The orders' transaction commits while the recount is running
+            for callback in callbacks:
+                callback()
+            return aggregate_vendor_counters(vendor_ids)
+
+        with mock.patch(
+                'fatmug_main.utils.metrics_calculator.aggregate_vendor_counters',
+                commit_then_aggregate):
+            recalculate_vendor_metrics([self.vendor.pk])
+        flush_coalesced_deltas()
+
+        self.vendor.refresh_from_db()
+        self.assertEqual(self.vendor.total_po_count, 2)
+
+    def test_queryset_delete_updates_counters(self):
+        for i in range(4):
+            self.create_purchase_order(
+                f'PO{i}', status='completed', quality_rating=2.0 + i)
+        PurchaseOrder.objects.filter(quality_rating__gte=4.0).delete()
+
+        self.vendor.refresh_from_db()
+        self.assertEqual(self.vendor.total_po_count, 2)
+        self.assertEqual(self.vendor.quality_rating_sum, 5.0)
+        self.assertEqual(self.vendor.quality_rating_avg, 2.5)
+
+    def test_vendor_save_keeps_concurrent_counter_updates(self):
+        vendor = Vendor.objects.get(pk=self.vendor.pk)
+        # An order saved by another request after the vendor was loaded
+        self.create_purchase_order('PO1', status='completed')
+        vendor.name = 'Renamed Vendor'
+        vendor.save()
+
+        vendor.refresh_from_db()
+        self.assertEqual(vendor.name, 'Renamed Vendor')
+        self.assertEqual(vendor.total_po_count, 1)
+        self.assertEqual(vendor.fulfillment_rate, 100.0)
+
+    def test_recalculate_many_vendors(self):
+        other_vendor = Vendor.objects.create(
+            name='Other Vendor',
+            contact_details='other@example.com',
+            address='Other Address',
+            vendor_code='456'
+        )
+        self.create_purchase_order('PO1', status='completed')
+        Vendor.objects.update(fulfillment_rate=None)
+
+        # The pending deltas DELETE, the aggregate and one UPDATE per vendor
+        with self.assertNumQueries(4):
+            counters = recalculate_vendor_metrics(
+                [self.vendor.pk, other_vendor.pk])
+
+        self.assertEqual(counters[self.vendor.pk]['completed_po_count'], 1)
+        self.assertEqual(counters[other_vendor.pk]['total_po_count'], 0)
+        self.vendor.refresh_from_db()
+        other_vendor.refresh_from_db()
+        self.assertEqual(self.vendor.fulfillment_rate, 100.0)
+        self.assertIsNone(other_vendor.fulfillment_rate)
+
+
+class PurchaseOrderItemTest(TestCase):
+    def setUp(self):
+        self.vendor = Vendor.objects.create(
+            name='Test Vendor',
+            contact_details='testvendor@example.com',
+            address='Test Address',
+            vendor_code='123'
+        )
+        self.order = PurchaseOrder.objects.create(
+            po_number='PO1',
+            vendor=self.vendor,
+            order_date='2023-01-01T12:00:00Z',
+            delivery_date='2023-01-10T12:00:00Z',
+            items={'item1': 'Test Item'},
+            quantity=10,
+            issue_date='2023-01-01T12:00:00Z',
+        )
+
+    def get_lines(self, order):
+        return list(PurchaseOrderItem.objects.filter(
+            purchase_order=order,
+        ).order_by('sku').values_list('sku', 'name', 'quantity', 'vendor_id'))
+
+    def test_extract_line_items(self):
+        self.assertEqual(extract_line_items({'item1': 'Test Item'}, 10), [
+            {'sku': 'item1', 'name': 'Test Item', 'quantity': 10}])
+        self.assertEqual(extract_line_items({'sku': 'A', 'name': 'Bolt'}, 3), [
+            {'sku': 'A', 'name': 'Bolt', 'quantity': 3}])
+        self.assertEqual(extract_line_items(
+            [{'sku': 'A', 'quantity': 2}, {'name': 'no sku'}, 'B'], 3), [
+            {'sku': 'A', 'name': '', 'quantity': 2},
+            {'sku': 'B', 'name': '', 'quantity': None}])
+        self.assertEqual(extract_line_items({'A': 4, 'B': {'name': 'Nut'}}), [
+            {'sku': 'A', 'name': '', 'quantity': 4},
+            {'sku': 'B', 'name': 'Nut', 'quantity': None}])
+        self.assertEqual(extract_line_items(None, 3), [])
+
+    def test_line_items_follow_saves(self):
+        self.assertEqual(self.get_lines(self.order), [
+            ('item1', 'Test Item', 10, self.vendor.pk)])
+
+        order = PurchaseOrder.objects.get(pk=self.order.pk)
+        order.status = 'completed'
+        # No line item queries when the items are unchanged
+        with self.assertNumQueries(2):
+            order.save()
+
+        order.items = [{'sku': 'A', 'quantity': 2}, {'sku': 'B', 'quantity': 3}]
+        order.save()
+        self.assertEqual(self.get_lines(order), [
+            ('A', '', 2, self.vendor.pk), ('B', '', 3, self.vendor.pk)])
+
+        order.delete()
+        self.assertFalse(PurchaseOrderItem.objects.exists())
+
+    def test_line_items_follow_vendor_and_issue_date_changes(self):
+        other_vendor = Vendor.objects.create(
+            name='Other Vendor',
+            contact_details='other@example.com',
+            address='Other Address',
+            vendor_code='456'
+        )
+        order = PurchaseOrder.objects.get(pk=self.order.pk)
+        order.vendor = other_vendor
+        order.save()
+        self.assertEqual(self.get_lines(order), [
+            ('item1', 'Test Item', 10, other_vendor.pk)])
+
+        issue_date = timezone.now().replace(microsecond=0)
+        order.issue_date = issue_date
+        order.save()
+        self.assertEqual(list(PurchaseOrderItem.objects.filter(
+            purchase_order=order).values_list('issue_date', flat=True)),
+            [issue_date])
+
+        # Both changed by a save that only names them
+        order.vendor = self.vendor
+        order.issue_date = issue_date - timedelta(days=1)
+        order.save(update_fields=['vendor', 'issue_date'])
+        self.assertEqual(list(PurchaseOrderItem.objects.filter(
+            purchase_order=order).values_list('vendor_id', 'issue_date')),
+            [(self.vendor.pk, issue_date - timedelta(days=1))])
+
+    def test_line_items_written_on_ingest(self):
+        result = ingest_purchase_orders([
+            {'po_number': 'PO1', 'items': {'sku': 'C', 'quantity': 7}},
+            {'po_number': 'PO2', 'vendor': self.vendor.pk,
+             'order_date': '2023-01-02T12:00:00Z',
+             'delivery_date': '2023-01-12T12:00:00Z',
+             'items': {'item2': 'Other Item'}, 'quantity': 5,
+             'issue_date': '2023-01-02T12:00:00Z'},
+        ])
+        self.assertEqual((result['created'], result['updated']), (1, 1))
+        self.assertEqual(self.get_lines(self.order), [
+            ('C', '', 7, self.vendor.pk)])
+        self.assertEqual(
+            self.get_lines(PurchaseOrder.objects.get(po_number='PO2')),
+            [('item2', 'Other Item', 5, self.vendor.pk)])
+
+
+class PurchaseOrderQueryPlanTest(TestCase):
+    """
+    The vendor metric and list queries must be served by an index, so that
+    they stay fast as a vendor's order count grows.
+    """
+
+    def setUp(self):
+        if connection.vendor == 'postgresql':
+            # The tables are tiny here, make the planner pick the indexes
+            with connection.cursor() as cursor:
+                cursor.execute('SET LOCAL enable_seqscan = off')
+
+    def get_query_plan(self, sql, params=()):
+        explain = {
+            'sqlite': 'EXPLAIN QUERY PLAN ',
+            'postgresql': 'EXPLAIN ',
+        }.get(connection.vendor)
+        if explain is None:
+            self.skipTest(f"No query plan check for {connection.vendor}.")
+        with connection.cursor() as cursor:
+            cursor.execute(explain + sql, params)
+            return '\n'.join(str(row) for row in cursor.fetchall())
+
+    def assertIndexOnly(self, plan, index_name):
+        self.assertIn(index_name, plan)
+        if connection.vendor == 'sqlite':
+            self.assertIn(f'COVERING INDEX {index_name}', plan)
+        else:
+            self.assertIn(f'Index Only Scan using {index_name}', plan)
+
+    def test_vendor_counter_aggregate_searches_by_vendor(self):
+        with CaptureQueriesContext(connection) as queries:
+            aggregate_vendor_counters([1, 2])
+        plan = self.get_query_plan(queries[0]['sql'])
+        self.assertIn('vendor_id', plan)
+        self.assertIn('SEARCH' if connection.vendor == 'sqlite' else 'Index', plan)
+
+    @skipUnlessDBFeature('supports_partial_indexes')
+    def test_response_time_aggregate_uses_partial_index(self):
+        queryset = PurchaseOrder.objects.filter(
+            vendor_id=1, acknowledgment_date__isnull=False,
+        ).values('vendor_id').annotate(response_time_sum=Sum(ExpressionWrapper(
+            F('acknowledgment_date') - F('issue_date'),
+            output_field=DurationField(),
+        ))).order_by()
+        plan = self.get_query_plan(*queryset.query.sql_with_params())
+        self.assertIndexOnly(plan, 'po_vendor_acknowledged_idx')
+
+    def test_purchase_order_page_searches_from_its_position(self):
+        pagination = PurchaseOrderPagination()
+        pagination.ordering = ('issue_date', 'id')
+        queryset = pagination.filter_position(
+            PurchaseOrder.objects.order_by('issue_date', 'id'),
+            '["2023-01-01 12:00:00+00:00",5]', reverse=False)[:101]
+        plan = self.get_query_plan(*queryset.query.sql_with_params())
+        self.assertIn('po_issue_date_idx', plan)
+        if connection.vendor == 'sqlite':
+            self.assertIn('SEARCH', plan)
+
+    def test_vendor_prefix_search_uses_indexes(self):
+        class View:
+            prefix_search_fields = ('name', 'vendor_code')
+
+        request = mock.Mock(query_params={'search': 'Acme'})
+        queryset = PrefixSearchFilter().filter_queryset(
+            request, Vendor.objects.all(), View)
+        plan = self.get_query_plan(*queryset.query.sql_with_params())
+        self.assertIn('vendor_name_idx', plan)
+        self.assertIn('vendor_code', plan)
+
+    def test_item_aggregates_use_covering_indexes(self):
+        queryset = PurchaseOrderItem.objects.filter(
+            sku='SKU1', issue_date__gte=timezone.now() - timedelta(days=90),
+        ).values('vendor_id').annotate(
+            total_quantity=Sum('quantity')).order_by()
+        plan = self.get_query_plan(*queryset.query.sql_with_params())
+        self.assertIndexOnly(plan, 'po_item_sku_idx')
+
+        queryset = PurchaseOrderItem.objects.filter(
+            vendor_id=1).values('sku').annotate(
+            total_quantity=Sum('quantity')).order_by()
+        plan = self.get_query_plan(*queryset.query.sql_with_params())
+        self.assertIndexOnly(plan, 'po_item_vendor_sku_idx')
+
+
+class DatabaseProfileTest(SimpleTestCase):
+
+    def test_sqlite_production_connections(self):
+        with tempfile.TemporaryDirectory() as directory:
+            path = Path(directory) / 'db.sqlite3'
+            handler = ConnectionHandler(sqlite_databases(
+                path, production=True, replica_path=path))
+            try:
+                default = handler['default']
+                with default.cursor() as cursor:
+                    pragmas = {}
+                    for pragma in ('journal_mode', 'synchronous',
+                                   'busy_timeout', 'temp_store'):
+                        cursor.execute(f'PRAGMA {pragma}')
+                        pragmas[pragma] = cursor.fetchone()[0]
+                    cursor.execute('CREATE TABLE counter (value integer)')
+                self.assertEqual(pragmas, {
+                    'journal_mode': 'wal', 'synchronous': 1,
+                    'busy_timeout': 5000, 'temp_store': 2})
+
+                # What atomic() runs to open a transaction
+                with CaptureQueriesContext(default) as queries:
+                    default._start_transaction_under_autocommit()
+                    default.cursor().execute('ROLLBACK')
+                self.assertEqual(queries[0]['sql'], 'BEGIN IMMEDIATE')
+
+                with handler['replica'].cursor() as cursor:
+                    cursor.execute('SELECT count(*) FROM counter')
+                    with self.assertRaises(OperationalError):
+                        cursor.execute('INSERT INTO counter VALUES (1)')
+            finally:
+                handler.close_all()
+
+    def test_postgres_profile(self):
+        databases = database_profile('postgres', {
+            'FATMUG_PG_HOST': 'db', 'FATMUG_PG_REPLICA_HOST': 'db-replica',
+            'FATMUG_PG_STATEMENT_TIMEOUT': '5000',
+            'FATMUG_PG_SERVER_SIDE_CURSORS': '0',
+        }, 'db.sqlite3')
+        default, replica = databases['default'], databases['replica']
+        self.assertEqual(default['ENGINE'], 'django.db.backends.postgresql')
+        self.assertEqual(default['CONN_MAX_AGE'], 60)
+        self.assertTrue(default['CONN_HEALTH_CHECKS'])
+        self.assertTrue(default['DISABLE_SERVER_SIDE_CURSORS'])
+        self.assertEqual(
+            default['OPTIONS']['options'], '-c statement_timeout=5000')
+        self.assertEqual((replica['HOST'], replica['NAME']), ('db-replica', 'fatmug'))
+        self.assertEqual(replica['TEST'], {'MIRROR': 'default'})
+
+    def test_read_only_routes_reads_to_a_configured_replica(self):
+        router = ReadReplicaRouter()
+        with tempfile.TemporaryDirectory() as directory:
+            for replica_name, expected in [('replica.sqlite3', 'replica'),
+                                           # A mirror of the default database
+                                           ('db.sqlite3', None)]:
+                databases = sqlite_databases(
+                    Path(directory) / 'db.sqlite3',
+                    replica_path=Path(directory) / replica_name)
+                handler = ConnectionHandler(databases)
+                with mock.patch('fatmug_main.routers.connections', handler), \
+                        mock.patch('fatmug_main.routers.settings',
+                                   mock.Mock(DATABASES=databases)):
+                    self.assertIsNone(router.db_for_read(Vendor))
+                    with read_only():
+                        self.assertEqual(router.db_for_read(Vendor), expected)
+                        self.assertIsNone(router.db_for_write(Vendor))
+                    self.assertIsNone(router.db_for_read(Vendor))
+                handler.close_all()
+        self.assertIs(router.allow_migrate('replica', 'fatmug_main'), False)
+        self.assertIsNone(router.allow_migrate('default', 'fatmug_main'))
+
+
+@skipUnless(os.environ.get('FATMUG_DB_PROFILE') == 'postgres',
+            'FATMUG_DB_PROFILE=postgres runs the suite against PostgreSQL')
+class PostgresProfileTest(TestCase):
+
+    def test_connection_settings_applied(self):
+        self.assertEqual(connection.vendor, 'postgresql')
+        with connection.cursor() as cursor:
+            cursor.execute(
+                "SELECT setting FROM pg_settings WHERE name = 'statement_timeout'")
+            timeout = cursor.fetchone()[0]
+        self.assertEqual(
+            timeout, os.environ.get('FATMUG_PG_STATEMENT_TIMEOUT', '30000'))
+        self.assertTrue(connection.settings_dict['CONN_HEALTH_CHECKS'])
+
+    def test_replica_mirrors_default_in_tests(self):
+        # The replica alias, if any, reads the test database itself and is
+        # not routed to, so a test never reads outside of its transaction
+        with read_only():
+            self.assertIsNone(ReadReplicaRouter().db_for_read(Vendor))
+        vendor = Vendor.objects.create(
+            name='Vendor', contact_details='', address='', vendor_code='1')
+        with read_only():
+            self.assertTrue(Vendor.objects.filter(pk=vendor.pk).exists())
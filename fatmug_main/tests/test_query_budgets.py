@@ -0,0 +1,176 @@
+from asgiref.sync import async_to_sync
+from django.contrib.auth.models import User
+from django.test import TestCase
+from django.urls import reverse
+from rest_framework import status
+from rest_framework.authtoken.models import Token
+from rest_framework.test import APIClient
+
+from ..models import PurchaseOrder
+from .query_budget import QueryBudgetMixin, create_dataset
+
+ORDER = {
+    'po_number': 'PO-NEW',
+    'order_date': '2023-01-01T12:00:00Z',
+    'delivery_date': '2023-01-10T12:00:00Z',
+    'items': {'item1': 'Test Item'},
+    'quantity': 10,
+    'issue_date': '2023-01-01T12:00:00Z',
+}
+
+
+class EndpointQueryBudgetTest(QueryBudgetMixin, TestCase):
+    """
+    Maximum number of queries of every endpoint in fatmug_main/urls.py,
+    token authentication included, at each of the DATASET_SIZES.
+    """
+
+    def setUp(self):
+        self.user = User.objects.create_user(
+            username='testuser', password='testpassword')
+        self.token = Token.objects.create(user=self.user)
+        self.client = APIClient()
+        self.client.credentials(HTTP_AUTHORIZATION=f'Token {self.token.key}')
+
+    def request(self, budget, method, url, data=None, expected=status.HTTP_200_OK):
+        with self.assertQueryBudget(budget):
+            response = getattr(self.client, method)(url, data, format='json')
+            if response.streaming:
+                b''.join(response.streaming_content)
+        self.assertEqual(
+            response.status_code, expected, getattr(response, 'data', None))
+        return response
+
+    def async_request(self, budget, url):
+        headers = {'Authorization': f'Token {self.token.key}'}
+
+        async def get():
+            return await self.async_client.get(url, headers=headers)
+
+        with self.assertQueryBudget(budget):
+            response = async_to_sync(get)()
+        self.assertEqual(response.status_code, status.HTTP_200_OK, response.content)
+
+    def check_budgets(self, size):
+        vendors = create_dataset(size)
+        vendor = vendors[0]
+        order = PurchaseOrder.objects.filter(vendor=vendor).first()
+
+        # Token lookup, until it is cached, plus the query of the endpoint
+        self.request(2, 'get', reverse('vendor-list-create'))
+        self.request(2, 'get', reverse('vendor-list-create'), {
+            'search': 'Vendor', 'on_time_delivery_rate__gte': 0,
+            'fields': 'id,name'})
+        self.request(2, 'get', reverse('vendor-leaderboard'))
+        self.request(2, 'get', reverse(
+            'vendor-retrieve-update-delete', args=[vendor.pk]))
+        self.request(2, 'get', reverse(
+            'vendor_performance', args=[vendor.pk]))
+        # Token lookup, vendor check and the buckets
+        self.request(3, 'get', reverse(
+            'vendor-performance-history', args=[vendor.pk]))
+        self.request(2, 'get', reverse('purchase-order-list-create'))
+        self.request(2, 'get', reverse('purchase-order-list-create'), {
+            'vendor_id': vendor.pk, 'fields': 'id,po_number,status'})
+        self.request(2, 'get', reverse(
+            'purchase-order-retrieve-update-delete', args=[order.pk]))
+        self.request(2, 'get', reverse('item-summary'))
+        self.request(2, 'get', reverse('item-summary'), {'vendor_id': vendor.pk})
+        self.request(2, 'get', reverse('item-vendors', args=['item1']))
+        self.request(2, 'get', reverse('export', args=['purchase_orders']))
+        self.request(2, 'get', reverse('export', args=['vendors']))
+        self.request(1, 'get', reverse('metrics'))
+
+        # Served from the cache filled through the sync endpoint
+        self.async_request(1, reverse('async-vendor-performance', args=[vendor.pk]))
+        self.async_request(2, reverse('async-vendor-retrieve', args=[vendor.pk]))
+        self.async_request(2, reverse('async-purchase-order-list'))
+        self.async_request(2, reverse(
+            'async-purchase-order-retrieve', args=[order.pk]))
+
+        self.request(3, 'post', reverse('vendor-list-create'), {
+            'name': 'New Vendor', 'contact_details': 'new@example.com',
+            'address': 'New Address', 'vendor_code': 'NEW'},
+            expected=status.HTTP_201_CREATED)
+        self.request(3, 'patch', reverse(
+            'vendor-retrieve-update-delete', args=[vendor.pk]),
+            {'address': 'Other Address'})
+        # The same for any number of rows within one ingest batch, their
+        # line items included
+        self.request(10, 'post', reverse('purchase-order-bulk-upsert'), [
+            {**ORDER, 'po_number': f'PO-BULK-{number}', 'vendor': vendor.pk}
+            for number in range(size)
+        ] + [
+            {'po_number': po_number, 'status': 'completed'}
+            for po_number in PurchaseOrder.objects.filter(
+                vendor=vendor).values_list('po_number', flat=True)
+        ])
+        # The same for any number of orders
+        self.request(7, 'post', reverse('purchase-order-bulk-acknowledge'), {
+            'ids': list(PurchaseOrder.objects.values_list('pk', flat=True))})
+        self.request(5, 'delete', reverse(
+            'purchase-order-retrieve-update-delete', args=[order.pk]),
+            expected=status.HTTP_204_NO_CONTENT)
+        self.request(8, 'delete', reverse(
+            'vendor-retrieve-update-delete', args=[vendors[-1].pk]),
+            expected=status.HTTP_204_NO_CONTENT)
+
+    def check_order_cycle(self, size):
+        vendor = create_dataset(size)[0]
+        # Including the INSERT of its line items
+        response = self.request(
+            6, 'post', reverse('purchase-order-list-create'),
+            {**ORDER, 'vendor': vendor.pk}, expected=status.HTTP_201_CREATED)
+        order_id = response.data['id']
+        self.request(4, 'post', reverse(
+            'acknowledge-purchase-order', args=[order_id]))
+        self.request(4, 'patch', reverse(
+            'purchase-order-retrieve-update-delete', args=[order_id]),
+            {'status': 'completed', 'quality_rating': 4.5})
+
+        # The order UPDATE and one F() update of the vendor counters
+        order = PurchaseOrder.objects.get(pk=order_id)
+        order.quality_rating = 3.0
+        with self.assertQueryBudget(2):
+            order.save()
+
+    def test_endpoint_budgets(self):
+        self.check_at_each_size(self.check_budgets)
+
+    def test_order_cycle_budgets(self):
+        self.check_at_each_size(self.check_order_cycle)
+
+
+class AdminQueryBudgetTest(QueryBudgetMixin, TestCase):
+    """
+    Maximum number of queries of the admin changelists, the vendor of every
+    row must come from the same query.
+    """
+
+    def setUp(self):
+        self.user = User.objects.create_superuser(
+            username='testadmin', email='testadmin@example.com',
+            password='testpassword')
+        self.client.force_login(self.user)
+
+    def changelist(self, budget, model, params=None):
+        url = reverse(f'admin:fatmug_main_{model}_changelist')
+        with self.assertQueryBudget(budget):
+            response = self.client.get(url, params)
+        self.assertEqual(response.status_code, status.HTTP_200_OK)
+        return response
+
+    def check_changelists(self, size):
+        vendor = create_dataset(size)[-1]
+        # Session, user, the capped count and the page with its vendors
+        response = self.changelist(4, 'purchaseorder')
+        self.assertContains(response, f'PO-{vendor.pk}-')
+        self.assertContains(response, str(vendor))
+        self.changelist(4, 'purchaseorder', {
+            'status__exact': 'completed', 'vendor': vendor.vendor_code})
+        self.changelist(4, 'purchaseorder', {'q': f'PO-{vendor.pk}-0'})
+        self.changelist(4, 'historicalperformance', {'vendor': vendor.pk})
+        self.changelist(4, 'vendor', {'q': vendor.vendor_code})
+
+    def test_changelist_budgets(self):
+        self.check_at_each_size(self.check_changelists)
@@ -1,9 +1,17 @@
+import base64
+import hashlib
+import tempfile
+from io import StringIO
+
 from django.contrib.auth.models import User
-from django.test import TestCase
+from django.contrib.staticfiles import finders
+from django.core.management import call_command
+from django.test import TestCase, override_settings
 from django.urls import reverse
 from rest_framework.authtoken.models import Token
 from rest_framework.test import APIClient
 
+from fatmug_main.api_docs import SWAGGER_UI_ASSETS, static_asset
 from fatmug_main.models import PurchaseOrder, Vendor
 
 
@@ -81,3 +89,48 @@ class UrlsTest(TestCase):
             args=[1])  
         response = self.client.post(url, data={})
         self.assertEqual(response.status_code, 200)
+
+    def test_admin_vendor_filter_accepts_vendor_ids_and_codes(self):
+        self.client.force_login(self.user)
+        url = reverse('admin:fatmug_main_purchaseorder_changelist')
+        for value in [self.vendor.pk, self.vendor.vendor_code]:
+            response = self.client.get(url, {'vendor': value})
+            self.assertContains(response, 'vendor id or code')
+            self.assertContains(response, 'PO123')
+        response = self.client.get(url, {'vendor': '456'})
+        self.assertNotContains(response, 'PO123')
+
+    def test_api_docs_urls_resolve(self):
+        response = self.client.get(reverse('schema-json', args=['.json']))
+        self.assertEqual(response.status_code, 200)
+        self.assertIn('/api/vendors/', response.json()['paths'])
+
+        with tempfile.TemporaryDirectory() as schema_dir:
+            with override_settings(API_DOCS='static', API_SCHEMA_DIR=schema_dir):
+                response = self.client.get(reverse('schema-json', args=['.json']))
+                self.assertEqual(response.status_code, 404)
+
+                call_command('build_api_schema', stdout=StringIO())
+                response = self.client.get(reverse('schema-json', args=['.yaml']))
+                self.assertEqual(response.status_code, 200)
+                self.assertEqual(response['Content-Type'], 'application/yaml')
+                response.close()
+                response = self.client.get(reverse('schema-swagger-ui'))
+                self.assertContains(response, '/swagger.json')
+                # Pinned copies served with their hash, not a floating CDN
+                script = static_asset(SWAGGER_UI_ASSETS['script'])
+                self.assertContains(
+                    response, '/static/drf-yasg/swagger-ui-dist/swagger-ui-bundle.js')
+                self.assertContains(response, script['integrity'])
+                with open(finders.find(SWAGGER_UI_ASSETS['script']), 'rb') as file:
+                    digest = hashlib.sha384(file.read()).digest()
+                self.assertEqual(
+                    script['integrity'],
+                    'sha384-' + base64.b64encode(digest).decode())
+                response = self.client.get(reverse('schema-redoc'))
+                self.assertContains(response, '/static/drf-yasg/redoc/redoc.min.js')
+                self.assertContains(response, 'integrity="sha384-', count=1)
+
+        with override_settings(API_DOCS='off'):
+            response = self.client.get(reverse('schema-redoc'))
+            self.assertEqual(response.status_code, 404)
@@ -1,11 +1,24 @@
-from django.test import TestCase
+import json
+from unittest import mock
+
+from django.test import TestCase, override_settings
 from django.contrib.auth.models import User
 from django.urls import reverse
+from django.utils import timezone
 from rest_framework import status
 from rest_framework.authtoken.models import Token
-from rest_framework.test import APIClient
+from rest_framework.renderers import JSONRenderer
+from rest_framework.request import Request
+from rest_framework.test import APIClient, APIRequestFactory
 
-from ..models import Vendor, PurchaseOrder
+from ..models import (HistoricalPerformance, PurchaseOrder, PurchaseOrderItem,
+                      Vendor)
+from ..pagination import KeysetPagination
+from ..routers import ReadReplicaRouter
+from ..serializers import (PurchaseOrderSerializer, ValuesSerializer,
+                           VendorSerializer)
+from ..utils.instrumentation import registry
+from ..utils.metrics_calculator import recalculate_vendor_metrics
 
 class ViewsTest(TestCase):
     def setUp(self):
@@ -41,6 +54,37 @@ class ViewsTest(TestCase):
         response = self.client.get(url)
         self.assertEqual(response.status_code, status.HTTP_200_OK)
 
+    def test_vendor_list_pagination_search_and_fields(self):
+        for number, name in enumerate(['Acme Tools', 'acme lower', 'Beta Supply']):
+            Vendor.objects.create(
+                name=name, contact_details='', address='',
+                vendor_code=f'AC{number}', fulfillment_rate=number * 50)
+        url = reverse('vendor-list-create')
+
+        response = self.client.get(url, {'page_size': 2, 'fields': 'id,name'})
+        self.assertEqual(response.status_code, status.HTTP_200_OK)
+        self.assertEqual(
+            response.data['results'][0], {'id': self.vendor.id, 'name': 'Test Vendor'})
+        response = self.client.get(response.data['next'])
+        self.assertEqual(
+            [row['name'] for row in response.data['results']],
+            ['acme lower', 'Beta Supply'])
+
+        # Prefix search is case sensitive, on the name or the vendor code
+        response = self.client.get(url, {'search': 'Acme'})
+        self.assertEqual(
+            [row['name'] for row in response.data['results']], ['Acme Tools'])
+        response = self.client.get(url, {'search': 'AC'})
+        self.assertEqual(len(response.data['results']), 3)
+
+        response = self.client.get(url, {'search': 'AC', 'fulfillment_rate__gte': 50})
+        self.assertEqual(
+            [row['name'] for row in response.data['results']],
+            ['acme lower', 'Beta Supply'])
+
+        response = self.client.get(url, {'fields': 'name,unknown'})
+        self.assertEqual(response.status_code, status.HTTP_400_BAD_REQUEST)
+
     def test_vendor_retrieve_update_delete_view(self):
         url = reverse('vendor-retrieve-update-delete', args=[self.vendor.id])
         response = self.client.get(url)
@@ -65,3 +109,607 @@ class ViewsTest(TestCase):
         url = reverse('acknowledge-purchase-order', args=[self.purchase_order.id])
         response = self.client.post(url)
         self.assertEqual(response.status_code, status.HTTP_200_OK)
+
+    def test_purchase_order_bulk_upsert_view(self):
+        url = reverse('purchase-order-bulk-upsert')
+        new_order = {
+            'po_number': 'PO124',
+            'vendor': self.vendor.id,
+            'order_date': '2023-01-02T12:00:00Z',
+            'delivery_date': '2023-01-12T12:00:00Z',
+            'items': {'item1': 'Test Item'},
+            'quantity': 5,
+            'issue_date': '2023-01-02T12:00:00Z',
+        }
+        rows = [
+            new_order,
+            {'po_number': 'PO123', 'status': 'completed', 'quality_rating': 4.0},
+            {'po_number': 'PO125', 'vendor': self.vendor.id},
+            {**new_order, 'po_number': 'PO126', 'vendor': 999},
+        ]
+        response = self.client.post(url, rows, format='json')
+
+        self.assertEqual(response.status_code, status.HTTP_207_MULTI_STATUS)
+        self.assertEqual(response.data['created'], 1)
+        self.assertEqual(response.data['updated'], 1)
+        self.assertEqual(
+            [error['row'] for error in response.data['errors']], [2, 3])
+        self.assertIn('vendor', response.data['errors'][1]['errors'])
+
+        self.purchase_order.refresh_from_db()
+        self.assertEqual(self.purchase_order.status, 'completed')
+        self.assertIsNotNone(self.purchase_order.completion_date)
+        self.vendor.refresh_from_db()
+        self.assertEqual(self.vendor.total_po_count, 2)
+        self.assertEqual(self.vendor.fulfillment_rate, 50.0)
+        self.assertEqual(self.vendor.quality_rating_avg, 4.0)
+
+    def test_purchase_order_bulk_upsert_view_ndjson(self):
+        url = reverse('purchase-order-bulk-upsert')
+        body = '\n'.join([
+            '{"po_number": "PO123", "status": "canceled"}',
+            '{"po_number": ',
+            '',
+        ])
+        response = self.client.post(
+            url, body, content_type='application/x-ndjson')
+
+        self.assertEqual(response.status_code, status.HTTP_207_MULTI_STATUS)
+        self.assertEqual(response.data['updated'], 1)
+        self.assertEqual(response.data['errors'][0]['row'], 1)
+        self.purchase_order.refresh_from_db()
+        self.assertEqual(self.purchase_order.status, 'canceled')
+
+    def test_vendor_performance_history_view(self):
+        for date, rate in (('2023-01-01', 80.0), ('2023-01-02', 90.0),
+                           ('2023-02-01', 50.0)):
+            HistoricalPerformance.objects.create(
+                vendor=self.vendor,
+                date=f'{date}T00:00:00Z',
+                on_time_delivery_rate=rate,
+                quality_rating_avg=4.0,
+                average_response_time=None,
+                fulfillment_rate=100.0,
+            )
+        url = reverse('vendor-performance-history', args=[self.vendor.id])
+
+        response = self.client.get(url, {'bucket': 'month', 'page_size': 1})
+        self.assertEqual(response.status_code, status.HTTP_200_OK)
+        self.assertEqual(response.data['results'], [{
+            'bucket': '2023-01-01T00:00:00Z',
+            'on_time_delivery_rate': 85.0,
+            'quality_rating_avg': 4.0,
+            'average_response_time': None,
+            'fulfillment_rate': 100.0,
+            'samples': 2,
+        }])
+
+        response = self.client.get(response.data['next'])
+        self.assertEqual(
+            [row['bucket'] for row in response.data['results']],
+            ['2023-02-01T00:00:00Z'])
+        self.assertIsNone(response.data['next'])
+
+        response = self.client.get(url, {'from': '2023-01-02', 'to': '2023-01-31'})
+        self.assertEqual(
+            [row['on_time_delivery_rate'] for row in response.data['results']],
+            [90.0])
+
+        response = self.client.get(url, {'bucket': 'year'})
+        self.assertEqual(response.status_code, status.HTTP_400_BAD_REQUEST)
+
+    def test_vendor_performance_view_cache_and_conditional_requests(self):
+        url = reverse('vendor_performance', args=[self.vendor.id])
+        response = self.client.get(url)
+        etag = response['ETag']
+        self.assertEqual(response.data['fulfillment_rate'], 0.0)
+
+        # Both the token and the performance data come from a cache
+        with self.assertNumQueries(0):
+            response = self.client.get(url)
+        self.assertEqual(response['ETag'], etag)
+
+        response = self.client.get(url, HTTP_IF_NONE_MATCH=etag)
+        self.assertEqual(response.status_code, status.HTTP_304_NOT_MODIFIED)
+        response = self.client.get(
+            url, HTTP_IF_MODIFIED_SINCE=response['Last-Modified'])
+        self.assertEqual(response.status_code, status.HTTP_304_NOT_MODIFIED)
+
+        self.purchase_order.status = 'completed'
+        self.purchase_order.save()
+        response = self.client.get(url, HTTP_IF_NONE_MATCH=etag)
+        self.assertEqual(response.status_code, status.HTTP_200_OK)
+        self.assertEqual(response.data['fulfillment_rate'], 100.0)
+        self.assertNotEqual(response['ETag'], etag)
+
+        response = self.client.get(reverse('vendor_performance', args=[999]))
+        self.assertEqual(response.status_code, status.HTTP_404_NOT_FOUND)
+
+    def test_vendor_leaderboard_view(self):
+        for code, on_time, quality in (('A', 90.0, 3.0), ('B', 90.0, 4.5),
+                                       ('C', 70.0, 5.0), ('D', None, 4.0)):
+            Vendor.objects.create(
+                name=f'Vendor {code}',
+                contact_details='vendor@example.com',
+                address='Address',
+                vendor_code=code,
+                on_time_delivery_rate=on_time,
+                quality_rating_avg=quality,
+            )
+        url = reverse('vendor-leaderboard')
+
+        response = self.client.get(url, {
+            'ordering': '-on_time_delivery_rate,-quality_rating_avg',
+            'page_size': 2,
+        })
+        self.assertEqual(response.status_code, status.HTTP_200_OK)
+        self.assertEqual(
+            [row['vendor_name'] for row in response.data['results']],
+            ['Vendor B', 'Vendor A'])
+        self.assertEqual(
+            set(response.data['results'][0]),
+            {'vendor_id', 'vendor_name', 'on_time_delivery_rate',
+             'quality_rating_avg', 'average_response_time', 'fulfillment_rate'})
+
+        response = self.client.get(response.data['next'])
+        self.assertEqual(
+            [row['vendor_name'] for row in response.data['results']],
+            ['Vendor C'])
+
+        response = self.client.get(url, {
+            'ordering': 'quality_rating_avg', 'on_time_delivery_rate__lt': 80})
+        self.assertEqual(
+            [row['vendor_name'] for row in response.data['results']],
+            ['Vendor C'])
+
+        response = self.client.get(url, {'fulfillment_rate__lt': 'abc'})
+        self.assertEqual(response.status_code, status.HTTP_400_BAD_REQUEST)
+
+    def test_vendor_leaderboard_pages_through_tied_rates(self):
+        # Rates tie heavily, 1300 vendors share one, more than
+        # CursorPagination's offset_cutoff of 1000 plus a page
+        Vendor.objects.bulk_create(
+            Vendor(name=f'Vendor {number}', contact_details='', address='',
+                   vendor_code=f'T{number}',
+                   on_time_delivery_rate=(100.0, 0.0, None)[number % 3] if number < 300
+                   else 100.0)
+            for number in range(1500))
+        ranked = Vendor.objects.filter(on_time_delivery_rate__isnull=False)
+        expected = (
+            list(ranked.filter(on_time_delivery_rate=100.0).order_by(
+                'id').values_list('id', flat=True))
+            + list(ranked.filter(on_time_delivery_rate=0.0).order_by(
+                'id').values_list('id', flat=True)))
+
+        ids, pages = [], 0
+        url = reverse('vendor-leaderboard') + '?page_size=100'
+        while url:
+            response = self.client.get(url)
+            self.assertEqual(response.status_code, status.HTTP_200_OK)
+            ids.extend(row['vendor_id'] for row in response.data['results'])
+            url, pages = response.data['next'], pages + 1
+            self.assertLess(pages, 20)
+        self.assertEqual(ids, expected)
+
+        # And back from the last page through the previous links
+        ids = [row['vendor_id'] for row in response.data['results']]
+        url = response.data['previous']
+        while url:
+            response = self.client.get(url)
+            ids[:0] = [row['vendor_id'] for row in response.data['results']]
+            url = response.data['previous']
+        self.assertEqual(ids, expected)
+
+    def test_keyset_pagination_sorts_nulls_last(self):
+        for number, rating in enumerate((None, 4.0, None, 2.0, 4.0, None)):
+            Vendor.objects.create(
+                name=f'Vendor {number}', contact_details='', address='',
+                vendor_code=f'N{number}', quality_rating_avg=rating)
+        queryset = Vendor.objects.exclude(pk=self.vendor.pk)
+        factory = APIRequestFactory()
+        for ordering in (('quality_rating_avg', 'id'), ('-quality_rating_avg', 'id')):
+            pagination = KeysetPagination()
+            pagination.ordering, pagination.page_size = ordering, 2
+            expected = sorted(
+                queryset, key=lambda vendor: (
+                    vendor.quality_rating_avg is None,
+                    (vendor.quality_rating_avg or 0) * (
+                        -1 if ordering[0].startswith('-') else 1),
+                    vendor.id))
+
+            vendors, url = [], '/'
+            while url:
+                page = pagination.paginate_queryset(
+                    queryset, Request(factory.get(url)))
+                vendors.extend(page)
+                url = pagination.get_next_link()
+            self.assertEqual(vendors, expected)
+
+            vendors, url = page, pagination.get_previous_link()
+            while url:
+                vendors = pagination.paginate_queryset(
+                    queryset, Request(factory.get(url))) + vendors
+                url = pagination.get_previous_link()
+            self.assertEqual(vendors, expected)
+
+    def test_purchase_order_list_pagination_filters_and_fields(self):
+        for number in range(3):
+            PurchaseOrder.objects.create(
+                po_number=f'PO20{number}',
+                vendor=self.vendor,
+                order_date='2023-02-01T12:00:00Z',
+                delivery_date='2023-02-10T12:00:00Z',
+                items={'item1': 'Test Item'},
+                quantity=10,
+                status='completed' if number else 'pending',
+                issue_date=f'2023-02-0{number + 1}T12:00:00Z',
+            )
+        url = reverse('purchase-order-list-create')
+
+        # Token lookup and the page itself, no separate exists() query
+        with self.assertNumQueries(2):
+            response = self.client.get(url, {
+                'vendor_id': self.vendor.id, 'page_size': 2,
+                'fields': 'id,po_number,status'})
+        self.assertEqual(response.status_code, status.HTTP_200_OK)
+        self.assertEqual(
+            response.data['results'][0],
+            {'id': self.purchase_order.id, 'po_number': 'PO123', 'status': 'pending'})
+
+        response = self.client.get(response.data['next'])
+        self.assertEqual(
+            [row['po_number'] for row in response.data['results']],
+            ['PO201', 'PO202'])
+        self.assertNotIn('items', response.data['results'][0])
+
+        response = self.client.get(url, {
+            'status': 'completed', 'from': '2023-02-03', 'to': '2023-02-28'})
+        self.assertEqual(
+            [row['po_number'] for row in response.data['results']], ['PO202'])
+
+        response = self.client.get(url, {'fields': 'po_number,unknown'})
+        self.assertEqual(response.status_code, status.HTTP_400_BAD_REQUEST)
+
+        response = self.client.get(url, {'vendor_id': 999})
+        self.assertEqual(response.status_code, status.HTTP_404_NOT_FOUND)
+
+    def test_purchase_order_list_pages_through_tied_issue_dates(self):
+        # More orders issued at the same time than CursorPagination's
+        # offset_cutoff of 1000
+        PurchaseOrder.objects.bulk_create(
+            PurchaseOrder(
+                po_number=f'PO-TIE-{number}', vendor=self.vendor,
+                order_date='2023-05-01T12:00:00Z',
+                delivery_date='2023-05-10T12:00:00Z',
+                items={'item1': 'Test Item'}, quantity=1,
+                issue_date='2023-05-01T12:00:00Z')
+            for number in range(1100))
+        expected = list(PurchaseOrder.objects.order_by(
+            'issue_date', 'id').values_list('id', flat=True))
+
+        ids, pages = [], 0
+        url = reverse('purchase-order-list-create') + '?page_size=100&fields=id'
+        while url:
+            response = self.client.get(url)
+            self.assertEqual(response.status_code, status.HTTP_200_OK)
+            ids.extend(row['id'] for row in response.data['results'])
+            url, pages = response.data['next'], pages + 1
+            self.assertLess(pages, 20)
+        self.assertEqual(ids, expected)
+
+        # And back through the previous links
+        previous_ids = []
+        url = response.data['previous']
+        while url:
+            response = self.client.get(url)
+            previous_ids[:0] = [row['id'] for row in response.data['results']]
+            url = response.data['previous']
+        self.assertEqual(previous_ids, expected[:len(previous_ids)])
+        self.assertEqual(len(previous_ids), len(expected) - 1101 % 100)
+
+    def test_values_serializer_matches_model_serializer(self):
+        PurchaseOrder.objects.create(
+            po_number='PO300',
+            vendor=self.vendor,
+            order_date='2023-03-01T12:00:00.123456Z',
+            delivery_date='2023-03-10T12:00:00Z',
+            items=[{'sku': 'A1', 'quantity': 2}, 'B2'],
+            quantity=3,
+            status='completed',
+            quality_rating=4,
+            issue_date='2023-03-01T12:00:00Z',
+            acknowledgment_date='2023-03-02T08:30:00Z',
+            completion_date='2023-03-05T12:00:00Z',
+        )
+        recalculate_vendor_metrics([self.vendor.id])
+        cases = [
+            (PurchaseOrder.objects.order_by('id'), PurchaseOrderSerializer, None),
+            (PurchaseOrder.objects.order_by('id'), PurchaseOrderSerializer,
+             ['status', 'items', 'acknowledgment_date']),
+            (Vendor.objects.order_by('id'), VendorSerializer, None),
+        ]
+        renderer = JSONRenderer()
+        for zone in ('UTC', 'Asia/Kolkata'):
+            for queryset, serializer_class, fields in cases:
+                with self.subTest(zone=zone, serializer=serializer_class, fields=fields), \
+                        timezone.override(zone):
+                    serializer = ValuesSerializer(serializer_class(fields=fields))
+                    rows = serializer.values_list(queryset)
+                    self.assertEqual(
+                        renderer.render(serializer.to_representation(rows)),
+                        renderer.render(serializer_class(
+                            queryset, many=True, fields=fields).data))
+
+    def test_export_view(self):
+        url = reverse('export', args=['purchase_orders'])
+        response = self.client.get(url)
+        self.assertEqual(response.status_code, status.HTTP_200_OK)
+        self.assertTrue(response.streaming)
+        self.assertEqual(response['Content-Type'], 'application/x-ndjson; charset=utf-8')
+        rows = [json.loads(line) for line in
+                b''.join(response.streaming_content).decode().splitlines()]
+        self.assertEqual(len(rows), 1)
+        self.assertEqual(rows[0]['po_number'], 'PO123')
+        self.assertEqual(rows[0]['vendor'], self.vendor.id)
+        self.assertEqual(rows[0]['issue_date'], '2023-01-01T12:00:00Z')
+
+        response = self.client.get(url, {'format': 'csv', 'status': 'completed'})
+        self.assertEqual(response['Content-Type'], 'text/csv; charset=utf-8')
+        lines = b''.join(response.streaming_content).decode().splitlines()
+        self.assertEqual(lines[0].split(',')[:2], ['id', 'po_number'])
+        self.assertEqual(len(lines), 1)
+
+        response = self.client.get(
+            reverse('export', args=['vendors']), HTTP_ACCEPT='text/csv')
+        lines = b''.join(response.streaming_content).decode().splitlines()
+        self.assertEqual(len(lines), 2)
+        self.assertIn('Test Vendor', lines[1])
+
+        response = self.client.get(reverse('export', args=['users']))
+        self.assertEqual(response.status_code, status.HTTP_404_NOT_FOUND)
+
+    async def test_async_views_match_sync_views(self):
+        headers = {'Authorization': f'Token {self.token.key}'}
+        pairs = [
+            (reverse('vendor-retrieve-update-delete', args=[self.vendor.id]),
+             reverse('async-vendor-retrieve', args=[self.vendor.id])),
+            (reverse('vendor_performance', args=[self.vendor.id]),
+             reverse('async-vendor-performance', args=[self.vendor.id])),
+            (reverse('purchase-order-retrieve-update-delete',
+                     args=[self.purchase_order.id]),
+             reverse('async-purchase-order-retrieve',
+                     args=[self.purchase_order.id])),
+        ]
+        for sync_url, async_url in pairs:
+            sync_response = await self.async_client.get(sync_url, headers=headers)
+            async_response = await self.async_client.get(async_url, headers=headers)
+            self.assertEqual(async_response.status_code, status.HTTP_200_OK)
+            self.assertEqual(async_response.json(), sync_response.json())
+
+        response = await self.async_client.get(pairs[1][1], headers=headers)
+        response = await self.async_client.get(
+            pairs[1][1], headers={**headers, 'If-None-Match': response['ETag']})
+        self.assertEqual(response.status_code, status.HTTP_304_NOT_MODIFIED)
+
+        response = await self.async_client.get(pairs[0][1])
+        self.assertEqual(response.status_code, status.HTTP_401_UNAUTHORIZED)
+        response = await self.async_client.get(
+            reverse('async-vendor-retrieve', args=[999]), headers=headers)
+        self.assertEqual(response.status_code, status.HTTP_404_NOT_FOUND)
+
+    async def test_async_purchase_order_list_view(self):
+        for number in range(3):
+            await PurchaseOrder.objects.acreate(
+                po_number=f'PO20{number}',
+                vendor=self.vendor,
+                order_date='2023-02-01T12:00:00Z',
+                delivery_date='2023-02-10T12:00:00Z',
+                items={'item1': 'Test Item'},
+                quantity=10,
+                status='pending',
+                issue_date='2023-02-01T12:00:00Z',
+            )
+        headers = {'Authorization': f'Token {self.token.key}'}
+        url = reverse('async-purchase-order-list')
+
+        response = await self.async_client.get(url, {
+            'vendor_id': self.vendor.id, 'page_size': 2,
+            'fields': 'id,po_number'}, headers=headers)
+        self.assertEqual(response.status_code, status.HTTP_200_OK)
+        page = response.json()
+        self.assertEqual(
+            page['results'][0],
+            {'id': self.purchase_order.id, 'po_number': 'PO123'})
+        po_numbers = [row['po_number'] for row in page['results']]
+        while page['next']:
+            page = (await self.async_client.get(
+                page['next'], headers=headers)).json()
+            po_numbers += [row['po_number'] for row in page['results']]
+        self.assertEqual(po_numbers, ['PO123', 'PO200', 'PO201', 'PO202'])
+
+        response = await self.async_client.get(
+            url, {'fields': 'unknown'}, headers=headers)
+        self.assertEqual(response.status_code, status.HTTP_400_BAD_REQUEST)
+        response = await self.async_client.get(
+            url, {'cursor': 'invalid'}, headers=headers)
+        self.assertEqual(response.status_code, status.HTTP_404_NOT_FOUND)
+
+    def test_metrics_view_and_slow_request_log(self):
+        registry.reset()
+        self.client.get(reverse('vendor-list-create'))
+        self.client.patch(
+            reverse('purchase-order-retrieve-update-delete',
+                    args=[self.purchase_order.id]),
+            {'status': 'completed'}, format='json')
+
+        response = self.client.get(reverse('metrics'))
+        self.assertEqual(response.status_code, status.HTTP_200_OK)
+        self.assertEqual(response['Content-Type'], 'text/plain; charset=utf-8')
+        lines = response.content.decode().splitlines()
+        # Token lookup and the vendor list
+        self.assertIn(
+            'fatmug_queries_total{kind="view",name="vendor-list-create"} 2', lines)
+        self.assertIn(
+            'fatmug_calls_total{kind="receiver",name="fatmug_main.signals.'
+            'update_vendor_performance_metrics"} 1', lines)
+        self.assertIn(
+            'fatmug_queries_total{kind="metrics",name="fatmug_main.utils.'
+            'metrics_calculator.apply_vendor_counter_deltas"} 1', lines)
+        self.assertIn(
+            'fatmug_wall_seconds_count{kind="view",name="vendor-list-create"} 1',
+            lines)
+
+        with override_settings(SLOW_REQUEST_THRESHOLD_MS=0):
+            with self.assertLogs('fatmug_main.slow_requests', 'WARNING') as logs:
+                self.client.get(reverse('vendor-list-create'))
+        self.assertIn('GET /api/vendors/ (vendor-list-create)', logs.output[0])
+        # The token is cached by now
+        self.assertIn('1 queries', logs.output[0])
+
+    def test_bulk_acknowledge_purchase_order_view(self):
+        acknowledged = PurchaseOrder.objects.create(
+            po_number='PO124',
+            vendor=self.vendor,
+            order_date='2023-01-01T12:00:00Z',
+            delivery_date='2023-01-10T12:00:00Z',
+            items={'item1': 'Test Item'},
+            quantity=10,
+            issue_date='2023-01-01T12:00:00Z',
+            acknowledgment_date='2023-01-01T13:00:00Z',
+        )
+        url = reverse('purchase-order-bulk-acknowledge')
+        response = self.client.post(url, {'ids': [
+            self.purchase_order.id, acknowledged.id, 999, self.purchase_order.id,
+        ]}, format='json')
+
+        self.assertEqual(response.status_code, status.HTTP_207_MULTI_STATUS)
+        self.assertEqual(response.data['acknowledged'], 1)
+        self.assertEqual(response.data['results'], [
+            {'id': self.purchase_order.id, 'status': 'acknowledged'},
+            {'id': acknowledged.id, 'status': 'already_acknowledged'},
+            {'id': 999, 'status': 'not_found'},
+        ])
+        self.purchase_order.refresh_from_db()
+        self.assertIsNotNone(self.purchase_order.acknowledgment_date)
+        acknowledged.refresh_from_db()
+        self.assertEqual(acknowledged.acknowledgment_date.hour, 13)
+
+        self.vendor.refresh_from_db()
+        self.assertEqual(self.vendor.acknowledged_po_count, 2)
+        incremental = self.vendor.average_response_time
+        recalculate_vendor_metrics([self.vendor.pk])
+        self.vendor.refresh_from_db()
+        self.assertEqual(self.vendor.average_response_time, incremental)
+
+        response = self.client.post(url, {'ids': []}, format='json')
+        self.assertEqual(response.status_code, status.HTTP_400_BAD_REQUEST)
+
+    def test_cached_token_authentication(self):
+        url = reverse('vendor-retrieve-update-delete', args=[self.vendor.id])
+        self.client.get(url)
+        # The vendor only, the token was cached by the first request
+        with self.assertNumQueries(1):
+            response = self.client.get(url)
+        self.assertEqual(response.status_code, status.HTTP_200_OK)
+
+        self.user.is_active = False
+        self.user.save()
+        response = self.client.get(url)
+        self.assertEqual(response.status_code, status.HTTP_401_UNAUTHORIZED)
+
+        self.user.is_active = True
+        self.user.save()
+        self.client.get(url)
+        self.token.delete()
+        response = self.client.get(url)
+        self.assertEqual(response.status_code, status.HTTP_401_UNAUTHORIZED)
+
+    def test_item_views(self):
+        other_vendor = Vendor.objects.create(
+            name='Other Vendor',
+            contact_details='other@example.com',
+            address='Other Address',
+            vendor_code='456'
+        )
+        PurchaseOrder.objects.create(
+            po_number='PO124',
+            vendor=other_vendor,
+            order_date='2023-03-01T12:00:00Z',
+            delivery_date='2023-03-10T12:00:00Z',
+            items=[{'sku': 'item1', 'quantity': 4}, {'sku': 'item2', 'quantity': 1}],
+            quantity=5,
+            issue_date='2023-03-01T12:00:00Z',
+        )
+
+        url = reverse('item-vendors', args=['item1'])
+        response = self.client.get(url)
+        self.assertEqual(response.status_code, status.HTTP_200_OK)
+        self.assertEqual(
+            [(row['vendor_name'], row['order_count'], row['total_quantity'])
+             for row in response.data['results']],
+            [('Test Vendor', 1, 10), ('Other Vendor', 1, 4)])
+        response = self.client.get(url, {'from': '2023-02-01', 'to': '2023-03-31'})
+        self.assertEqual(
+            [row['vendor_id'] for row in response.data['results']],
+            [other_vendor.id])
+
+        url = reverse('item-summary')
+        response = self.client.get(url, {'vendor_id': other_vendor.id})
+        self.assertEqual(response.status_code, status.HTTP_200_OK)
+        self.assertEqual(
+            [(row['sku'], row['total_quantity']) for row in response.data['results']],
+            [('item1', 4), ('item2', 1)])
+        response = self.client.get(url, {'vendor_id': 'x'})
+        self.assertEqual(response.status_code, status.HTTP_400_BAD_REQUEST)
+
+    def test_item_summary_pages_through_one_vendors_skus(self):
+        # Every row shares the vendor_id, more of them than CursorPagination's
+        # offset_cutoff of 1000 plus a page
+        PurchaseOrderItem.objects.bulk_create(
+            PurchaseOrderItem(
+                purchase_order=self.purchase_order, vendor=self.vendor,
+                sku=f'SKU{number:04}', quantity=1,
+                issue_date=self.purchase_order.issue_date)
+            for number in range(1300))
+        expected = sorted(PurchaseOrderItem.objects.filter(
+            vendor=self.vendor).values_list('sku', flat=True).distinct())
+
+        skus, pages = [], 0
+        url = reverse('item-summary') + f'?vendor_id={self.vendor.id}&page_size=100'
+        while url:
+            response = self.client.get(url)
+            self.assertEqual(response.status_code, status.HTTP_200_OK)
+            skus.extend(row['sku'] for row in response.data['results'])
+            url, pages = response.data['next'], pages + 1
+            self.assertLess(pages, 20)
+        self.assertEqual(skus, expected)
+
+    def test_get_views_read_from_replica(self):
+        decisions = []
+        db_for_read = ReadReplicaRouter.db_for_read
+
+        def record(router, model, **hints):
+            decisions.append(db_for_read(router, model, **hints))
+            return decisions[-1]
+
+        def routed_reads(method, url, data=None):
+            decisions.clear()
+            getattr(self.client, method)(url, data, format='json')
+            return set(decisions)
+
+        # The default database stands in for a replica
+        with mock.patch('fatmug_main.routers.REPLICA_DATABASE', 'default'), \
+                mock.patch('fatmug_main.routers.replica_configured',
+                           return_value=True), \
+                mock.patch.object(ReadReplicaRouter, 'db_for_read', record):
+            self.assertEqual(
+                routed_reads('get', reverse('vendor-list-create')), {'default'})
+            self.assertEqual(routed_reads('get', reverse(
+                'purchase-order-retrieve-update-delete',
+                args=[self.purchase_order.id])), {'default'})
+            self.assertEqual(routed_reads('post', reverse('vendor-list-create'), {
+                'name': 'New Vendor', 'contact_details': 'new@example.com',
+                'address': 'New Address', 'vendor_code': 'NEW'}), {None})
+            # Fills the performance cache, from the primary
+            self.assertEqual(routed_reads('get', reverse(
+                'vendor_performance', args=[self.vendor.id])), {None})
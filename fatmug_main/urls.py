@@ -16,9 +16,17 @@ Including another URLconf
 """
 from django.urls import path
 
-from .views import (AcknowledgePurchaseOrderView, PurchaseOrderListCreateView,
+from .async_views import (AsyncPurchaseOrderListView,
+                          AsyncPurchaseOrderRetrieveView,
+                          AsyncVendorPerformanceView, AsyncVendorRetrieveView)
+from .views import (AcknowledgePurchaseOrderView,
+                    BulkAcknowledgePurchaseOrderView, ExportView,
+                    ItemSummaryView, ItemVendorListView,
+                    PrometheusMetricsView, PurchaseOrderBulkUpsertView,
+                    PurchaseOrderListCreateView,
                     PurchaseOrderRetrieveUpdateDeleteView,
-                    VendorListCreateView, VendorPerformanceView,
+                    VendorLeaderboardView, VendorListCreateView,
+                    VendorPerformanceHistoryView, VendorPerformanceView,
                     VendorRetrieveUpdateDeleteView)
 
 urlpatterns = [
@@ -26,6 +34,10 @@ urlpatterns = [
         'api/vendors/',
         VendorListCreateView.as_view(),
         name='vendor-list-create'),
+    path(
+        'api/vendors/leaderboard/',
+        VendorLeaderboardView.as_view(),
+        name='vendor-leaderboard'),
     path(
         'api/vendors/<int:pk>/',
         VendorRetrieveUpdateDeleteView.as_view(),
@@ -34,6 +46,14 @@ urlpatterns = [
         'api/purchase_orders/',
         PurchaseOrderListCreateView.as_view(),
         name='purchase-order-list-create'),
+    path(
+        'api/purchase_orders/bulk/',
+        PurchaseOrderBulkUpsertView.as_view(),
+        name='purchase-order-bulk-upsert'),
+    path(
+        'api/purchase_orders/acknowledge/',
+        BulkAcknowledgePurchaseOrderView.as_view(),
+        name='purchase-order-bulk-acknowledge'),
     path(
         'api/purchase_orders/<int:pk>/',
         PurchaseOrderRetrieveUpdateDeleteView.as_view(),
@@ -42,8 +62,44 @@ urlpatterns = [
         'api/vendors/<int:pk>/performance/',
         VendorPerformanceView.as_view(),
         name='vendor_performance'),
+    path(
+        'api/vendors/<int:pk>/performance/history/',
+        VendorPerformanceHistoryView.as_view(),
+        name='vendor-performance-history'),
     path(
         'api/purchase_orders/<int:pk>/acknowledge/',
         AcknowledgePurchaseOrderView.as_view(),
         name='acknowledge-purchase-order'),
+    path(
+        'api/items/',
+        ItemSummaryView.as_view(),
+        name='item-summary'),
+    path(
+        'api/items/<str:sku>/vendors/',
+        ItemVendorListView.as_view(),
+        name='item-vendors'),
+    path(
+        'api/export/<str:dataset>/',
+        ExportView.as_view(),
+        name='export'),
+    path(
+        'metrics/',
+        PrometheusMetricsView.as_view(),
+        name='metrics'),
+    path(
+        'api/async/vendors/<int:pk>/',
+        AsyncVendorRetrieveView.as_view(),
+        name='async-vendor-retrieve'),
+    path(
+        'api/async/vendors/<int:pk>/performance/',
+        AsyncVendorPerformanceView.as_view(),
+        name='async-vendor-performance'),
+    path(
+        'api/async/purchase_orders/',
+        AsyncPurchaseOrderListView.as_view(),
+        name='async-purchase-order-list'),
+    path(
+        'api/async/purchase_orders/<int:pk>/',
+        AsyncPurchaseOrderRetrieveView.as_view(),
+        name='async-purchase-order-retrieve'),
 ]
@@ -0,0 +1,67 @@
+# bulk_acknowledge.py
+from django.db import transaction
+from django.db.models import Count, DurationField, ExpressionWrapper, F, Sum
+from django.utils import timezone
+
+from .metrics_queue import record_counter_deltas
+
+MAX_IDS = 1000
+
+
+def acknowledge_purchase_orders(ids, acknowledged_at=None) -> dict:
+    """
+    Acknowledge every purchase order in `ids` with a single UPDATE, skipping
+    the ones that were already acknowledged.
+
+    The orders bypass the per-save signals. Instead the response time
+    counters of each affected vendor are advanced once, from one grouped
+    aggregate over the newly acknowledged orders.
+
+    Returns the number of acknowledged orders and the outcome per id:
+    'acknowledged', 'already_acknowledged' or 'not_found'.
+    """
+    from ..models import PurchaseOrder
+
+    acknowledged_at = acknowledged_at or timezone.now()
+    ids = list(dict.fromkeys(ids))
+    with transaction.atomic():
+        # Locks the rows, so the outcomes cannot change before the UPDATE
+        found = dict(PurchaseOrder.objects.select_for_update().filter(
+            pk__in=ids).values_list('pk', 'acknowledgment_date'))
+        pending_ids = [
+            pk for pk, acknowledgment_date in found.items()
+            if acknowledgment_date is None]
+
+        acknowledged = 0
+        if pending_ids:
+            acknowledged = PurchaseOrder.objects.filter(
+                pk__in=pending_ids, acknowledgment_date__isnull=True,
+            ).update(acknowledgment_date=acknowledged_at)
+
+            rows = PurchaseOrder.objects.filter(
+                pk__in=pending_ids, acknowledgment_date=acknowledged_at,
+            ).values('vendor_id').annotate(
+                acknowledged_po_count=Count('id'),
+                response_time_sum=Sum(ExpressionWrapper(
+                    F('acknowledgment_date') - F('issue_date'),
+                    output_field=DurationField())),
+            ).order_by()
+            record_counter_deltas({
+                row['vendor_id']: {
+                    'acknowledged_po_count': row['acknowledged_po_count'],
+                    'response_time_sum': row['response_time_sum'].total_seconds(),
+                }
+                for row in rows
+            })
+
+    pending_ids = set(pending_ids)
+    results = []
+    for pk in ids:
+        if pk not in found:
+            outcome = 'not_found'
+        elif pk in pending_ids:
+            outcome = 'acknowledged'
+        else:
+            outcome = 'already_acknowledged'
+        results.append({'id': pk, 'status': outcome})
+    return {'acknowledged': acknowledged, 'results': results}
@@ -0,0 +1,129 @@
+# bulk_ingest.py
+from itertools import islice
+
+from django.db import DatabaseError, transaction
+
+from .line_items import write_line_items
+from .metrics_queue import schedule_vendor_metrics
+
+BATCH_SIZE = 500
+
+
+def _batches(rows, batch_size):
+    rows = iter(rows)
+    while batch := list(islice(rows, batch_size)):
+        yield batch
+
+
+def _prefetch_vendors(rows) -> dict:
+    from ..models import Vendor
+
+    vendor_ids = set()
+    for row in rows:
+        try:
+            vendor_ids.add(int(row['vendor']))
+        except (KeyError, TypeError, ValueError):
+            continue
+    return Vendor.objects.in_bulk(vendor_ids)
+
+
+def _ingest_batch(rows, first_row, result, affected_vendor_ids) -> None:
+    from ..models import PurchaseOrder
+    from ..serializers import BulkPurchaseOrderSerializer
+
+    def add_error(row_number, errors):
+        result['errors'].append({'row': row_number, 'errors': errors})
+
+    valid_rows = {}
+    for row_number, row in enumerate(rows, start=first_row):
+        if isinstance(row, Exception):
+            add_error(row_number, {'non_field_errors': [str(row)]})
+        elif not isinstance(row, dict):
+            add_error(row_number, {'non_field_errors': [
+                'Expected a purchase order object.']})
+        else:
+            valid_rows[row_number] = row
+
+    existing = PurchaseOrder.objects.in_bulk(
+        [row['po_number'] for row in valid_rows.values()
+         if isinstance(row.get('po_number'), str)],
+        field_name='po_number')
+    context = {'vendors': _prefetch_vendors(valid_rows.values())}
+
+    to_create, to_update, seen_po_numbers = {}, {}, set()
+    for row_number, row in valid_rows.items():
+        po_number = row.get('po_number')
+        instance = existing.get(po_number) if isinstance(po_number, str) else None
+        serializer = BulkPurchaseOrderSerializer(
+            instance, data=row, partial=instance is not None, context=context)
+        if not serializer.is_valid():
+            add_error(row_number, serializer.errors)
+            continue
+
+        po_number = serializer.validated_data.get('po_number', po_number)
+        if po_number in seen_po_numbers:
+            add_error(row_number, {'po_number': [
+                'Duplicate purchase order in the same batch.']})
+            continue
+        seen_po_numbers.add(po_number)
+
+        if instance is None:
+            instance = PurchaseOrder(**serializer.validated_data)
+            to_create[row_number] = instance
+        else:
+            affected_vendor_ids.add(instance.vendor_id)
+            for field, value in serializer.validated_data.items():
+                setattr(instance, field, value)
+            to_update[row_number] = instance
+        instance.update_completion_date()
+
+    if not to_create and not to_update:
+        return
+
+    update_fields = [
+        field.name for field in PurchaseOrder._meta.concrete_fields
+        if not field.primary_key]
+    try:
+        # Each batch is committed on its own, a failing batch does not undo
+        # the batches written before it
+        with transaction.atomic():
+            PurchaseOrder.objects.bulk_create(to_create.values())
+            PurchaseOrder.objects.bulk_update(to_update.values(), update_fields)
+            # Only the updated orders whose line items changed are rewritten
+            changed = [
+                instance for instance in to_update.values()
+                if instance.get_line_item_state()
+                != instance.get_loaded_line_item_state()]
+            write_line_items(
+                [*to_create.values(), *changed],
+                replaced_order_ids=[instance.pk for instance in changed])
+    except DatabaseError as exc:
+        for row_number in sorted({*to_create, *to_update}):
+            add_error(row_number, {'non_field_errors': [str(exc)]})
+        return
+
+    result['created'] += len(to_create)
+    result['updated'] += len(to_update)
+    affected_vendor_ids.update(
+        instance.vendor_id
+        for instance in (*to_create.values(), *to_update.values()))
+
+
+def ingest_purchase_orders(rows, batch_size=BATCH_SIZE) -> dict:
+    """
+    Create or update (by po_number) the purchase orders in `rows`.
+
+    Rows are validated and written in batches with bulk_create/bulk_update,
+    bypassing the per-save signals, along with their PurchaseOrderItem rows.
+    The metrics of every affected vendor are recalculated (or queued) once at
+    the end. Invalid rows are reported by their position and do not stop the
+    other rows from being written.
+    """
+    result = {'created': 0, 'updated': 0, 'errors': []}
+    affected_vendor_ids = set()
+    for batch_number, batch in enumerate(_batches(rows, batch_size)):
+        _ingest_batch(
+            batch, batch_number * batch_size, result, affected_vendor_ids)
+
+    schedule_vendor_metrics(affected_vendor_ids)
+    return result
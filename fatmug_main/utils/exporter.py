@@ -0,0 +1,22 @@
+# exporter.py
+from ..models import PurchaseOrder, Vendor
+
+CHUNK_SIZE = 2000
+
+EXPORT_MODELS = {
+    'purchase_orders': PurchaseOrder,
+    'vendors': Vendor,
+}
+
+
+def export_rows(queryset, chunk_size=CHUNK_SIZE):
+    """
+    Return the exported field names and a lazy iterator over the rows of
+    `queryset` as tuples, in primary key order. Rows are fetched
+    `chunk_size` at a time (with a server-side cursor where the database
+    supports it), so memory use does not grow with the size of the export.
+    """
+    fields = [field.name for field in queryset.model._meta.concrete_fields]
+    rows = queryset.order_by('pk').values_list(*fields).iterator(
+        chunk_size=chunk_size)
+    return fields, rows
@@ -0,0 +1,158 @@
+# instrumentation.py
+import functools
+import threading
+import time
+
+from django.conf import settings
+from django.db import connections
+
+# Upper bounds in seconds of the wall time histogram buckets
+WALL_TIME_BUCKETS = (0.005, 0.01, 0.025, 0.05, 0.1, 0.25, 0.5, 1.0, 2.5, 5.0)
+
+
+def instrumentation_enabled() -> bool:
+    return getattr(settings, 'INSTRUMENTATION_ENABLED', True)
+
+
+class InstrumentationRegistry:
+    """
+    Process wide totals of the instrumented calls, keyed by the kind of call
+    ('view', 'receiver', 'metrics') and its name.
+    """
+
+    def __init__(self):
+        self._lock = threading.Lock()
+        self._stats = {}
+
+    def record(self, kind, name, queries, db_time, wall_time) -> None:
+        with self._lock:
+            stats = self._stats.get((kind, name))
+            if stats is None:
+                stats = self._stats[(kind, name)] = {
+                    'calls': 0, 'queries': 0, 'db_seconds': 0.0,
+                    'wall_seconds': 0.0,
+                    'buckets': [0] * len(WALL_TIME_BUCKETS)}
+            stats['calls'] += 1
+            stats['queries'] += queries
+            stats['db_seconds'] += db_time
+            stats['wall_seconds'] += wall_time
+            for index, bound in enumerate(WALL_TIME_BUCKETS):
+                if wall_time <= bound:
+                    stats['buckets'][index] += 1
+                    break
+
+    def snapshot(self) -> dict:
+        with self._lock:
+            return {
+                key: {**stats, 'buckets': list(stats['buckets'])}
+                for key, stats in self._stats.items()}
+
+    def reset(self) -> None:
+        with self._lock:
+            self._stats = {}
+
+    def render_prometheus(self) -> str:
+        """Render the totals in the Prometheus text exposition format."""
+        totals = (
+            ('fatmug_calls_total', 'calls', 'Number of instrumented calls.'),
+            ('fatmug_queries_total', 'queries', 'SQL queries run by the calls.'),
+            ('fatmug_db_seconds_total', 'db_seconds',
+             'Seconds spent executing SQL queries.'),
+        )
+        snapshot = sorted(self.snapshot().items())
+        lines = []
+        for metric, field, help_text in totals:
+            lines += [f'# HELP {metric} {help_text}', f'# TYPE {metric} counter']
+            for (kind, name), stats in snapshot:
+                lines.append(f'{metric}{_labels(kind, name)} {stats[field]}')
+
+        metric = 'fatmug_wall_seconds'
+        lines += [
+            f'# HELP {metric} Wall time of the instrumented calls.',
+            f'# TYPE {metric} histogram']
+        for (kind, name), stats in snapshot:
+            cumulative = 0
+            for bound, count in zip(WALL_TIME_BUCKETS, stats['buckets']):
+                cumulative += count
+                lines.append(
+                    f'{metric}_bucket{_labels(kind, name, le=bound)} {cumulative}')
+            lines += [
+                f'{metric}_bucket{_labels(kind, name, le="+Inf")} {stats["calls"]}',
+                f'{metric}_sum{_labels(kind, name)} {stats["wall_seconds"]}',
+                f'{metric}_count{_labels(kind, name)} {stats["calls"]}',
+            ]
+        return '\n'.join(lines) + '\n'
+
+
+def _labels(kind, name, **extra) -> str:
+    labels = {'kind': kind, 'name': name, **extra}
+    values = ','.join(
+        '{}="{}"'.format(
+            key, str(value).replace('\\', '\\\\').replace('"', '\\"'))
+        for key, value in labels.items())
+    return '{' + values + '}'
+
+
+registry = InstrumentationRegistry()
+
+
+class Measurement:
+    """
+    Counts the queries run on this thread's database connections and the
+    time spent in them between start() and stop(), then records them in
+    the registry under `kind` and `name`. The name can be set while the
+    measurement runs, e.g. once the URL was resolved.
+    """
+
+    def __init__(self, kind, name=None):
+        self.kind = kind
+        self.name = name
+        self.queries = 0
+        self.db_time = 0.0
+        self.wall_time = 0.0
+
+    def __call__(self, execute, sql, params, many, context):
+        start = time.perf_counter()
+        try:
+            return execute(sql, params, many, context)
+        finally:
+            self.queries += 1
+            self.db_time += time.perf_counter() - start
+
+    def start(self) -> None:
+        self._connections = connections.all()
+        for connection in self._connections:
+            connection.execute_wrappers.append(self)
+        self._started = time.perf_counter()
+
+    def stop(self) -> None:
+        self.wall_time = time.perf_counter() - self._started
+        for connection in self._connections:
+            connection.execute_wrappers.remove(self)
+        registry.record(
+            self.kind, self.name, self.queries, self.db_time, self.wall_time)
+
+    def __enter__(self):
+        self.start()
+        return self
+
+    def __exit__(self, *exc_info):
+        self.stop()
+
+
+def instrumented(kind):
+    """
+    Decorator recording the queries, DB time and wall time of every call of
+    the decorated function under `kind` and the function's name.
+    """
+    def decorator(func):
+        name = f'{func.__module__}.{func.__qualname__}'
+
+        @functools.wraps(func)
+        def wrapper(*args, **kwargs):
+            if not instrumentation_enabled():
+                return func(*args, **kwargs)
+            with Measurement(kind, name):
+                return func(*args, **kwargs)
+        return wrapper
+    return decorator
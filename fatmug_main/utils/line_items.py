@@ -0,0 +1,103 @@
+# line_items.py
+from numbers import Number
+
+BATCH_SIZE = 1000
+
+# PurchaseOrder fields the PurchaseOrderItem rows are derived from
+LINE_ITEM_SOURCE_FIELDS = ('items', 'vendor_id', 'issue_date', 'quantity')
+
+SKU_MAX_LENGTH = 100
+NAME_MAX_LENGTH = 255
+
+
+def _quantity(value):
+    if isinstance(value, Number) and not isinstance(value, bool):
+        return int(value)
+    return None
+
+
+def _line(sku, name=None, quantity=None):
+    if sku is None or sku == '':
+        return None
+    return {
+        'sku': str(sku)[:SKU_MAX_LENGTH],
+        'name': str(name)[:NAME_MAX_LENGTH] if name is not None else '',
+        'quantity': _quantity(quantity),
+    }
+
+
+def _line_from_object(line):
+    return _line(line.get('sku'), line.get('name'), line.get('quantity'))
+
+
+def extract_line_items(items, quantity=None) -> list:
+    """
+    Read the lines of a purchase order's free-form `items` JSON as dicts of
+    'sku', 'name' and 'quantity'. Accepted shapes:
+
+    - a list of objects with 'sku', 'name' and 'quantity' keys, or of SKUs
+    - a single such object
+    - an object mapping SKUs to a quantity, a name or a line object,
+      e.g. {"item1": "Test Item"}
+    - a single SKU
+
+    Lines without a SKU are left out. A line without a quantity of its own
+    takes the order's `quantity` when it is the only line.
+    """
+    if isinstance(items, list):
+        lines = [
+            _line_from_object(item) if isinstance(item, dict) else _line(item)
+            for item in items]
+    elif isinstance(items, dict) and 'sku' in items:
+        lines = [_line_from_object(items)]
+    elif isinstance(items, dict):
+        lines = []
+        for sku, value in items.items():
+            if isinstance(value, dict):
+                lines.append(_line(sku, value.get('name'), value.get('quantity')))
+            elif _quantity(value) is not None:
+                lines.append(_line(sku, quantity=value))
+            else:
+                lines.append(_line(sku, name=value))
+    elif isinstance(items, (str, int)) and not isinstance(items, bool):
+        lines = [_line(items)]
+    else:
+        lines = []
+
+    lines = [line for line in lines if line is not None]
+    if len(lines) == 1 and lines[0]['quantity'] is None:
+        lines[0]['quantity'] = _quantity(quantity)
+    return lines
+
+
+def write_line_items(orders, replaced_order_ids=()) -> int:
+    """
+    Insert the PurchaseOrderItem rows of the saved `orders`, after deleting
+    the existing rows of `replaced_order_ids`. Returns the number of rows
+    written.
+    """
+    from ..models import PurchaseOrder, PurchaseOrderItem
+
+    replaced_order_ids = list(replaced_order_ids)
+    if replaced_order_ids:
+        PurchaseOrderItem.objects.filter(
+            purchase_order_id__in=replaced_order_ids).delete()
+
+    orders = list(orders)
+    # Backends that cannot return the ids of bulk inserted rows
+    unsaved = {order.po_number: order for order in orders if order.pk is None}
+    if unsaved:
+        for po_number, pk in PurchaseOrder.objects.filter(
+                po_number__in=unsaved).values_list('po_number', 'pk'):
+            unsaved[po_number].pk = pk
+
+    rows = []
+    for order in orders:
+        state = order.get_line_item_state()
+        rows.extend(
+            PurchaseOrderItem(
+                purchase_order_id=order.pk, vendor_id=state['vendor_id'],
+                issue_date=state['issue_date'], **line)
+            for line in extract_line_items(state['items'], state['quantity']))
+    PurchaseOrderItem.objects.bulk_create(rows, batch_size=BATCH_SIZE)
+    return len(rows)
@@ -1,83 +1,236 @@
 # metrics_calculator.py
-import logging
-
+from django.db import connection, transaction
+from django.db.models import (Count, DurationField, ExpressionWrapper, F, Q,
+                              Sum, Value)
+from django.db.models.functions import Now, NullIf, Round
 from django.utils import timezone
 
+from .instrumentation import instrumented
+from .performance_cache import invalidate_vendor_performance
+
+METRIC_FIELDS = (
+    'on_time_delivery_rate',
+    'quality_rating_avg',
+    'average_response_time',
+    'fulfillment_rate',
+)
+
+# Raw running totals stored on the vendor, every KPI is derived from these
+COUNTER_FIELDS = (
+    'total_po_count',
+    'completed_po_count',
+    'on_time_po_count',
+    'quality_rating_sum',
+    'quality_rating_count',
+    'acknowledged_po_count',
+    'response_time_sum',
+)
+
+# Purchase order fields a vendor's counters depend on
+ORDER_METRIC_FIELDS = (
+    'vendor_id',
+    'status',
+    'delivery_date',
+    'quality_rating',
+    'issue_date',
+    'acknowledgment_date',
+    'completion_date',
+)
+
+
+def metric_expressions(counters) -> dict:
+    """
+    Build the SQL expressions deriving the four KPIs from `counters`, a
+    mapping of counter field -> expression. A KPI is NULL while its
+    denominator is zero.
+    """
+    def ratio(numerator, denominator, scale):
+        return Round(
+            numerator * Value(scale) / NullIf(denominator, Value(0)), 2)
+
+    return {
+        'on_time_delivery_rate': ratio(
+            counters['on_time_po_count'], counters['completed_po_count'], 100.0),
+        'quality_rating_avg': ratio(
+            counters['quality_rating_sum'], counters['quality_rating_count'], 1.0),
+        # Response time is stored in minutes
+        'average_response_time': ratio(
+            counters['response_time_sum'], counters['acknowledged_po_count'], 1 / 60),
+        'fulfillment_rate': ratio(
+            counters['completed_po_count'], counters['total_po_count'], 100.0),
+    }
+
+
+def purchase_order_counters(order) -> dict:
+    """
+    Return what a single purchase order contributes to its vendor's
+    counters. `order` maps the ORDER_METRIC_FIELDS to their values.
+    """
+    counters = dict.fromkeys(COUNTER_FIELDS, 0)
+    counters['total_po_count'] = 1
+
+    if order['status'] == 'completed':
+        counters['completed_po_count'] = 1
+        completion_date = order['completion_date']
+        if completion_date is not None and (
+                timezone.localdate(completion_date)
+                <= timezone.localdate(order['delivery_date'])):
+            counters['on_time_po_count'] = 1
+        if order['quality_rating'] is not None:
+            counters['quality_rating_sum'] = order['quality_rating']
+            counters['quality_rating_count'] = 1
+
+    if order['acknowledgment_date'] is not None:
+        counters['acknowledged_po_count'] = 1
+        counters['response_time_sum'] = (
+            order['acknowledgment_date'] - order['issue_date']).total_seconds()
+    return counters
+
+
+def purchase_order_counter_deltas(previous, current) -> dict:
+    """
+    Return the counter changes per vendor id when a purchase order moves
+    from the `previous` state to the `current` one. Either side may be None
+    for a created or deleted order.
+    """
+    deltas = {}
+    for order, sign in ((previous, -1), (current, 1)):
+        if order is None:
+            continue
+        vendor_deltas = deltas.setdefault(
+            order['vendor_id'], dict.fromkeys(COUNTER_FIELDS, 0))
+        for field, value in purchase_order_counters(order).items():
+            vendor_deltas[field] += sign * value
+    return {
+        vendor_id: vendor_deltas
+        for vendor_id, vendor_deltas in deltas.items()
+        if any(vendor_deltas.values())
+    }
+
+
+@instrumented('metrics')
+def apply_vendor_counter_deltas(deltas) -> None:
+    """
+    Add `deltas` (vendor id -> counter changes) to the stored counters and
+    refresh the KPIs in the same UPDATE, so concurrent writers never
+    read-modify-write the vendor row.
+    """
+    from ..models import Vendor
+
+    with transaction.atomic(savepoint=False):
+        for vendor_id, vendor_deltas in deltas.items():
+            counters = {
+                field: F(field) + Value(vendor_deltas.get(field, 0))
+                for field in COUNTER_FIELDS
+            }
+            Vendor.objects.filter(pk=vendor_id).update(
+                **counters, **metric_expressions(counters), updated_at=Now())
+    invalidate_vendor_performance(deltas)
+
+
+def calculate_metrics(counters) -> dict:
+    """
+    Python counterpart of metric_expressions for counters that were already
+    read from the database.
+    """
+    def ratio(numerator, denominator, scale):
+        if not denominator:
+            return None
+        return round(numerator * scale / denominator, 2)
+
+    return {
+        'on_time_delivery_rate': ratio(
+            counters['on_time_po_count'], counters['completed_po_count'], 100.0),
+        'quality_rating_avg': ratio(
+            counters['quality_rating_sum'], counters['quality_rating_count'], 1.0),
+        'average_response_time': ratio(
+            counters['response_time_sum'], counters['acknowledged_po_count'], 1 / 60),
+        'fulfillment_rate': ratio(
+            counters['completed_po_count'], counters['total_po_count'], 100.0),
+    }
+
+
+@instrumented('metrics')
+def aggregate_vendor_counters(vendor_ids=None, until=None) -> dict:
+    """
+    Count the KPI counters from scratch with a single grouped aggregate over
+    the purchase orders, for every vendor in `vendor_ids` or for all vendors
+    with orders when it is None.
+
+    When `until` is given the counters are worked out as they stood at that
+    moment: only orders issued, completed or acknowledged before it count.
+
+    Returns a mapping of vendor id -> {counter field: value}. Requested
+    vendors without any purchase orders get zero for every counter.
+    """
+    from ..models import PurchaseOrder
+
+    orders = PurchaseOrder.objects.all()
+    completed = Q(status='completed')
+    acknowledged = Q(acknowledgment_date__isnull=False)
+    if vendor_ids is not None:
+        vendor_ids = set(vendor_ids)
+        orders = orders.filter(vendor_id__in=vendor_ids)
+    if until is not None:
+        orders = orders.filter(issue_date__lt=until)
+        completed &= Q(completion_date__lt=until)
+        acknowledged &= Q(acknowledgment_date__lt=until)
+
+    rows = orders.values('vendor_id').annotate(
+        total_po_count=Count('id'),
+        completed_po_count=Count('id', filter=completed),
+        on_time_po_count=Count('id', filter=completed & Q(
+            completion_date__date__lte=F('delivery_date__date'))),
+        quality_rating_sum=Sum('quality_rating', filter=completed),
+        quality_rating_count=Count('quality_rating', filter=completed),
+        acknowledged_po_count=Count('id', filter=acknowledged),
+        response_time_sum=Sum(
+            ExpressionWrapper(
+                F('acknowledgment_date') - F('issue_date'),
+                output_field=DurationField()),
+            filter=acknowledged),
+    ).order_by()
+
+    counters = {
+        vendor_id: dict.fromkeys(COUNTER_FIELDS, 0)
+        for vendor_id in vendor_ids or ()}
+    for row in rows:
+        vendor_id = row.pop('vendor_id')
+        row['quality_rating_sum'] = row['quality_rating_sum'] or 0
+        response_time_sum = row['response_time_sum']
+        row['response_time_sum'] = (
+            response_time_sum.total_seconds() if response_time_sum else 0)
+        counters[vendor_id] = row
+    return counters
+
+
+@instrumented('metrics')
+def recalculate_vendor_metrics(vendor_ids) -> dict:
+    """
+    Recount the counters of every vendor in `vendor_ids` and write them back
+    together with the derived KPIs, one UPDATE per vendor.
+
+    The recount includes every committed order, so the coalesced deltas
+    still recorded for these vendors are deleted rather than added on top.
+    It locks the vendor rows first, which waits for the orders being written
+    for them and holds off new ones until it commits, so no delta can be
+    recorded between the delete and the count. Without row locks (SQLite)
+    the delete takes the database write lock to the same effect.
+    """
+    from ..models import Vendor, VendorCounterDelta
 
-def calculate_on_time_delivery_rate(vendor, order_instance) -> float:
-    try:
-        total_completed_orders = vendor.purchaseorder_set.filter(
-            status='completed',
-        ).count() + 1
-
-        if timezone.now().date() <= order_instance.delivery_date.date():
-            if vendor.on_time_delivery_rate is None:
-                return round((1 / total_completed_orders) * 100, 2)
-            on_time_deliveries = round(
-                (vendor.on_time_delivery_rate / 100) * (total_completed_orders - 1))
-            on_time_delivery_rate = round(
-                ((on_time_deliveries + 1) / total_completed_orders) * 100, 2)
-            return on_time_delivery_rate
-        else:
-            if vendor.on_time_delivery_rate is None:
-                return 0.0
-            on_time_deliveries = round(
-                (vendor.on_time_delivery_rate / 100) * (total_completed_orders - 1))
-            on_time_delivery_rate = round(
-                ((on_time_deliveries) / total_completed_orders) * 100, 2)
-            return on_time_delivery_rate
-    except Exception as e:
-        logging.info(
-            f"An exception occured when calculating on time delivery rate : {e}")
-
-
-def calculate_quality_rating_average(vendor, order_quality_rating) -> float:
-    try:
-        completed_pos = vendor.purchaseorder_set.filter(
-            status='completed').exclude(
-            quality_rating=None).count()
-        current_quality_rating_avg = vendor.quality_rating_avg
-
-        if current_quality_rating_avg is None:
-            return order_quality_rating
-
-        new_quality_rating_avg = (
-            (current_quality_rating_avg * (completed_pos - 1)) + order_quality_rating) / completed_pos
-        return round(new_quality_rating_avg, 2)
-    except Exception as e:
-        logging.info(
-            f"An exception occured when calculating quality rating average : {e}")
-
-
-def calculate_average_response_time(vendor, order_instance) -> float:
-    try:
-        current_average_response_time = vendor.average_response_time
-        order_issue_date = order_instance.issue_date
-        order_acknowledgement_date = order_instance.acknowledgment_date
-        response_time_of_current_order = round(
-            (order_acknowledgement_date - order_issue_date).total_seconds() / 60, 2)
-
-        if current_average_response_time is None:
-            new_average_response_time = response_time_of_current_order
-            return new_average_response_time
-
-        total_acknowledged_pos = vendor.purchaseorder_set.filter(
-            acknowledgment_date__isnull=False).count()
-        new_average_response_time = ((current_average_response_time * (
-            total_acknowledged_pos - 1)) + response_time_of_current_order) / total_acknowledged_pos
-        return round(new_average_response_time, 2)
-    except Exception as e:
-        logging.info(
-            f"An exception occured when calculating average response time : {e}")
-
-
-def calculate_fulfillment_rate(vendor) -> float:
-    try:
-        completed_pos = vendor.purchaseorder_set.filter(
-            status='completed').count()
-        total_pos = vendor.purchaseorder_set.count()
-        new_fulfillment_rate = round((completed_pos / total_pos) * 100, 2)
-        return new_fulfillment_rate
-    except Exception as e:
-        logging.info(
-            f"An exception occured when calculating fulfillment rate : {e}")
+    vendor_ids = set(vendor_ids)
+    with transaction.atomic(savepoint=False):
+        if connection.features.has_select_for_update:
+            list(Vendor.objects.select_for_update().filter(
+                pk__in=vendor_ids).order_by('pk').values_list('pk', flat=True))
+        VendorCounterDelta.objects.filter(vendor_id__in=vendor_ids).delete()
+        counters = aggregate_vendor_counters(vendor_ids)
+        for vendor_id, values in counters.items():
+            expressions = {
+                field: Value(value) for field, value in values.items()}
+            Vendor.objects.filter(pk=vendor_id).update(
+                **expressions, **metric_expressions(expressions),
+                updated_at=Now())
+    invalidate_vendor_performance(counters)
+    return counters
@@ -0,0 +1,148 @@
+# metrics_coalescer.py
+import atexit
+import threading
+
+from django.conf import settings
+from django.db import connection, transaction
+from django.db.models import Value
+from django.db.models.functions import Now
+
+from .metrics_calculator import COUNTER_FIELDS, metric_expressions
+from .performance_cache import invalidate_vendor_performance
+
+
+def coalesce_window() -> float:
+    """Seconds counter deltas are held back before being written, 0 disables it."""
+    return getattr(settings, 'VENDOR_METRICS_COALESCE_WINDOW', 0)
+
+
+def pending_counter_deltas() -> dict:
+    """Sum of the recorded deltas not written yet, by vendor id."""
+    from ..models import VendorCounterDelta
+
+    return sum_counter_deltas(VendorCounterDelta.objects.values_list(
+        'vendor_id', 'deltas'))
+
+
+def sum_counter_deltas(rows) -> dict:
+    pending = {}
+    for vendor_id, deltas in rows:
+        vendor_deltas = pending.setdefault(
+            vendor_id, dict.fromkeys(COUNTER_FIELDS, 0))
+        for field, value in deltas.items():
+            vendor_deltas[field] += value
+    return pending
+
+
+def write_coalesced_deltas() -> int:
+    """
+    Add every recorded delta to its vendor's counters and delete it, in one
+    transaction. The vendor rows are locked in primary key order, so two
+    flushes never deadlock nor write the same delta twice, and every vendor
+    gets a single UPDATE of its counter and KPI columns only. Returns the
+    number of vendors written.
+    """
+    from ..models import Vendor, VendorCounterDelta
+
+    vendor_ids = set(VendorCounterDelta.objects.values_list(
+        'vendor_id', flat=True).distinct())
+    if not vendor_ids:
+        return 0
+    with transaction.atomic():
+        # No key update: orders can still record deltas meanwhile
+        rows = Vendor.objects.select_for_update(no_key=True).filter(
+            pk__in=vendor_ids).order_by('pk').values_list('pk', *COUNTER_FIELDS)
+        counters = {vendor_id: values for vendor_id, *values in rows}
+        # Read once the vendors are locked, a concurrent flush has taken
+        # the rows it wrote by then
+        recorded = list(VendorCounterDelta.objects.filter(
+            vendor_id__in=counters).values_list('id', 'vendor_id', 'deltas'))
+        deltas = sum_counter_deltas(
+            (vendor_id, vendor_deltas)
+            for _, vendor_id, vendor_deltas in recorded)
+        written = []
+        for vendor_id, vendor_deltas in sorted(deltas.items()):
+            if not any(vendor_deltas.values()):
+                continue
+            values = {
+                field: Value(value + vendor_deltas[field])
+                for field, value in zip(COUNTER_FIELDS, counters[vendor_id])
+            }
+            Vendor.objects.filter(pk=vendor_id).update(
+                **values, **metric_expressions(values), updated_at=Now())
+            written.append(vendor_id)
+        VendorCounterDelta.objects.filter(
+            id__in=[delta_id for delta_id, _, _ in recorded]).delete()
+    invalidate_vendor_performance(written)
+    return len(written)
+
+
+class VendorDeltaCoalescer:
+    """
+    Flushes the counter deltas recorded by purchase order writes, folding
+    the writes of many orders into one write per vendor. Deltas only add up,
+    so the flushed values are the same as applying every write one after
+    the other.
+
+    The deltas are rows written in the transaction of their order, so they
+    are shared by every process, never outlive a rolled back write and are
+    not lost with a killed process. A recount (recalculate_vendor_metrics)
+    locks its vendors and deletes their deltas before counting the orders
+    behind them.
+
+    The first delta committed after a flush starts a timer in its process,
+    everything recorded until it fires is written together.
+    """
+
+    def __init__(self):
+        self._lock = threading.Lock()
+        self._timer = None
+
+    def schedule(self, window) -> None:
+        with self._lock:
+            if self._timer is None:
+                self._timer = threading.Timer(window, self._flush_in_thread)
+                self._timer.daemon = True
+                self._timer.start()
+
+    def flush(self) -> int:
+        """Write every pending delta now, returns the number of vendors written."""
+        with self._lock:
+            if self._timer is not None:
+                self._timer.cancel()
+                self._timer = None
+        return write_coalesced_deltas()
+
+    def flush_scheduled(self) -> None:
+        """Flush at exit, when this process committed deltas since its last flush."""
+        if self._timer is not None:
+            self.flush()
+
+    def _flush_in_thread(self) -> None:
+        try:
+            self.flush()
+        finally:
+            # The timer thread opened its own connection
+            connection.close()
+
+
+coalescer = VendorDeltaCoalescer()
+atexit.register(coalescer.flush_scheduled)
+
+
+def coalesce_counter_deltas(deltas) -> None:
+    """
+    Record `deltas` in the current transaction, and have them written once
+    it commits, so rolled back writes never reach the vendor counters.
+    """
+    from ..models import VendorCounterDelta
+
+    VendorCounterDelta.objects.bulk_create(
+        VendorCounterDelta(vendor_id=vendor_id, deltas=vendor_deltas)
+        for vendor_id, vendor_deltas in deltas.items())
+    window = coalesce_window()
+    transaction.on_commit(lambda: coalescer.schedule(window))
+
+
+def flush_coalesced_deltas() -> int:
+    return coalescer.flush()
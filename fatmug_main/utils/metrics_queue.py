@@ -0,0 +1,148 @@
+# metrics_queue.py
+from concurrent.futures import ProcessPoolExecutor, ThreadPoolExecutor
+
+from django.conf import settings
+from django.db import connections
+from django.db.models import Count, Min
+from django.utils import timezone
+
+from .metrics_calculator import (apply_vendor_counter_deltas,
+                                 recalculate_vendor_metrics)
+from .metrics_coalescer import coalesce_counter_deltas, coalesce_window
+
+BATCH_SIZE = 500
+
+
+def metrics_queue_enabled() -> bool:
+    return getattr(settings, 'METRICS_QUEUE_ENABLED', False)
+
+
+def enqueue_vendor_metrics(vendor_ids) -> None:
+    from ..models import MetricsQueueEntry
+
+    MetricsQueueEntry.objects.bulk_create(
+        MetricsQueueEntry(vendor_id=vendor_id) for vendor_id in set(vendor_ids))
+
+
+def record_counter_deltas(deltas) -> None:
+    """
+    Apply the counter `deltas` (vendor id -> counter changes) right away,
+    leave the vendors to the queue worker when the queue is enabled, or fold
+    them into the next coalesced write when a coalescing window is set.
+    """
+    if not deltas:
+        return
+    if metrics_queue_enabled():
+        enqueue_vendor_metrics(deltas)
+    elif coalesce_window():
+        coalesce_counter_deltas(deltas)
+    else:
+        apply_vendor_counter_deltas(deltas)
+
+
+def schedule_vendor_metrics(vendor_ids) -> None:
+    """
+    Recount the metrics of `vendor_ids` right away, or leave them to the
+    queue worker when the queue is enabled.
+    """
+    if not vendor_ids:
+        return
+    if metrics_queue_enabled():
+        enqueue_vendor_metrics(vendor_ids)
+    else:
+        recalculate_vendor_metrics(vendor_ids)
+
+
+def queue_stats() -> dict:
+    """
+    Return the number of queued entries, the distinct vendors among them and
+    how many seconds the oldest entry has been waiting.
+    """
+    from ..models import MetricsQueueEntry
+
+    stats = MetricsQueueEntry.objects.aggregate(
+        depth=Count('id'),
+        vendors=Count('vendor_id', distinct=True),
+        oldest_enqueued_at=Min('enqueued_at'),
+    )
+    oldest_enqueued_at = stats.pop('oldest_enqueued_at')
+    stats['delay_seconds'] = (
+        (timezone.now() - oldest_enqueued_at).total_seconds()
+        if oldest_enqueued_at else 0.0)
+    return stats
+
+
+def recount_all_vendors(batch_size=BATCH_SIZE) -> int:
+    """
+    Recount the metrics of every vendor from its purchase orders,
+    `batch_size` vendors at a time. Returns the number of vendors.
+    """
+    from ..models import Vendor
+
+    vendor_ids = list(Vendor.objects.order_by('pk').values_list('pk', flat=True))
+    for start in range(0, len(vendor_ids), batch_size):
+        recalculate_vendor_metrics(vendor_ids[start:start + batch_size])
+    return len(vendor_ids)
+
+
+def _recalculate_vendor_chunk(vendor_ids) -> int:
+    try:
+        recalculate_vendor_metrics(vendor_ids)
+    finally:
+        # Pool workers open their own connections, do not leak them
+        connections.close_all()
+    return len(vendor_ids)
+
+
+def _chunks(items, count):
+    items = sorted(items)
+    size = -(-len(items) // count)
+    return [items[i:i + size] for i in range(0, len(items), size)]
+
+
+def drain_metrics_queue(batch_size=BATCH_SIZE, workers=1, pool='thread') -> dict:
+    """
+    Process the queue until it is empty, `batch_size` entries at a time.
+
+    The entries of a batch are merged into one recount per vendor, spread
+    over `workers` threads or processes. An entry is only deleted after its
+    vendor was recounted, together with every older entry of that vendor,
+    so nothing enqueued while a batch runs is lost.
+
+    Returns the number of entries and distinct vendors processed.
+    """
+    from ..models import MetricsQueueEntry
+
+    processed = {'entries': 0, 'vendors': 0}
+    executor = None
+    if workers > 1:
+        if pool == 'process':
+            # Forked workers must not share the parent's connections
+            connections.close_all()
+            executor = ProcessPoolExecutor(max_workers=workers)
+        else:
+            executor = ThreadPoolExecutor(max_workers=workers)
+
+    try:
+        while True:
+            batch = list(MetricsQueueEntry.objects.order_by('id').values_list(
+                'id', 'vendor_id')[:batch_size])
+            if not batch:
+                break
+            last_id = batch[-1][0]
+            vendor_ids = {vendor_id for _, vendor_id in batch}
+
+            if executor is None:
+                recalculate_vendor_metrics(vendor_ids)
+            else:
+                list(executor.map(
+                    _recalculate_vendor_chunk, _chunks(vendor_ids, workers)))
+
+            deleted, _ = MetricsQueueEntry.objects.filter(
+                id__lte=last_id, vendor_id__in=vendor_ids).delete()
+            processed['entries'] += deleted
+            processed['vendors'] += len(vendor_ids)
+    finally:
+        if executor is not None:
+            executor.shutdown()
+    return processed
@@ -0,0 +1,86 @@
+# performance_cache.py
+import hashlib
+import json
+
+from django.conf import settings
+from django.core.cache import cache
+from django.db import transaction
+
+
+def vendor_performance_key(vendor_id) -> str:
+    return f'vendor-performance:{vendor_id}'
+
+
+def build_vendor_performance(vendor) -> dict:
+    """
+    Build the cache entry of a vendor from its 'name', 'updated_at' and
+    metric values.
+    """
+    from ..serializers import VendorPerformanceSerializer
+
+    vendor = dict(vendor)
+    updated_at = vendor.pop('updated_at')
+    data = VendorPerformanceSerializer(
+        {'vendor_name': vendor.pop('name'), **vendor}).data
+    return {
+        'data': data,
+        'etag': hashlib.md5(
+            json.dumps(data, sort_keys=True).encode()).hexdigest(),
+        'last_modified': int(updated_at.timestamp()),
+    }
+
+
+def get_vendor_performance(vendor_id):
+    """
+    Read-through cache of the performance endpoint of a vendor.
+
+    Returns a dict with the serialized 'data', its 'etag' and the
+    'last_modified' timestamp of the vendor, or None when the vendor does
+    not exist. On a miss the entry is built from a single query.
+    """
+    from ..models import Vendor
+    from .metrics_calculator import METRIC_FIELDS
+
+    key = vendor_performance_key(vendor_id)
+    entry = cache.get(key)
+    if entry is not None:
+        return entry
+
+    vendor = Vendor.objects.filter(pk=vendor_id).values(
+        'name', 'updated_at', *METRIC_FIELDS).first()
+    if vendor is None:
+        return None
+
+    entry = build_vendor_performance(vendor)
+    cache.set(key, entry, settings.VENDOR_PERFORMANCE_CACHE_TIMEOUT)
+    return entry
+
+
+async def aget_vendor_performance(vendor_id):
+    """Async counterpart of get_vendor_performance."""
+    from ..models import Vendor
+    from .metrics_calculator import METRIC_FIELDS
+
+    key = vendor_performance_key(vendor_id)
+    entry = await cache.aget(key)
+    if entry is not None:
+        return entry
+
+    vendor = await Vendor.objects.filter(pk=vendor_id).values(
+        'name', 'updated_at', *METRIC_FIELDS).afirst()
+    if vendor is None:
+        return None
+
+    entry = build_vendor_performance(vendor)
+    await cache.aset(key, entry, settings.VENDOR_PERFORMANCE_CACHE_TIMEOUT)
+    return entry
+
+
+def invalidate_vendor_performance(vendor_ids) -> None:
+    keys = [vendor_performance_key(vendor_id) for vendor_id in vendor_ids]
+    if not keys:
+        return
+    cache.delete_many(keys)
+    # Deleting again once the transaction commits drops any entry that a
+    # concurrent request refilled from the state before this transaction
+    transaction.on_commit(lambda: cache.delete_many(keys))
@@ -0,0 +1,73 @@
+# performance_history.py
+from datetime import datetime, time, timedelta
+
+from django.utils import timezone
+
+from .metrics_calculator import (METRIC_FIELDS, aggregate_vendor_counters,
+                                 calculate_metrics)
+
+BATCH_SIZE = 1000
+
+
+def snapshot_datetime(day) -> datetime:
+    # Snapshots are stored at the start of their day in the current timezone
+    return timezone.make_aware(datetime.combine(day, time.min))
+
+
+def _save_snapshots(day, metrics_by_vendor, batch_size) -> int:
+    from ..models import HistoricalPerformance
+
+    date = snapshot_datetime(day)
+    snapshots = [
+        HistoricalPerformance(vendor_id=vendor_id, date=date, **metrics)
+        for vendor_id, metrics in metrics_by_vendor
+    ]
+    # Upserting on (vendor, date) makes re-running a day safe
+    HistoricalPerformance.objects.bulk_create(
+        snapshots,
+        batch_size=batch_size,
+        update_conflicts=True,
+        unique_fields=['vendor', 'date'],
+        update_fields=METRIC_FIELDS,
+    )
+    return len(snapshots)
+
+
+def snapshot_current_performance(day=None, batch_size=BATCH_SIZE) -> int:
+    """
+    Store every vendor's current metrics as the snapshot of `day` (today by
+    default). Returns the number of snapshots written.
+    """
+    from ..models import Vendor
+
+    day = day or timezone.localdate()
+    vendors = Vendor.objects.values_list('id', *METRIC_FIELDS).order_by()
+    written = 0
+    batch = []
+    for vendor_id, *metrics in vendors.iterator(chunk_size=batch_size):
+        batch.append((vendor_id, dict(zip(METRIC_FIELDS, metrics))))
+        if len(batch) == batch_size:
+            written += _save_snapshots(day, batch, batch_size)
+            batch = []
+    if batch:
+        written += _save_snapshots(day, batch, batch_size)
+    return written
+
+
+def backfill_performance(start, end, batch_size=BATCH_SIZE) -> int:
+    """
+    Rebuild the snapshots of every day from `start` to `end` (inclusive)
+    from the purchase order history, with one grouped aggregate per day
+    covering all vendors. Returns the number of snapshots written.
+    """
+    written = 0
+    day = start
+    while day <= end:
+        counters = aggregate_vendor_counters(
+            until=snapshot_datetime(day + timedelta(days=1)))
+        written += _save_snapshots(day, [
+            (vendor_id, calculate_metrics(vendor_counters))
+            for vendor_id, vendor_counters in counters.items()
+        ], batch_size)
+        day += timedelta(days=1)
+    return written
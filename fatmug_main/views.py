@@ -1,23 +1,110 @@
+from collections.abc import Iterator
+
+from django.db.models import Avg, Count, F, Max, Min, Sum
+from django.db.models.functions import Trunc
+from django.http import StreamingHttpResponse
 from django.utils import timezone
+from django.utils.cache import get_conditional_response
+from django.utils.http import http_date, quote_etag
 from rest_framework import filters, generics, status
-from rest_framework.authentication import TokenAuthentication
-from rest_framework.exceptions import NotFound
+from rest_framework.exceptions import NotFound, ParseError, ValidationError
+from rest_framework.parsers import JSONParser
 from rest_framework.permissions import IsAuthenticated
 from rest_framework.response import Response
 from rest_framework.views import APIView
 
-from .models import HistoricalPerformance, PurchaseOrder, Vendor
+from .filters import (LineItemFilter, MetricOrderingFilter,
+                      MetricRangeFilter, PrefixSearchFilter,
+                      PurchaseOrderFilter, parse_datetime_param,
+                      parse_fields_param)
+from .models import (HistoricalPerformance, PurchaseOrder, PurchaseOrderItem,
+                     Vendor)
+from .pagination import (ItemSummaryPagination, ItemVendorPagination,
+                         PerformanceHistoryPagination,
+                         PurchaseOrderPagination, VendorLeaderboardPagination,
+                         VendorPagination)
+from .parsers import NDJSONParser
+from .renderers import CSVRenderer, NDJSONRenderer, PrometheusRenderer
+from .routers import read_only
 from .serializers import (AcknowledgePurchaseOrderSerializer,
-                          HistoricalPerformanceSerializer,
-                          PurchaseOrderSerializer, VendorPerformanceSerializer,
-                          VendorSerializer)
+                          BulkAcknowledgePurchaseOrderSerializer,
+                          ItemSummarySerializer, ItemVendorSerializer,
+                          PerformanceHistoryBucketSerializer,
+                          PurchaseOrderSerializer, ValuesSerializer,
+                          VendorLeaderboardSerializer,
+                          VendorPerformanceSerializer, VendorSerializer)
+from .utils.bulk_acknowledge import acknowledge_purchase_orders
+from .utils.bulk_ingest import ingest_purchase_orders
+from .utils.exporter import EXPORT_MODELS, export_rows
+from .utils.instrumentation import instrumentation_enabled, registry
+from .utils.metrics_calculator import METRIC_FIELDS
+from .utils.performance_cache import get_vendor_performance
+
+
+class ReadReplicaMixin:
+    """
+    Serves the GET requests of the view from the 'replica' database when one
+    is configured, see ReadReplicaRouter. Not used by the views that fill a
+    cache, which could keep a lagging replica's data long after it caught up.
+    """
+
+    def dispatch(self, request, *args, **kwargs):
+        if request.method not in ('GET', 'HEAD'):
+            return super().dispatch(request, *args, **kwargs)
+        with read_only():
+            return super().dispatch(request, *args, **kwargs)
+
+
+class SparseFieldsetMixin:
+    """
+    Lets GET requests narrow the serialized fields with '?fields=a,b'. Only
+    the requested columns, plus the view's `required_fields`, are selected.
+    """
+    required_fields = ('id',)
+
+    def get_requested_fields(self):
+        # Schema generation inspects the view without a real request
+        if getattr(self, 'swagger_fake_view', False) or self.request.method != 'GET':
+            return None
+        return parse_fields_param(self.request, self.get_serializer_class())
+
+    def get_serializer(self, *args, **kwargs):
+        kwargs.setdefault('fields', self.get_requested_fields())
+        return super().get_serializer(*args, **kwargs)
+
+    def filter_queryset(self, queryset):
+        queryset = super().filter_queryset(queryset)
+        fields = self.get_requested_fields()
+        if fields is not None:
+            queryset = queryset.only(*fields, *self.required_fields)
+        return queryset
+
+
+class ValuesListMixin:
+    """
+    Serves GET lists from `values_list()` rows with a ValuesSerializer
+    built from the view's serializer, instead of model instances. The
+    response body is the same. The view's `required_fields` are selected
+    too, for the pagination cursor.
+    """
+
+    def list(self, request, *args, **kwargs) -> Response:
+        serializer = ValuesSerializer(self.get_serializer())
+        queryset = serializer.values_list(
+            self.filter_queryset(self.get_queryset()), *self.required_fields)
+        page = self.paginate_queryset(queryset)
+        if page is None:
+            return Response(serializer.to_representation(queryset))
+        return self.get_paginated_response(serializer.to_representation(page))
 
 
-class VendorListCreateView(generics.ListCreateAPIView):
+class VendorListCreateView(
+        ReadReplicaMixin, SparseFieldsetMixin, ValuesListMixin,
+        generics.ListCreateAPIView):
     """
     API endpoint for listing and creating vendors.
 
-    - GET: Retrieve a list of all vendors.
+    - GET: Retrieve a page of vendors, optionally searched and filtered.
     - POST: Create a new vendor.
 
     Authentication:
@@ -28,6 +115,7 @@ class VendorListCreateView(generics.ListCreateAPIView):
 
     Serializer:
     - VendorSerializer: Used for both serialization and deserialization of Vendor objects.
+      Pages are serialized from value rows with a ValuesSerializer built from it.
 
     Fields:
     - name (str): The name of the vendor.
@@ -39,14 +127,34 @@ class VendorListCreateView(generics.ListCreateAPIView):
     - average_response_time (float, optional): Average response time in minutes.
     - fulfillment_rate (float, optional): Fulfillment rate.
 
+    Query Parameters:
+    - search (str, optional): Case-sensitive prefix of the name or vendor code, e.g.
+      '?search=Acme'. Both columns are indexed.
+    - <metric>__lt, <metric>__lte, <metric>__gt, <metric>__gte (float, optional):
+      KPI threshold filters, for example '?fulfillment_rate__gte=90'.
+    - fields (str, optional): Limits the response (and the columns read) to a comma
+      separated list of fields, e.g. '?fields=id,name,vendor_code,fulfillment_rate'.
+    - page_size (int, optional): Number of vendors per page, at most 1000.
+    - cursor (str, optional): Cursor of the page to retrieve, taken from 'next' or 'previous'.
+
+    Pagination:
+    - Results are cursor paginated in id order.
+
+    Raises:
+    - ValidationError: If a threshold is not a number or a field name is invalid.
+
     """
-    authentication_classes = [TokenAuthentication]
     permission_classes = [IsAuthenticated]
     queryset = Vendor.objects.all()
     serializer_class = VendorSerializer
+    pagination_class = VendorPagination
+    filter_backends = [PrefixSearchFilter, MetricRangeFilter]
+    prefix_search_fields = ('name', 'vendor_code')
+    metric_filter_fields = METRIC_FIELDS
 
 
-class VendorRetrieveUpdateDeleteView(generics.RetrieveUpdateDestroyAPIView):
+class VendorRetrieveUpdateDeleteView(
+        ReadReplicaMixin, generics.RetrieveUpdateDestroyAPIView):
     """
     API endpoint for retrieving, updating, and deleting a specific vendor.
 
@@ -80,7 +188,6 @@ class VendorRetrieveUpdateDeleteView(generics.RetrieveUpdateDestroyAPIView):
 
     Note: Additional fields may be included based on your specific requirements.
     """
-    authentication_classes = [TokenAuthentication]
     permission_classes = [IsAuthenticated]
     queryset = Vendor.objects.all()
     serializer_class = VendorSerializer
@@ -107,6 +214,12 @@ class VendorPerformanceView(generics.RetrieveAPIView):
     Raises:
     - NotFound: If the specified vendor does not exist.
 
+    Caching:
+    - Responses are served from a per-vendor cache that is dropped whenever the
+      vendor's metrics change.
+    - Responses carry ETag and Last-Modified headers. Requests with a matching
+      If-None-Match or If-Modified-Since header get an empty 304 response.
+
     Note: This endpoint does not support updating or deleting vendor performance data.
 
     """
@@ -114,21 +227,146 @@ class VendorPerformanceView(generics.RetrieveAPIView):
     queryset = Vendor.objects.all()
 
     def retrieve(self, request, *args, **kwargs) -> Response:
-        instance = self.get_object()
+        vendor_id = kwargs['pk']
+        performance = get_vendor_performance(vendor_id)
+        if performance is None:
+            raise NotFound(f"Vendor {vendor_id} not found.")
+
+        etag = quote_etag(performance['etag'])
+        last_modified = performance['last_modified']
+        response = get_conditional_response(
+            request, etag=etag, last_modified=last_modified)
+        if response is None:
+            response = Response(performance['data'])
+        response['ETag'] = etag
+        response['Last-Modified'] = http_date(last_modified)
+        return response
+
+
+class VendorLeaderboardView(ReadReplicaMixin, generics.ListAPIView):
+    """
+    API endpoint for ranking vendors by their performance metrics.
+
+    - GET: Retrieve vendors sorted and filtered by their performance metrics.
+
+    Authentication:
+    - Token-based authentication is required.
+
+    Permissions:
+    - Users must be authenticated to access this endpoint.
+
+    Serializer:
+    - VendorLeaderboardSerializer: The VendorPerformanceSerializer fields plus 'vendor_id'.
+
+    Query Parameters:
+    - ordering (str, optional): Comma separated metric fields to sort by, prefixed
+      with '-' for descending order. For example '?ordering=-on_time_delivery_rate,average_response_time'.
+      Defaults to '-on_time_delivery_rate'.
+    - <metric>__lt, <metric>__lte, <metric>__gt, <metric>__gte (float, optional):
+      Threshold filters, for example '?fulfillment_rate__lt=80'.
+    - page_size (int, optional): Number of vendors per page, at most 1000.
+    - cursor (str, optional): Cursor of the page to retrieve, taken from 'next' or 'previous'.
+
+    Metrics:
+    - on_time_delivery_rate, quality_rating_avg, average_response_time, fulfillment_rate
+
+    Note: Vendors without a value for one of the ordering metrics are not ranked.
+    Vendors with the same metrics are ranked by id. Each metric column is indexed,
+    so a page is read with a single query.
+
+    Raises:
+    - ValidationError: If a threshold is not a number.
 
-        performance_data = {
-            'vendor_name': instance.name,
-            'on_time_delivery_rate': instance.on_time_delivery_rate,
-            'quality_rating_avg': instance.quality_rating_avg,
-            'average_response_time': instance.average_response_time,
-            'fulfillment_rate': instance.fulfillment_rate
-        }
+    """
+    permission_classes = [IsAuthenticated]
+    serializer_class = VendorLeaderboardSerializer
+    pagination_class = VendorLeaderboardPagination
+    filter_backends = [MetricOrderingFilter, MetricRangeFilter]
+    ordering_fields = METRIC_FIELDS
+    ordering = '-on_time_delivery_rate'
+    metric_filter_fields = METRIC_FIELDS
 
-        serializer = self.get_serializer(performance_data)
-        return Response(serializer.data)
+    def get_queryset(self):
+        # 'id' is read by the pagination cursor
+        return Vendor.objects.annotate(
+            vendor_id=F('id'), vendor_name=F('name'),
+        ).values('id', 'vendor_id', 'vendor_name', *METRIC_FIELDS)
 
 
-class PurchaseOrderListCreateView(generics.ListCreateAPIView):
+class VendorPerformanceHistoryView(ReadReplicaMixin, generics.ListAPIView):
+    """
+    API endpoint for retrieving the performance history of a specific vendor.
+
+    - GET: Retrieve the daily performance snapshots of a vendor, averaged per time bucket.
+
+    Authentication:
+    - Token-based authentication is required.
+
+    Permissions:
+    - Users must be authenticated to access this endpoint.
+
+    Serializer:
+    - PerformanceHistoryBucketSerializer: Used for serialization of the averaged buckets.
+
+    Query Parameters:
+    - from (date or datetime, optional): Only include snapshots from this moment on.
+    - to (date or datetime, optional): Only include snapshots up to this moment.
+    - bucket (str, optional): Size of the time buckets, one of 'day', 'week' or 'month'.
+      Defaults to 'day'.
+    - page_size (int, optional): Number of buckets per page, at most 1000.
+    - cursor (str, optional): Cursor of the page to retrieve, taken from 'next' or 'previous'.
+
+    Bucket Fields:
+    - bucket (datetime): Start of the time bucket.
+    - on_time_delivery_rate (float, optional): Average rate of on-time deliveries.
+    - quality_rating_avg (float, optional): Average quality rating.
+    - average_response_time (float, optional): Average response time in minutes.
+    - fulfillment_rate (float, optional): Average fulfillment rate.
+    - samples (int): Number of daily snapshots in the bucket.
+
+    Note: The averaging is done by the database, only one row per bucket is loaded.
+
+    Raises:
+    - NotFound: If the specified vendor does not exist.
+    - ValidationError: If a query parameter is invalid.
+
+    """
+    permission_classes = [IsAuthenticated]
+    serializer_class = PerformanceHistoryBucketSerializer
+    pagination_class = PerformanceHistoryPagination
+    bucket_kinds = ('day', 'week', 'month')
+
+    def get_queryset(self):
+        if getattr(self, 'swagger_fake_view', False):
+            return HistoricalPerformance.objects.none()
+        vendor_id = self.kwargs['pk']
+        if not Vendor.objects.filter(pk=vendor_id).exists():
+            raise NotFound(f"Vendor {vendor_id} not found.")
+
+        bucket = self.request.query_params.get('bucket', 'day')
+        if bucket not in self.bucket_kinds:
+            raise ValidationError(
+                {'bucket': [f"Expected one of {', '.join(self.bucket_kinds)}."]})
+
+        queryset = HistoricalPerformance.objects.filter(vendor_id=vendor_id)
+        start = parse_datetime_param(self.request, 'from')
+        end = parse_datetime_param(self.request, 'to')
+        if start is not None:
+            queryset = queryset.filter(date__gte=start)
+        if end is not None:
+            queryset = queryset.filter(date__lte=end)
+
+        return queryset.annotate(
+            bucket=Trunc('date', bucket),
+        ).values('bucket').annotate(
+            samples=Count('id'),
+            **{field: Avg(field) for field in METRIC_FIELDS},
+        )
+
+
+class PurchaseOrderListCreateView(
+        ReadReplicaMixin, SparseFieldsetMixin, ValuesListMixin,
+        generics.ListCreateAPIView):
     """
     API endpoint for listing and creating purchase orders.
 
@@ -143,6 +381,7 @@ class PurchaseOrderListCreateView(generics.ListCreateAPIView):
 
     Serializer:
     - PurchaseOrderSerializer: Used for both serialization and deserialization of PurchaseOrder objects.
+      Pages are serialized from value rows with a ValuesSerializer built from it.
 
     Fields:
     - po_number (str): The purchase order number (unique).
@@ -159,33 +398,96 @@ class PurchaseOrderListCreateView(generics.ListCreateAPIView):
     Filtering:
     - The purchase orders can be filtered based on the 'vendor_id' query parameter.
       For example, '/purchase-orders/?vendor_id=1' will retrieve purchase orders for the vendor with ID 1.
+    - 'status' filters by status, 'from' and 'to' (ISO 8601 date or datetime) by issue date.
+
+    Pagination:
+    - Results are cursor paginated in (issue_date, id) order. 'page_size' sets the
+      number of orders per page (at most 1000), 'next' and 'previous' link to the
+      neighbouring pages.
+
+    Field Selection:
+    - 'fields' limits the response (and the columns read) to a comma separated list
+      of fields, e.g. '?fields=id,po_number,status' to skip the 'items' JSON.
 
     Raises:
     - NotFound: If no purchase orders are found for the specified vendor.
+    - ValidationError: If a filter or field name is invalid.
 
     """
-    authentication_classes = [TokenAuthentication]
     permission_classes = [IsAuthenticated]
     serializer_class = PurchaseOrderSerializer
-    filter_backends = [filters.SearchFilter]
+    pagination_class = PurchaseOrderPagination
+    filter_backends = [PurchaseOrderFilter, filters.SearchFilter]
     # Doube underscore here 'vendor__id'
     # it indicates that you want to filter or search based on the id field of
     # the related vendor model.
     search_fields = ['vendor__id']
+    # Always loaded, the cursor is built from them
+    required_fields = ('id', 'issue_date')
 
     def get_queryset(self) -> PurchaseOrder:
-        queryset = PurchaseOrder.objects.all()
-        vendor_id = self.request.query_params.get('vendor_id', None)
-        if vendor_id:
-            queryset = queryset.filter(vendor__id=vendor_id)
-        if not queryset.exists():
+        return PurchaseOrder.objects.all()
+
+    def list(self, request, *args, **kwargs) -> Response:
+        response = super().list(request, *args, **kwargs)
+        # Checked on the fetched page rather than with a separate exists() query
+        if (request.query_params.get('vendor_id')
+                and not request.query_params.get('cursor')
+                and not response.data['results']):
             raise NotFound(
                 "No purchase orders found for the specified vendor.")
-        return queryset
+        return response
+
+
+class PurchaseOrderBulkUpsertView(APIView):
+    """
+    API endpoint for creating or updating purchase orders in bulk.
+
+    - POST: Create or update many purchase orders in a single request.
+
+    Authentication:
+    - Token-based authentication is required.
+
+    Permissions:
+    - Users must be authenticated to access this endpoint.
+
+    Request Body:
+    - A JSON array of purchase orders ('application/json'), or one purchase order
+      per line ('application/x-ndjson'). Each row has the same fields as
+      PurchaseOrderSerializer.
+
+    Upserting:
+    - Rows are matched to existing purchase orders by 'po_number'. Existing orders
+      are partially updated, new ones are created.
+    - Rows are validated and written in batches. Vendor metrics are recalculated
+      once per affected vendor after the last batch.
+
+    Returns:
+    - Response: The number of created and updated orders and the errors per row.
+      The status is 207 when some of the rows were rejected.
+
+    Raises:
+    - ParseError: If the request body is not an array or stream of purchase orders.
+
+    """
+    permission_classes = [IsAuthenticated]
+    parser_classes = [JSONParser, NDJSONParser]
+
+    def post(self, request, *args, **kwargs) -> Response:
+        rows = request.data
+        if not isinstance(rows, (list, Iterator)):
+            raise ParseError(
+                "Expected a JSON array or NDJSON stream of purchase orders.")
+
+        result = ingest_purchase_orders(rows)
+        response_status = (
+            status.HTTP_207_MULTI_STATUS if result['errors']
+            else status.HTTP_200_OK)
+        return Response(result, status=response_status)
 
 
 class PurchaseOrderRetrieveUpdateDeleteView(
-        generics.RetrieveUpdateDestroyAPIView):
+        ReadReplicaMixin, generics.RetrieveUpdateDestroyAPIView):
     """
     API endpoint for retrieving, updating, and deleting a specific purchase order.
 
@@ -221,7 +523,6 @@ class PurchaseOrderRetrieveUpdateDeleteView(
     - NotFound: If the specified purchase order does not exist.
 
     """
-    authentication_classes = [TokenAuthentication]
     permission_classes = [IsAuthenticated]
     queryset = PurchaseOrder.objects.all()
     serializer_class = PurchaseOrderSerializer
@@ -271,7 +572,6 @@ class AcknowledgePurchaseOrderView(APIView):
     - NotFound: If the specified purchase order does not exist.
 
     """
-    authentication_classes = [TokenAuthentication]
     permission_classes = [IsAuthenticated]
     serializer_class = AcknowledgePurchaseOrderSerializer
 
@@ -303,3 +603,236 @@ class AcknowledgePurchaseOrderView(APIView):
         instance.save()
         return Response(
             {'detail': f'Purchase Order {po_id} acknowledged successfully.'}, status=status.HTTP_200_OK)
+
+
+class BulkAcknowledgePurchaseOrderView(APIView):
+    """
+    API endpoint for acknowledging many purchase orders at once.
+
+    - POST: Acknowledge the purchase orders listed in 'ids'.
+
+    Authentication:
+    - Token-based authentication is required.
+
+    Permissions:
+    - Users must be authenticated to access this endpoint.
+
+    Serializer:
+    - BulkAcknowledgePurchaseOrderSerializer: 'ids' is a list of up to 1000 purchase
+      order ids.
+
+    Acknowledging:
+    - All orders get the same acknowledgment date in a single UPDATE. Orders that
+      were acknowledged before keep their date.
+    - The average response time of each affected vendor is updated once, from an
+      aggregate over its newly acknowledged orders.
+
+    Returns:
+    - Response: The number of acknowledged orders and, per id, one of 'acknowledged',
+      'already_acknowledged' or 'not_found'. The status is 207 when some of the ids
+      were not found.
+
+    Raises:
+    - ValidationError: If 'ids' is missing, empty, too long or not a list of ids.
+
+    """
+    permission_classes = [IsAuthenticated]
+    serializer_class = BulkAcknowledgePurchaseOrderSerializer
+
+    def post(self, request, *args, **kwargs) -> Response:
+        serializer = self.serializer_class(data=request.data)
+        serializer.is_valid(raise_exception=True)
+
+        result = acknowledge_purchase_orders(serializer.validated_data['ids'])
+        response_status = (
+            status.HTTP_207_MULTI_STATUS
+            if any(row['status'] == 'not_found' for row in result['results'])
+            else status.HTTP_200_OK)
+        return Response(result, status=response_status)
+
+
+class ItemSummaryView(ReadReplicaMixin, generics.ListAPIView):
+    """
+    API endpoint for the ordered quantities per item and vendor.
+
+    - GET: Retrieve the line item totals grouped by vendor and SKU.
+
+    Authentication:
+    - Token-based authentication is required.
+
+    Permissions:
+    - Users must be authenticated to access this endpoint.
+
+    Serializer:
+    - ItemSummarySerializer: Used for serialization of the totals.
+
+    Query Parameters:
+    - vendor_id (int, optional): Only include the items of this vendor.
+    - sku (str, optional): Only include this item.
+    - from (date or datetime, optional): Only include orders issued from this moment on.
+    - to (date or datetime, optional): Only include orders issued up to this moment.
+    - page_size (int, optional): Number of rows per page, at most 1000.
+    - cursor (str, optional): Cursor of the page to retrieve, taken from 'next' or 'previous'.
+
+    Row Fields:
+    - vendor_id (int), sku (str)
+    - order_count (int): Number of purchase orders with the item.
+    - total_quantity (int, optional): Sum of the ordered quantities.
+    - last_issue_date (datetime): Issue date of the latest of these orders.
+
+    Note: The totals are aggregated by the database over the indexed
+    PurchaseOrderItem rows, the 'items' JSON of the orders is not read.
+
+    Raises:
+    - ValidationError: If a query parameter is invalid.
+
+    """
+    permission_classes = [IsAuthenticated]
+    serializer_class = ItemSummarySerializer
+    pagination_class = ItemSummaryPagination
+    filter_backends = [LineItemFilter]
+
+    def get_queryset(self):
+        return PurchaseOrderItem.objects.values('vendor_id', 'sku').annotate(
+            order_count=Count('purchase_order', distinct=True),
+            total_quantity=Sum('quantity'),
+            last_issue_date=Max('issue_date'),
+        )
+
+
+class ItemVendorListView(ReadReplicaMixin, generics.ListAPIView):
+    """
+    API endpoint for the vendors that supplied an item.
+
+    - GET: Retrieve the vendors with purchase orders for a SKU, with their totals.
+
+    Authentication:
+    - Token-based authentication is required.
+
+    Permissions:
+    - Users must be authenticated to access this endpoint.
+
+    Serializer:
+    - ItemVendorSerializer: Used for serialization of the vendor totals.
+
+    Query Parameters:
+    - from (date or datetime, optional): Only include orders issued from this moment on,
+      e.g. '?from=2024-01-01&to=2024-03-31' for a quarter.
+    - to (date or datetime, optional): Only include orders issued up to this moment.
+    - page_size (int, optional): Number of vendors per page, at most 1000.
+    - cursor (str, optional): Cursor of the page to retrieve, taken from 'next' or 'previous'.
+
+    Row Fields:
+    - vendor_id (int), vendor_name (str)
+    - order_count (int): Number of purchase orders with the item.
+    - total_quantity (int, optional): Sum of the ordered quantities.
+    - first_issue_date, last_issue_date (datetime): Issue dates of the first and latest
+      of these orders.
+
+    Raises:
+    - ValidationError: If a query parameter is invalid.
+
+    """
+    permission_classes = [IsAuthenticated]
+    serializer_class = ItemVendorSerializer
+    pagination_class = ItemVendorPagination
+    filter_backends = [LineItemFilter]
+
+    def get_queryset(self):
+        return PurchaseOrderItem.objects.filter(
+            sku=self.kwargs.get('sku'),
+        ).annotate(
+            vendor_name=F('vendor__name'),
+        ).values('vendor_id', 'vendor_name').annotate(
+            order_count=Count('purchase_order', distinct=True),
+            total_quantity=Sum('quantity'),
+            first_issue_date=Min('issue_date'),
+            last_issue_date=Max('issue_date'),
+        )
+
+
+class ExportView(ReadReplicaMixin, APIView):
+    """
+    API endpoint for exporting all purchase orders or vendors.
+
+    - GET: Stream every row of a dataset as NDJSON or CSV.
+
+    Authentication:
+    - Token-based authentication is required.
+
+    Permissions:
+    - Users must be authenticated to access this endpoint.
+
+    Parameters:
+    - dataset (str): Either 'purchase_orders' or 'vendors'.
+
+    Query Parameters:
+    - format (str, optional): 'ndjson' (default) or 'csv'. The 'Accept' header
+      ('application/x-ndjson' or 'text/csv') works as well.
+    - vendor_id, status, from, to (optional): Same filters as the purchase order
+      list, only applied to the 'purchase_orders' dataset.
+
+    Returns:
+    - StreamingHttpResponse: The rows in primary key order. Rows are read from the
+      database in chunks while the response is being sent, so memory use stays
+      flat regardless of the size of the export.
+
+    Raises:
+    - NotFound: If the dataset does not exist.
+
+    """
+    permission_classes = [IsAuthenticated]
+    renderer_classes = [NDJSONRenderer, CSVRenderer]
+
+    def get(self, request, *args, **kwargs):
+        dataset = kwargs['dataset']
+        model = EXPORT_MODELS.get(dataset)
+        if model is None:
+            raise NotFound(f"Unknown dataset '{dataset}'.")
+
+        queryset = model.objects.all()
+        if model is PurchaseOrder:
+            queryset = PurchaseOrderFilter().filter_queryset(request, queryset, self)
+        # The rows are read after the view returned, pin the database the
+        # router picks for this request
+        queryset = queryset.using(queryset.db)
+
+        renderer = request.accepted_renderer
+        fields, rows = export_rows(queryset)
+        response = StreamingHttpResponse(
+            renderer.stream(fields, rows),
+            content_type=f'{renderer.media_type}; charset={renderer.charset}')
+        response['Content-Disposition'] = (
+            f'attachment; filename="{dataset}.{renderer.format}"')
+        return response
+
+
+class PrometheusMetricsView(APIView):
+    """
+    API endpoint exposing the request, signal receiver and metrics
+    calculation statistics of this process.
+
+    - GET: Return the statistics in the Prometheus text format.
+
+    Authentication:
+    - Token-based authentication is required.
+
+    Permissions:
+    - Users must be authenticated to access this endpoint.
+
+    Metrics:
+    - fatmug_calls_total, fatmug_queries_total, fatmug_db_seconds_total and the
+      fatmug_wall_seconds histogram, labelled with the kind of call ('view',
+      'receiver' or 'metrics') and its name.
+
+    Raises:
+    - NotFound: If the instrumentation is disabled.
+
+    """
+    permission_classes = [IsAuthenticated]
+    renderer_classes = [PrometheusRenderer]
+
+    def get(self, request, *args, **kwargs) -> Response:
+        if not instrumentation_enabled():
+            raise NotFound("Instrumentation is disabled.")
+        return Response(registry.render_prometheus())
@@ -1,26 +1,13 @@
 from django.contrib import admin
 from django.urls import path, re_path, include
-from rest_framework import permissions
-from drf_yasg.views import get_schema_view
-from drf_yasg import openapi
 
-schema_view = get_schema_view(
-    openapi.Info(
-        title="Fatmug-Amaan",
-        default_version='v1',
-        description="Vendor Dashboard",
-        terms_of_service="https://www.yourapp.com/terms/",
-        contact=openapi.Contact(email="contact@yourapp.com"),
-        license=openapi.License(name="Your License"),
-    ),
-    public=True,
-    permission_classes=(permissions.AllowAny,),
-)
+from fatmug_main import api_docs
 
 urlpatterns = [
     path('admin/', admin.site.urls),
     path('', include('fatmug_main.urls')),  # Include your app's URLs here
-    path('swagger(?P<format>\.json|\.yaml)', schema_view.without_ui(cache_timeout=0), name='schema-json'),
-    path('swagger/', schema_view.with_ui('swagger', cache_timeout=0), name='schema-swagger-ui'),
-    path('redoc/', schema_view.with_ui('redoc', cache_timeout=0), name='schema-redoc'),
+    # drf_yasg is only imported when these are requested, see api_docs
+    re_path(r'^swagger(?P<format>\.json|\.yaml)$', api_docs.schema, name='schema-json'),
+    path('swagger/', api_docs.swagger_ui, name='schema-swagger-ui'),
+    path('redoc/', api_docs.redoc, name='schema-redoc'),
 ]